@@ -19,12 +19,17 @@ def save_checkpoint(
     path: str | Path,
     step: int = 0,
     meta: dict | None = None,
+    state_dict: dict | None = None,
 ) -> Path:
-    """Write a checkpoint to ``path`` (parent dirs created) and return it."""
+    """Write a checkpoint to ``path`` (parent dirs created) and return it.
+
+    ``state_dict`` overrides ``model.state_dict()``, e.g. with the full weights
+    gathered from a sharded (FSDP) wrapper.
+    """
     out = Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
     payload = {
-        "model": model.state_dict(),
+        "model": model.state_dict() if state_dict is None else state_dict,
         "config": model.cfg.to_dict(),
         "step": step,
         "meta": meta or {},
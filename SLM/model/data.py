@@ -1,8 +1,9 @@
 """Tokenized-dataset loading and fixed-length batching for training/eval.
 
 Consumes the JSONL shape produced by ``tools/tokenizer.tokenize_dataset``:
-each line is ``{"ids": [int, ...]}``. Sequences are concatenated into one token
-stream and chunked into ``seq_len``-sized training windows.
+each line is ``{"ids": [int, ...]}`` (or its packed ``.bin`` + ``.idx`` form,
+see :mod:`model.token_bin`). Sequences are concatenated into one token stream
+and chunked into ``seq_len``-sized training windows.
 """
 
 from __future__ import annotations
@@ -12,15 +13,22 @@ from pathlib import Path
 
 import torch
 
+from model.token_bin import read_token_bin
+
 
 def load_token_stream(path: str | Path) -> list[int]:
-    """Read a tokenized JSONL file into a flat list of token IDs.
+    """Read a tokenized JSONL (or packed ``.bin``) file into a flat list of token IDs.
 
     Returns an empty list if the file is missing or unreadable.
     """
     p = Path(path)
     if not p.exists():
         return []
+    if p.suffix == ".bin":
+        try:
+            return read_token_bin(p)[0].tolist()
+        except (OSError, ValueError):
+            return []
     ids: list[int] = []
     for line in p.read_text(encoding="utf-8").splitlines():
         line = line.strip()
@@ -40,12 +48,15 @@ def make_batches(
     seq_len: int,
     batch_size: int,
     device: str = "cpu",
+    pin_memory: bool = False,
 ):
     """Yield ``(input_ids, labels)`` tensors of shape ``(batch_size, seq_len)``.
 
     The stream is chunked into non-overlapping ``seq_len`` windows; ``labels`` is
     the same window (next-token loss shifts internally in the model). Drops a
     trailing partial batch. Yields nothing if there is not even one full window.
+    ``pin_memory`` page-locks CPU batches so :func:`prefetch_to_device` can copy
+    them asynchronously.
     """
     n_windows = len(token_ids) // seq_len
     if n_windows == 0:
@@ -56,4 +67,47 @@ def make_batches(
     for start in range(0, len(windows) - batch_size + 1, batch_size):
         chunk = windows[start : start + batch_size]
         batch = torch.tensor(chunk, dtype=torch.long, device=device)
+        if pin_memory:
+            batch = batch.pin_memory()
         yield batch, batch
+
+
+def prefetch_to_device(batches, device: str):
+    """Move ``(input_ids, labels)`` batches to ``device``, one batch ahead.
+
+    On CUDA the next batch is copied host-to-device on a dedicated stream with
+    ``non_blocking=True`` while the caller computes on the current one, so the
+    PCIe transfer overlaps the step instead of stalling it (batches should be
+    pinned, see :func:`make_batches`). Elsewhere this is a plain ``.to()``.
+    """
+    dev = torch.device(device)
+    if dev.type != "cuda":
+        for input_ids, labels in batches:
+            yield input_ids.to(dev), labels.to(dev)
+        return
+
+    copy_stream = torch.cuda.Stream(dev)
+
+    def stage(batch):
+        if batch is None:
+            return None
+        input_ids, labels = batch
+        with torch.cuda.stream(copy_stream):
+            staged_ids = input_ids.to(dev, non_blocking=True)
+            staged_labels = (
+                staged_ids if labels is input_ids else labels.to(dev, non_blocking=True)
+            )
+        return staged_ids, staged_labels
+
+    it = iter(batches)
+    staged = stage(next(it, None))
+    while staged is not None:
+        compute_stream = torch.cuda.current_stream(dev)
+        compute_stream.wait_stream(copy_stream)
+        for tensor in staged:
+            # Tell the caching allocator the tensor is used on the compute
+            # stream so it isn't recycled while the step still reads it.
+            tensor.record_stream(compute_stream)
+        current = staged
+        staged = stage(next(it, None))
+        yield current
@@ -0,0 +1,38 @@
+"""Packed token streams: the ``.bin`` + ``.idx`` pair ``tools/tokenizer`` writes.
+
+The ``.bin`` file is every document's token IDs back to back, little-endian
+``uint16`` when the vocab fits, else ``uint32``. The ``.idx`` sidecar holds
+:data:`INDEX_HEADER` followed by ``n_docs + 1`` little-endian ``uint64`` token
+offsets. Torch-free, so the host tooling can read and write it too.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+INDEX_MAGIC = b"AUTONIDX"
+# magic, token width in bytes (2 or 4), document count.
+INDEX_HEADER = struct.Struct("<8sBQ")
+
+
+def read_token_bin(path: str | Path) -> tuple[array, list[int]]:
+    """Read a packed ``.bin`` token stream and its ``.idx`` document offsets.
+
+    Returns ``(ids, offsets)``: document ``i`` is ``ids[offsets[i]:offsets[i+1]]``.
+    """
+    bin_path = Path(path)
+    raw = bin_path.with_suffix(".idx").read_bytes()
+    magic, width, n_docs = INDEX_HEADER.unpack_from(raw)
+    if magic != INDEX_MAGIC:
+        raise ValueError(f"{bin_path.with_suffix('.idx')}: not an AUTON token index")
+    offsets = array("Q")
+    offsets.frombytes(raw[INDEX_HEADER.size : INDEX_HEADER.size + 8 * (n_docs + 1)])
+    ids = array("H" if width == 2 else "I")
+    ids.frombytes(bin_path.read_bytes())
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        ids.byteswap()
+    return ids, offsets.tolist()
@@ -11,6 +11,7 @@ from __future__ import annotations
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
 
 from model.config import ModelConfig
 
@@ -125,6 +126,8 @@ class SLMTransformer(nn.Module):
         self.norm = RMSNorm(cfg.hidden_size)
         self.lm_head = nn.Linear(cfg.hidden_size, cfg.vocab_size, bias=False)
         self.lm_head.weight = self.embed_tokens.weight  # weight tying
+        # Recompute block activations in backward instead of storing them.
+        self.gradient_checkpointing = False
 
     def num_parameters(self) -> int:
         # Tied head shares the embedding weight; count unique parameters.
@@ -142,7 +145,10 @@ class SLMTransformer(nn.Module):
         x = self.embed_tokens(input_ids)
         cos, sin = build_rope_cache(t, self.cfg.head_dim, self.cfg.rope_theta, x.device, x.dtype)
         for layer in self.layers:
-            x = layer(x, cos, sin)
+            if self.gradient_checkpointing and self.training:
+                x = checkpoint(layer, x, cos, sin, use_reentrant=False)
+            else:
+                x = layer(x, cos, sin)
         x = self.norm(x)
         logits = self.lm_head(x)
 
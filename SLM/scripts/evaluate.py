@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """Evaluate an AUTON SLM checkpoint: mean cross-entropy loss and perplexity.
 
-Loads a checkpoint, streams a tokenized JSONL dataset, and reports the average
-next-token loss and perplexity (``exp(loss)``) over all full windows.
+Loads a checkpoint, streams a tokenized dataset (JSONL or packed ``.bin``), and
+reports the token-weighted next-token loss and perplexity (``exp(loss)``).
+
+Windows of ``seq_len`` tokens are cut from the concatenated stream every
+``stride`` tokens (default: ``seq_len``, i.e. non-overlapping). With a smaller
+stride each window re-reads ``seq_len - stride`` tokens of context but only
+scores the new ones, so every token is predicted from a longer history. The
+summed NLL and token count are accumulated on the device and exponentiated once
+at the end, so there is one host sync per run rather than per batch.
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import sys
 from pathlib import Path
@@ -22,13 +30,24 @@ def evaluate(
     seq_len: int = 64,
     batch_size: int = 8,
     device: str = "cpu",
+    stride: int | None = None,
+    precision: str = "fp32",
+    compile_model: bool = False,
 ) -> dict:
-    """Return ``{loss, perplexity, windows, tokens}``. Raises ValueError if no data."""
+    """Return ``{loss, perplexity, windows, tokens, scored_tokens}``.
+
+    Raises ValueError if there is not enough data or ``stride`` is out of range.
+    """
     import torch
+    from torch.nn import functional
 
     from model.checkpoint import load_checkpoint
-    from model.data import load_token_stream, make_batches
-    from tools.metrics import compute_perplexity
+    from model.data import load_token_stream
+    from tools.metrics import compute_perplexity_streaming
+
+    stride = stride or seq_len
+    if not 0 < stride <= seq_len:
+        raise ValueError(f"stride must be in [1, seq_len={seq_len}], got {stride}")
 
     model, _ = load_checkpoint(checkpoint_path, device)
     tokens = load_token_stream(dataset_path)
@@ -39,30 +58,58 @@ def evaluate(
             f"got {len(tokens)}"
         )
 
-    total_loss = 0.0
-    n_batches = 0
-    with torch.no_grad():
-        for input_ids, labels in make_batches(tokens, seq_len, batch_size, device):
-            _, loss = model(input_ids, labels)
-            total_loss += float(loss.item())
-            n_batches += 1
+    windows = torch.tensor(tokens, dtype=torch.long).unfold(0, seq_len, stride)
+    labels = windows.clone()
+    # Later windows only score the tokens the previous window didn't reach.
+    labels[1:, : seq_len - stride] = -100
+    forward = torch.compile(model) if compile_model else model
+    autocast = (
+        torch.autocast(torch.device(device).type, dtype=torch.bfloat16)
+        if precision == "bf16"
+        else contextlib.nullcontext()
+    )
+
+    total_nll = torch.zeros((), dtype=torch.float64, device=device)
+    scored = 0
+    with torch.inference_mode(), autocast:
+        for start in range(0, windows.shape[0], batch_size):
+            input_ids = windows[start : start + batch_size].to(device, non_blocking=True)
+            targets = labels[start : start + batch_size, 1:].to(device, non_blocking=True)
+            logits, _ = forward(input_ids)
+            total_nll += functional.cross_entropy(
+                logits[:, :-1].reshape(-1, logits.size(-1)).float(),
+                targets.reshape(-1),
+                ignore_index=-100,
+                reduction="sum",
+            )
+            scored += int((labels[start : start + batch_size, 1:] != -100).sum())
 
-    mean_loss = total_loss / max(1, n_batches)
+    total = float(total_nll.item())
     return {
-        "loss": mean_loss,
-        "perplexity": compute_perplexity(mean_loss),
-        "windows": n_batches * batch_size,
+        "loss": total / max(1, scored),
+        "perplexity": compute_perplexity_streaming(total, scored),
+        "windows": int(windows.shape[0]),
         "tokens": len(tokens),
+        "scored_tokens": scored,
     }
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Evaluate SLM model")
     parser.add_argument("--checkpoint", required=True, help="Model checkpoint path")
-    parser.add_argument("--dataset", required=True, help="Test dataset path (tokenized JSONL)")
+    parser.add_argument(
+        "--dataset", required=True, help="Test dataset path (tokenized JSONL or .bin)"
+    )
     parser.add_argument("--seq-len", type=int, default=64, help="Evaluation sequence length")
     parser.add_argument("--batch-size", type=int, default=8, help="Evaluation batch size")
+    parser.add_argument(
+        "--stride", type=int, default=None, help="Window stride (default: --seq-len)"
+    )
     parser.add_argument("--device", default="cpu", help="torch device (cpu/cuda/mps)")
+    parser.add_argument(
+        "--precision", choices=["fp32", "bf16"], default="fp32", help="Compute precision"
+    )
+    parser.add_argument("--compile", action="store_true", help="torch.compile the model")
     args = parser.parse_args(argv)
 
     summary = evaluate(
@@ -71,6 +118,9 @@ def main(argv: list[str] | None = None) -> int:
         seq_len=args.seq_len,
         batch_size=args.batch_size,
         device=args.device,
+        stride=args.stride,
+        precision=args.precision,
+        compile_model=args.compile,
     )
     print(json.dumps(summary, indent=2))
     return 0
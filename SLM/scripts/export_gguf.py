@@ -2,8 +2,15 @@
 """Export an AUTON SLM checkpoint to GGUF.
 
 Writes a real GGUF container (``GGUF`` magic) with architecture metadata and the
-model's float32 tensors using the ``gguf`` writer. The result is loadable by
+model's tensors using the ``gguf`` writer. The result is loadable by
 ``tools/gguf_validator`` and standard GGUF tooling.
+
+The conversion streams: the checkpoint is memory-mapped, tensor infos are
+declared up front from shapes alone, and each tensor is then converted,
+quantized and written one at a time, so peak memory is one tensor rather than
+the whole model. ``--quant`` selects the on-disk type for 2D weights
+(llama.cpp block formats); 1D tensors (norm weights) always stay F32, and
+weights whose rows don't tile the quant block fall back to F16.
 """
 
 from __future__ import annotations
@@ -16,15 +23,39 @@ from pathlib import Path
 # Make the SLM package root importable when run as a script.
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+# The gguf Python package implements these block quantizers; K-quants
+# (q4_k_m/q5_k_m) are dequantize-only there — export f16 and run llama.cpp's
+# llama-quantize for those.
+QUANT_TYPES = ("f32", "f16", "q8_0", "q5_0", "q5_1", "q4_0", "q4_1")
+
+
+def _tensor_type(shape: tuple[int, ...], quant: str):
+    """Pick the GGML type for one tensor under the requested ``quant``."""
+    from gguf import GGML_QUANT_SIZES, GGMLQuantizationType
+
+    if len(shape) < 2 or quant == "f32":
+        return GGMLQuantizationType.F32
+    if quant == "f16":
+        return GGMLQuantizationType.F16
+    qtype = GGMLQuantizationType[quant.upper()]
+    block_size, _ = GGML_QUANT_SIZES[qtype]
+    if shape[-1] % block_size:
+        return GGMLQuantizationType.F16
+    return qtype
 
-def export_gguf(model_path: str, output_path: str) -> dict:
+
+def export_gguf(model_path: str, output_path: str, quant: str = "f32") -> dict:
     import numpy as np
     import torch
-    from gguf import GGUFWriter
+    from gguf import GGMLQuantizationType, GGUFWriter
+    from gguf.quants import quant_shape_to_byte_shape, quantize
 
     from model.config import ModelConfig
 
-    payload = torch.load(Path(model_path), map_location="cpu", weights_only=False)
+    if quant not in QUANT_TYPES:
+        raise ValueError(f"unsupported --quant {quant!r} (expected one of {QUANT_TYPES})")
+
+    payload = torch.load(Path(model_path), map_location="cpu", weights_only=False, mmap=True)
     cfg = ModelConfig.from_dict(payload["config"])
     state = payload["model"]
 
@@ -39,28 +70,65 @@ def export_gguf(model_path: str, output_path: str) -> dict:
     writer.add_uint32("auton-slm.feed_forward_length", cfg.intermediate_size)
     writer.add_uint32("auton-slm.vocab_size", cfg.vocab_size)
     writer.add_uint32("auton-slm.context_length", cfg.max_position_embeddings)
+    writer.add_string("general.quantization", quant)
 
-    n_tensors = 0
+    # Pass 1: declare every tensor from its shape alone (no data touched).
+    plan = []
     for name, tensor in state.items():
-        arr = tensor.detach().to(torch.float32).cpu().numpy().astype(np.float32)
-        writer.add_tensor(name, arr)
-        n_tensors += 1
+        shape = tuple(tensor.shape)
+        qtype = _tensor_type(shape, quant)
+        if qtype == GGMLQuantizationType.F32:
+            writer.add_tensor_info(name, shape, np.dtype(np.float32), tensor.numel() * 4)
+        elif qtype == GGMLQuantizationType.F16:
+            writer.add_tensor_info(name, shape, np.dtype(np.float16), tensor.numel() * 2)
+        else:
+            byte_shape = quant_shape_to_byte_shape(shape, qtype)
+            writer.add_tensor_info(
+                name, byte_shape, np.dtype(np.uint8), int(np.prod(byte_shape)), raw_dtype=qtype
+            )
+        plan.append((name, qtype))
 
     writer.write_header_to_file()
     writer.write_kv_data_to_file()
-    writer.write_tensors_to_file()
+    writer.write_ti_data_to_file()
+
+    # Pass 2: convert + write one tensor at a time.
+    type_counts: dict[str, int] = {}
+    for name, qtype in plan:
+        arr = state[name].detach().to(torch.float32).cpu().numpy()
+        if qtype == GGMLQuantizationType.F16:
+            data = arr.astype(np.float16)
+        elif qtype == GGMLQuantizationType.F32:
+            data = arr.astype(np.float32, copy=False)
+        else:
+            data = quantize(arr, qtype)
+        writer.write_tensor_data(data)
+        type_counts[qtype.name] = type_counts.get(qtype.name, 0) + 1
+
     writer.close()
 
-    return {"output": str(out), "tensors": n_tensors, "size_bytes": out.stat().st_size}
+    return {
+        "output": str(out),
+        "tensors": len(plan),
+        "quant": quant,
+        "tensor_types": type_counts,
+        "size_bytes": out.stat().st_size,
+    }
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Export model to GGUF")
     parser.add_argument("--model", required=True, help="Model path")
     parser.add_argument("--output", required=True, help="Output GGUF path")
+    parser.add_argument(
+        "--quant",
+        choices=QUANT_TYPES,
+        default="f32",
+        help="Tensor type for 2D weights (llama.cpp naming)",
+    )
     args = parser.parse_args(argv)
 
-    summary = export_gguf(args.model, args.output)
+    summary = export_gguf(args.model, args.output, args.quant)
     print(json.dumps(summary, indent=2))
     return 0
 
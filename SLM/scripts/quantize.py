@@ -1,16 +1,38 @@
 #!/usr/bin/env python3
 """Quantize an AUTON SLM checkpoint to INT8/INT4 weights.
 
-Uses portable symmetric per-tensor quantization of the 2D weight matrices
-(CPU-only, no CUDA/bitsandbytes dependency): each weight ``W`` is stored as
-``round(W / scale)`` in the target bit range plus a per-tensor ``scale``. The
-output is a self-describing payload that dequantizes back to the original shape.
+Portable, CPU-only weight quantization of the 2D weight matrices (no
+CUDA/autoawq/bitsandbytes dependency):
+
+* ``--bits 4`` — W4A16 group-wise quantization (default group size 128) with
+  FP16 scales and uint8 zero points; codes are packed two int4 per byte. When a
+  ``--calib-dataset`` is given, AWQ-style activation-aware scaling is applied:
+  per input channel scales ``s = mean|x|^alpha`` are grid-searched on
+  calibration activations to minimize the layer output error, so salient
+  channels keep more precision. ``--method gptq`` instead runs the one-shot
+  GPTQ solver: columns are quantized one at a time and the rounding error is
+  propagated onto the not-yet-quantized columns through the inverse Hessian
+  ``(2 XᵀX)⁻¹`` of the layer's calibration inputs.
+* ``--bits 8`` — ZeroQuant-style fine-grained W8: symmetric int8 with one FP16
+  scale per output channel.
+
+Only the decoder's Linear layers are quantized by default: ``--skip-modules``
+(regexes over module names, default ``lm_head,embed_tokens,visual.*``) keeps
+the accuracy-critical embeddings, output head and any vision tower at full
+precision, where they cost little compute but are sensitive to outliers.
+
+The output is a self-describing payload that dequantizes back to the original
+shape (see :func:`dequantize_state` / :func:`load_quantized`), plus a sidecar
+``<output>.quant.json`` manifest describing the packing so a downstream loader
+can pick the matching fused dequant+GEMM kernel.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import logging
+import re
 import sys
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -21,36 +43,450 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 if TYPE_CHECKING:  # torch is imported lazily inside functions (heavy dependency)
     import torch
 
-def quantize_tensor(weight: "torch.Tensor", bits: int) -> tuple["torch.Tensor", float]:
-    """Symmetric per-tensor quantization. Returns ``(int8_codes, scale)``."""
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP_SIZE = 128
+# Module-name regexes left unquantized unless overridden with --skip-modules.
+DEFAULT_SKIP_MODULES = ("lm_head", "embed_tokens", "visual.*")
+METHODS = ("rtn", "awq", "gptq")
+# Format tag written to the payload and manifest; bump on layout changes.
+QUANT_FORMAT_VERSION = 1
+
+
+def pack_int4(codes: "torch.Tensor") -> "torch.Tensor":
+    """Pack unsigned 4-bit codes (values 0..15) two per byte, low nibble first.
+
+    An odd trailing dimension is zero-padded; :func:`unpack_int4` callers slice
+    back to the original width.
+    """
+    import torch
+    from torch.nn import functional
+
+    codes = codes.to(torch.uint8)
+    if codes.shape[-1] % 2:
+        codes = functional.pad(codes, (0, 1))
+    return codes[..., 0::2] | (codes[..., 1::2] << 4)
+
+
+def unpack_int4(packed: "torch.Tensor") -> "torch.Tensor":
+    """Inverse of :func:`pack_int4`: ``(..., n/2)`` uint8 -> ``(..., n)`` codes."""
+    import torch
+
+    return torch.stack((packed & 0x0F, packed >> 4), dim=-1).flatten(-2)
+
+
+def _effective_group_size(in_features: int, group_size: int) -> int:
+    """Fall back to one group per row when ``group_size`` doesn't tile the row."""
+    if group_size <= 0 or in_features % group_size:
+        return in_features
+    return group_size
+
+
+def quantize_groupwise(
+    weight: "torch.Tensor",
+    bits: int = 4,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+) -> tuple["torch.Tensor", "torch.Tensor", "torch.Tensor"]:
+    """Group-wise quantization of a 2D weight along its input dimension.
+
+    Returns ``(codes, scales, zeros)``: unsigned codes in ``[0, 2**bits - 1]`` of
+    the weight's shape, and FP16 scales / uint8 zero points of shape
+    ``(out_features, n_groups)``. Without ``zero_point`` the grid is symmetric
+    and every zero point is the midpoint ``2**(bits-1)``.
+    """
     import torch
 
-    qmax = (1 << (bits - 1)) - 1  # 127 for int8, 7 for int4
-    amax = weight.abs().max().item()
-    scale = (amax / qmax) if amax > 0 else 1.0
-    codes = torch.clamp(torch.round(weight / scale), -qmax - 1, qmax).to(torch.int8)
-    return codes, scale
+    out_f, in_f = weight.shape
+    gs = _effective_group_size(in_f, group_size)
+    w = weight.detach().float().reshape(out_f, in_f // gs, gs)
+    qmax = (1 << bits) - 1
+
+    if zero_point:
+        wmin = w.amin(-1, keepdim=True).clamp(max=0.0)
+        wmax = w.amax(-1, keepdim=True).clamp(min=0.0)
+        scales = ((wmax - wmin) / qmax).clamp(min=1e-6).half().float()
+        zeros = torch.clamp(torch.round(-wmin / scales), 0, qmax)
+    else:
+        half = (1 << (bits - 1)) - 1
+        scales = (w.abs().amax(-1, keepdim=True) / half).clamp(min=1e-6).half().float()
+        zeros = torch.full_like(scales, float(1 << (bits - 1)))
+
+    codes = torch.clamp(torch.round(w / scales) + zeros, 0, qmax)
+    return (
+        codes.reshape(out_f, in_f).to(torch.uint8),
+        scales.squeeze(-1).half(),
+        zeros.squeeze(-1).to(torch.uint8),
+    )
+
+
+def dequantize_groupwise(
+    codes: "torch.Tensor", scales: "torch.Tensor", zeros: "torch.Tensor"
+) -> "torch.Tensor":
+    """Inverse of :func:`quantize_groupwise` (returns float32)."""
+    out_f, in_f = codes.shape
+    n_groups = scales.shape[-1]
+    w = codes.float().reshape(out_f, n_groups, in_f // n_groups)
+    w = (w - zeros.float().unsqueeze(-1)) * scales.float().unsqueeze(-1)
+    return w.reshape(out_f, in_f)
+
+
+def _fake_quant(weight: "torch.Tensor", bits: int, group_size: int, zero_point: bool):
+    return dequantize_groupwise(*quantize_groupwise(weight, bits, group_size, zero_point))
+
+
+def collect_input_stats(
+    model,
+    token_ids: list[int],
+    seq_len: int = 64,
+    max_samples: int = 512,
+    batch_size: int = 8,
+    max_rows: int = 512,
+) -> dict[str, tuple["torch.Tensor", "torch.Tensor"]]:
+    """Run calibration windows through ``model`` and record Linear inputs.
+
+    Returns ``{module_name: (mean_abs_per_channel, sample_rows)}`` where
+    ``sample_rows`` is a bounded subsample of input rows used to score
+    candidate scales.
+    """
+    import torch
+    import torch.nn as nn
+    from model.data import make_batches
+
+    sums: dict[str, torch.Tensor] = {}
+    counts: dict[str, int] = {}
+    samples: dict[str, torch.Tensor] = {}
+
+    def make_hook(name: str):
+        def hook(_module, inputs, _output):
+            x = inputs[0].detach().float().reshape(-1, inputs[0].shape[-1])
+            sums[name] = sums.get(name, 0) + x.abs().sum(0)
+            counts[name] = counts.get(name, 0) + x.shape[0]
+            kept = samples.get(name)
+            if kept is None or kept.shape[0] < max_rows:
+                take = x[: max_rows - (0 if kept is None else kept.shape[0])]
+                samples[name] = take if kept is None else torch.cat((kept, take))
+
+        return hook
+
+    handles = [
+        module.register_forward_hook(make_hook(name))
+        for name, module in model.named_modules()
+        if isinstance(module, nn.Linear)
+    ]
+    tokens = token_ids[: max_samples * seq_len]
+    bsz = max(1, min(batch_size, len(tokens) // seq_len))
+    try:
+        with torch.no_grad():
+            for input_ids, _ in make_batches(tokens, seq_len, bsz):
+                model(input_ids)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return {name: (sums[name] / counts[name], samples[name]) for name in sums}
+
+
+def awq_search_scale(
+    weight: "torch.Tensor",
+    act_mean: "torch.Tensor",
+    x: "torch.Tensor",
+    bits: int = 4,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+    n_grid: int = 20,
+) -> "torch.Tensor":
+    """Grid-search AWQ input-channel scales for one Linear weight.
+
+    Tries ``s = act_mean**alpha`` for ``alpha`` in ``[0, 1)`` and returns the
+    scales minimizing ``||x Q(W*s)/s ^T - x W^T||²``. ``alpha = 0`` is plain
+    group-wise RTN, so the result is never worse than the unscaled baseline.
+    """
+    import torch
+
+    w = weight.detach().float()
+    ref = x @ w.t()
+    act = act_mean.float().clamp(min=1e-5)
+    best_err = float("inf")
+    best = torch.ones_like(act)
+    for i in range(n_grid):
+        s = act.pow(i / n_grid)
+        s = s / (s.max() * s.min()).sqrt()
+        s = s.half().float()  # scales are stored in FP16; search with what ships
+        w_q = _fake_quant(w * s, bits, group_size, zero_point) / s
+        err = (x @ w_q.t() - ref).pow(2).mean().item()
+        if err < best_err:
+            best_err, best = err, s
+    return best
+
+
+def collect_hessians(
+    model,
+    token_ids: list[int],
+    names: list[str],
+    seq_len: int = 64,
+    max_samples: int = 512,
+    batch_size: int = 8,
+) -> dict[str, "torch.Tensor"]:
+    """Accumulate ``H = 2 XᵀX / n`` over calibration inputs of the named Linears."""
+    import torch
+    from model.data import make_batches
+
+    modules = dict(model.named_modules())
+    hessians: dict[str, torch.Tensor] = {}
+    counts: dict[str, int] = {}
+
+    def make_hook(name: str):
+        def hook(_module, inputs, _output):
+            x = inputs[0].detach().float().reshape(-1, inputs[0].shape[-1])
+            n_prev = counts.get(name, 0)
+            n_new = n_prev + x.shape[0]
+            h = hessians.get(name)
+            h = torch.zeros(x.shape[1], x.shape[1]) if h is None else h * (n_prev / n_new)
+            hessians[name] = h + (2.0 / n_new) * (x.t() @ x)
+            counts[name] = n_new
+
+        return hook
+
+    handles = [modules[name].register_forward_hook(make_hook(name)) for name in names]
+    tokens = token_ids[: max_samples * seq_len]
+    bsz = max(1, min(batch_size, len(tokens) // seq_len))
+    try:
+        with torch.no_grad():
+            for input_ids, _ in make_batches(tokens, seq_len, bsz):
+                model(input_ids)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return hessians
+
+
+def gptq_quantize_weight(
+    weight: "torch.Tensor",
+    hessian: "torch.Tensor",
+    bits: int = 4,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+    act_order: bool = False,
+    damp_percent: float = 0.01,
+    block_size: int = 128,
+) -> tuple["torch.Tensor", "torch.Tensor", "torch.Tensor"]:
+    """Quantize one Linear weight with the GPTQ solver.
+
+    Returns ``(codes, scales, zeros)`` in the same layout as
+    :func:`quantize_groupwise`. With ``act_order`` columns are visited in
+    decreasing ``diag(H)`` order; group parameters are then fixed up front from
+    the original weight ("static groups") so groups stay contiguous in storage.
+    """
+    import torch
+
+    w = weight.detach().float().clone()
+    out_f, in_f = w.shape
+    gs = _effective_group_size(in_f, group_size)
+    qmax = (1 << bits) - 1
+
+    h = hessian.float().clone()
+    dead = torch.diag(h) == 0
+    h[dead, dead] = 1.0
+    w[:, dead] = 0.0
+
+    n_groups = in_f // gs
+    scales = torch.empty(out_f, n_groups, dtype=torch.float16)
+    zeros = torch.empty(out_f, n_groups, dtype=torch.uint8)
+
+    def fit_group(g: int, cols: "torch.Tensor") -> None:
+        _, s, z = quantize_groupwise(cols, bits, gs, zero_point)
+        scales[:, g], zeros[:, g] = s[:, 0], z[:, 0]
+
+    perm = torch.arange(in_f)
+    if act_order:
+        for g in range(n_groups):
+            fit_group(g, w[:, g * gs : (g + 1) * gs])
+        perm = torch.argsort(torch.diag(h), descending=True)
+        w = w[:, perm]
+        h = h[perm][:, perm]
 
+    h += damp_percent * torch.mean(torch.diag(h)) * torch.eye(in_f)
+    h_inv = torch.linalg.cholesky(torch.cholesky_inverse(torch.linalg.cholesky(h)), upper=True)
 
-def quantize_state(state: dict, bits: int) -> tuple[dict, dict]:
+    codes = torch.zeros(out_f, in_f, dtype=torch.uint8)
+    block = max(gs, (block_size // gs) * gs)
+    for i1 in range(0, in_f, block):
+        i2 = min(i1 + block, in_f)
+        w1 = w[:, i1:i2].clone()
+        err1 = torch.zeros_like(w1)
+        h_inv1 = h_inv[i1:i2, i1:i2]
+        for i in range(i2 - i1):
+            col = int(perm[i1 + i])
+            g = col // gs
+            if not act_order and col % gs == 0:
+                fit_group(g, w1[:, i : i + gs])
+            s = scales[:, g].float()
+            z = zeros[:, g].float()
+            q = torch.clamp(torch.round(w1[:, i] / s) + z, 0, qmax)
+            codes[:, col] = q.to(torch.uint8)
+            err = (w1[:, i] - (q - z) * s) / h_inv1[i, i]
+            w1[:, i:] -= err.unsqueeze(1) @ h_inv1[i, i:].unsqueeze(0)
+            err1[:, i] = err
+        w[:, i2:] -= err1 @ h_inv[i1:i2, i2:]
+    return codes, scales, zeros
+
+
+def gptq_quantize_model(
+    model,
+    token_ids: list[int],
+    names: list[str],
+    bits: int = 4,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+    act_order: bool = False,
+    true_sequential: bool = True,
+    damp_percent: float = 0.01,
+    seq_len: int = 64,
+    max_samples: int = 512,
+) -> dict[str, dict]:
+    """Run GPTQ over the named Linear modules in forward order.
+
+    Returns payload entries keyed by weight name. With ``true_sequential`` each
+    layer's Hessian is collected *after* the preceding layers were replaced by
+    their quantized weights, so later layers compensate for earlier error (one
+    calibration pass per layer); otherwise all Hessians come from a single pass
+    over the float model.
+    """
+    import torch
+
+    modules = dict(model.named_modules())
+    entries: dict[str, dict] = {}
+    hessians = {} if true_sequential else collect_hessians(
+        model, token_ids, names, seq_len, max_samples
+    )
+    for name in names:
+        if true_sequential:
+            hessians = collect_hessians(model, token_ids, [name], seq_len, max_samples)
+        linear = modules[name]
+        codes, scales, zeros = gptq_quantize_weight(
+            linear.weight, hessians[name], bits, group_size, zero_point, act_order, damp_percent
+        )
+        with torch.no_grad():
+            linear.weight.copy_(dequantize_groupwise(codes, scales, zeros))
+        entries[f"{name}.weight"] = {
+            "qweight": pack_int4(codes),
+            "scales": scales,
+            "zeros": zeros,
+            "input_scale": None,
+            "shape": list(linear.weight.shape),
+        }
+    return entries
+
+
+def _tied_weight_names(model) -> set[str]:
+    """Names of parameters whose storage is shared with another parameter."""
+    owners: dict[int, list[str]] = {}
+    for name, tensor in model.state_dict(keep_vars=True).items():
+        owners.setdefault(tensor.data_ptr(), []).append(name)
+    return {name for names in owners.values() if len(names) > 1 for name in names}
+
+
+def _module_name(weight_name: str) -> str:
+    if weight_name.endswith((".weight", ".bias")):
+        return weight_name.rsplit(".", 1)[0]
+    return weight_name
+
+
+def is_skipped(weight_name: str, skip_modules) -> bool:
+    """True if ``weight_name``'s module (or an ancestor) fully matches a skip pattern."""
+    module = _module_name(weight_name)
+    return any(re.fullmatch(rf"(?:{pattern})(?:\..*)?", module) for pattern in skip_modules)
+
+
+def _skipped_weights(state: dict, skip_modules) -> set[str]:
+    """Weights excluded by ``skip_modules``, closed over tied storage.
+
+    A tied pair (``lm_head`` <-> ``embed_tokens``) loads into one tensor, so
+    skipping either name keeps both at full precision.
+    """
+    skipped = {name for name in state if is_skipped(name, skip_modules)}
+    owners: dict[int, list[str]] = {}
+    for name, tensor in state.items():
+        owners.setdefault(tensor.data_ptr(), []).append(name)
+    for names in owners.values():
+        if len(names) > 1 and skipped.intersection(names):
+            skipped.update(names)
+    return skipped
+
+
+def quantize_state(
+    state: dict,
+    bits: int,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+    act_stats: dict | None = None,
+    prequantized: dict | None = None,
+    method: str = "rtn",
+    skip_modules=(),
+) -> tuple[dict, dict]:
     """Quantize all 2D float weights; pass other tensors through unchanged.
 
+    Weights whose module matches a ``skip_modules`` regex are passed through
+    at their original precision too.
+    ``act_stats`` maps weight names to ``(mean_abs, sample_rows)`` calibration
+    statistics; weights that have them get AWQ scale search (4-bit only).
+    ``prequantized`` maps weight names to ready payload entries (e.g. from
+    :func:`gptq_quantize_model`) that are taken as-is.
     Returns ``(quantized_payload, stats)``.
     """
+    import torch
+
+    act_stats = act_stats or {}
+    prequantized = prequantized or {}
+    skipped = _skipped_weights(state, skip_modules)
     q: dict[str, dict] = {}
     passthrough: dict[str, torch.Tensor] = {}
     quantized_params = 0
     total_params = 0
+    awq_layers = 0
     for name, tensor in state.items():
         total_params += tensor.numel()
-        if tensor.dim() == 2 and tensor.is_floating_point():
-            codes, scale = quantize_tensor(tensor, bits)
-            q[name] = {"codes": codes, "scale": scale, "shape": list(tensor.shape)}
-            quantized_params += tensor.numel()
-        else:
+        if not (tensor.dim() == 2 and tensor.is_floating_point()) or name in skipped:
             passthrough[name] = tensor
+            continue
+        quantized_params += tensor.numel()
+        if name in prequantized:
+            q[name] = prequantized[name]
+            continue
+        if bits == 8:
+            qmax = 127
+            scale = (tensor.abs().amax(1, keepdim=True) / qmax).clamp(min=1e-6).half()
+            codes = torch.clamp(torch.round(tensor / scale.float()), -qmax - 1, qmax)
+            q[name] = {
+                "codes": codes.to(torch.int8),
+                "scale": scale,
+                "shape": list(tensor.shape),
+            }
+            continue
+
+        w = tensor.float()
+        input_scale = None
+        if name in act_stats:
+            act_mean, x = act_stats[name]
+            input_scale = awq_search_scale(w, act_mean, x, bits, group_size, zero_point)
+            w = w * input_scale
+            awq_layers += 1
+        codes, scales, zeros = quantize_groupwise(w, bits, group_size, zero_point)
+        q[name] = {
+            "qweight": pack_int4(codes),
+            "scales": scales,
+            "zeros": zeros,
+            "input_scale": None if input_scale is None else input_scale.half(),
+            "shape": list(tensor.shape),
+        }
     stats = {
         "bits": bits,
+        "method": method if bits == 4 else "w8-per-channel",
+        "group_size": group_size if bits == 4 else None,
+        "zero_point": zero_point if bits == 4 else False,
+        "awq_layers": awq_layers,
+        "quantized_modules": sorted(_module_name(name) for name in q),
+        "skipped_modules": sorted({_module_name(name) for name in skipped}),
         "quantized_params": quantized_params,
         "passthrough_params": total_params - quantized_params,
         "total_params": total_params,
@@ -59,20 +495,187 @@ def quantize_state(state: dict, bits: int) -> tuple[dict, dict]:
     return {"quantized": q, "passthrough": passthrough}, stats
 
 
-def quantize_checkpoint(checkpoint_path: str, output_path: str, bits: int) -> dict:
+def dequantize_entry(entry: dict) -> "torch.Tensor":
+    """Rebuild a float32 weight from one ``quantized`` payload entry."""
+    rows, cols = entry["shape"]
+    if "qweight" in entry:
+        codes = unpack_int4(entry["qweight"])[:, :cols]
+        w = dequantize_groupwise(codes, entry["scales"], entry["zeros"])
+        if entry.get("input_scale") is not None:
+            w = w / entry["input_scale"].float()
+        return w
+    scale = entry["scale"]
+    scale = scale.float() if hasattr(scale, "float") else float(scale)
+    return (entry["codes"].float() * scale).reshape(rows, cols)
+
+
+def dequantize_state(payload: dict) -> dict:
+    """Rebuild a float state dict from a quantized payload."""
+    state = dict(payload["passthrough"])
+    for name, entry in payload["quantized"].items():
+        state[name] = dequantize_entry(entry)
+    return state
+
+
+def load_quantized(path: str, device: str = "cpu"):
+    """Load a quantized payload into an eval-mode :class:`SLMTransformer`."""
+    import torch
+    from model.config import ModelConfig
+    from model.transformer import SLMTransformer
+
+    payload = torch.load(Path(path), map_location="cpu", weights_only=False)
+    model = SLMTransformer(ModelConfig.from_dict(payload["config"]))
+    model.load_state_dict(dequantize_state(payload))
+    return model.to(device).eval(), payload
+
+
+def _manifest_path(output_path: Path) -> Path:
+    # Appended, not substituted: "slm.int4.pt" and "slm.int8.pt" must not
+    # both map to "slm.quant.json".
+    return output_path.with_name(output_path.name + ".quant.json")
+
+
+def _resolve_method(method: str | None, bits: int, calib_dataset: str | None) -> str:
+    """Pick the INT4 method: explicit choice, else AWQ if calibration data is given.
+
+    INT8 is always round-to-nearest; asking for AWQ/GPTQ with it is an error
+    rather than being quietly ignored.
+    """
+    if bits == 8:
+        if method not in (None, "rtn"):
+            raise ValueError(f"--method {method} is INT4-only; INT8 always uses rtn")
+        return "rtn"
+    if method is None:
+        return "awq" if calib_dataset else "rtn"
+    if method not in METHODS:
+        raise ValueError(f"unknown quantization method {method!r} (expected one of {METHODS})")
+    if method != "rtn" and not calib_dataset:
+        raise ValueError(f"--method {method} requires --calib-dataset")
+    return method
+
+
+def quantize_checkpoint(
+    checkpoint_path: str,
+    output_path: str,
+    bits: int,
+    group_size: int = DEFAULT_GROUP_SIZE,
+    zero_point: bool = True,
+    calib_dataset: str | None = None,
+    calib_samples: int = 512,
+    calib_seq_len: int = 64,
+    method: str | None = None,
+    act_order: bool = False,
+    true_sequential: bool = True,
+    damp_percent: float = 0.01,
+    skip_modules=DEFAULT_SKIP_MODULES,
+) -> dict:
     import torch
 
+    method = _resolve_method(method, bits, calib_dataset)
+    skip_modules = list(skip_modules)
     payload = torch.load(Path(checkpoint_path), map_location="cpu", weights_only=False)
     state = payload["model"]
-    qpayload, stats = quantize_state(state, bits)
+    skipped = _skipped_weights(state, skip_modules)
+
+    act_stats: dict = {}
+    prequantized: dict = {}
+    if method in ("awq", "gptq"):
+        import torch.nn as nn
+        from model.checkpoint import load_checkpoint
+        from model.data import load_token_stream
+
+        model, _ = load_checkpoint(checkpoint_path, "cpu")
+        tokens = [t % model.cfg.vocab_size for t in load_token_stream(calib_dataset)]
+        if len(tokens) < calib_seq_len:
+            raise ValueError(
+                f"calibration dataset too small: need >= {calib_seq_len} tokens, "
+                f"got {len(tokens)}"
+            )
+        # Tied weights (lm_head <-> embed_tokens) must dequantize identically
+        # under both names, so they stay on the plain RTN grid; skipped
+        # modules are not calibrated at all.
+        excluded = _tied_weight_names(model) | skipped
+        if method == "awq":
+            per_module = collect_input_stats(model, tokens, calib_seq_len, calib_samples)
+            act_stats = {
+                f"{name}.weight": stats
+                for name, stats in per_module.items()
+                if f"{name}.weight" not in excluded
+            }
+        else:
+            if act_order:
+                logger.warning(
+                    "GPTQ act-order (desc_act) reorders columns at quantization time; "
+                    "it usually costs decode throughput versus AWQ for little accuracy gain"
+                )
+            names = [
+                name
+                for name, module in model.named_modules()
+                if isinstance(module, nn.Linear) and f"{name}.weight" not in excluded
+            ]
+            prequantized = gptq_quantize_model(
+                model,
+                tokens,
+                names,
+                bits,
+                group_size,
+                zero_point,
+                act_order=act_order,
+                true_sequential=true_sequential,
+                damp_percent=damp_percent,
+                seq_len=calib_seq_len,
+                max_samples=calib_samples,
+            )
+
+    qpayload, stats = quantize_state(
+        state, bits, group_size, zero_point, act_stats, prequantized, method, skip_modules
+    )
+    logger.info("quantized modules: %s", ", ".join(stats["quantized_modules"]) or "(none)")
+    logger.info("skipped modules: %s", ", ".join(stats["skipped_modules"]) or "(none)")
+    if method == "gptq":
+        stats["gptq_layers"] = len(prequantized)
 
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
     torch.save(
-        {"config": payload.get("config"), "bits": bits, **qpayload},
+        {
+            "config": payload.get("config"),
+            "bits": bits,
+            "format_version": QUANT_FORMAT_VERSION,
+            **qpayload,
+        },
         out,
     )
+
+    manifest = {
+        "format_version": QUANT_FORMAT_VERSION,
+        "w_bit": bits,
+        "method": stats["method"],
+        "group_size": stats["group_size"],
+        "zero_point": stats["zero_point"],
+        # Layout hint for loaders: packed int4x2 (low nibble first) with
+        # per-group FP16 scales. GPTQ output uses static groups (no g_idx), so
+        # it is consumable by ExLlama-style kernels as well as AWQ GEMM ones.
+        "version": ("exllama" if method == "gptq" else "GEMM") if bits == 4 else "W8",
+        "packing": "int4x2" if bits == 4 else "int8",
+        "scale_dtype": "float16",
+        "calib_dataset": calib_dataset,
+        # Include/exclude lists so loaders map exactly the quantized modules.
+        "modules_to_not_convert": skip_modules,
+        "quantized_modules": stats["quantized_modules"],
+        "skipped_modules": stats["skipped_modules"],
+    }
+    if method == "gptq":
+        manifest.update({
+            "desc_act": act_order,
+            "true_sequential": true_sequential,
+            "damp_percent": damp_percent,
+        })
+    manifest_path = _manifest_path(out)
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
     stats["output"] = str(out)
+    stats["manifest"] = str(manifest_path)
     return stats
 
 
@@ -81,9 +684,77 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--checkpoint", required=True, help="Model checkpoint path")
     parser.add_argument("--bits", type=int, default=4, choices=[4, 8], help="Quantization bits")
     parser.add_argument("--output", required=True, help="Output path")
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default=None,
+        help="INT4 method (default: awq with --calib-dataset, else rtn)",
+    )
+    parser.add_argument(
+        "--group-size", type=int, default=DEFAULT_GROUP_SIZE, help="INT4 quantization group size"
+    )
+    parser.add_argument(
+        "--no-zero-point",
+        dest="zero_point",
+        action="store_false",
+        help="Use a symmetric INT4 grid instead of per-group zero points",
+    )
+    parser.add_argument(
+        "--calib-dataset",
+        default=None,
+        help="Tokenized JSONL calibration set (required for awq/gptq)",
+    )
+    parser.add_argument(
+        "--calib-samples", type=int, default=512, help="Max calibration windows"
+    )
+    parser.add_argument(
+        "--calib-seq-len", type=int, default=64, help="Calibration window length"
+    )
+    parser.add_argument(
+        "--act-order",
+        action="store_true",
+        help="GPTQ: quantize columns in decreasing Hessian-diagonal order (desc_act)",
+    )
+    parser.add_argument(
+        "--no-true-sequential",
+        dest="true_sequential",
+        action="store_false",
+        help="GPTQ: collect all Hessians in one pass instead of layer by layer",
+    )
+    parser.add_argument(
+        "--damp-percent",
+        type=float,
+        default=0.01,
+        help="GPTQ: Hessian dampening as a fraction of its mean diagonal",
+    )
+    parser.add_argument(
+        "--skip-modules",
+        default=",".join(DEFAULT_SKIP_MODULES),
+        help="Comma-separated module-name regexes to keep unquantized "
+        "(default: %(default)s; pass '' to quantize everything)",
+    )
     args = parser.parse_args(argv)
 
-    stats = quantize_checkpoint(args.checkpoint, args.output, args.bits)
+    try:
+        method = _resolve_method(args.method, args.bits, args.calib_dataset)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    stats = quantize_checkpoint(
+        args.checkpoint,
+        args.output,
+        args.bits,
+        group_size=args.group_size,
+        zero_point=args.zero_point,
+        calib_dataset=args.calib_dataset,
+        calib_samples=args.calib_samples,
+        calib_seq_len=args.calib_seq_len,
+        method=method,
+        act_order=args.act_order,
+        true_sequential=args.true_sequential,
+        damp_percent=args.damp_percent,
+        skip_modules=[p.strip() for p in args.skip_modules.split(",") if p.strip()],
+    )
     print(json.dumps(stats, indent=2))
     return 0
 
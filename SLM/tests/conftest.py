@@ -0,0 +1,29 @@
+"""Shared fixtures for the SLM test suite."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def script_help():
+    """Return ``run(script) -> CompletedProcess`` for ``<script> --help``.
+
+    Each script's help is produced by one real subprocess per session and then
+    reused, since interpreter start-up dominates these tests and every help
+    assertion inspects the same output.
+    """
+    cache: dict = {}
+
+    def run(script):
+        if script not in cache:
+            cache[script] = subprocess.run(
+                [sys.executable, str(script), "--help"],
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        return cache[script]
+
+    return run
@@ -1,51 +1,54 @@
 """Unit tests for SLM.tools.dataset_builder module."""
 
+import json
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the SLM package root is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from tools.dataset_builder import analyze_dataset, clean_dataset
 
 
+@pytest.fixture(scope="module")
+def analysis_result():
+    """One analyze_dataset run over a missing path, shared by the tests below."""
+    return analyze_dataset("/nonexistent/path")
+
+
 class TestAnalyzeDataset:
     """Tests for the analyze_dataset function."""
 
-    def test_returns_dict(self):
+    def test_returns_dict(self, analysis_result):
         """analyze_dataset should always return a dict."""
-        result = analyze_dataset("/nonexistent/path")
-        assert isinstance(result, dict)
+        assert isinstance(analysis_result, dict)
 
-    def test_has_files_key(self):
+    def test_has_files_key(self, analysis_result):
         """Result should contain a 'files' key."""
-        result = analyze_dataset("/nonexistent/path")
-        assert "files" in result
+        assert "files" in analysis_result
 
-    def test_has_tokens_key(self):
+    def test_has_tokens_key(self, analysis_result):
         """Result should contain a 'tokens' key."""
-        result = analyze_dataset("/nonexistent/path")
-        assert "tokens" in result
+        assert "tokens" in analysis_result
 
-    def test_has_vocab_size_key(self):
+    def test_has_vocab_size_key(self, analysis_result):
         """Result should contain a 'vocab_size' key."""
-        result = analyze_dataset("/nonexistent/path")
-        assert "vocab_size" in result
+        assert "vocab_size" in analysis_result
 
-    def test_values_are_numeric(self):
+    def test_values_are_numeric(self, analysis_result):
         """All values in the result should be numeric (int or float)."""
-        result = analyze_dataset("/nonexistent/path")
         for key in ("files", "tokens", "vocab_size"):
-            assert isinstance(result[key], (int, float)), (
-                f"Expected numeric value for '{key}', got {type(result[key])}"
+            assert isinstance(analysis_result[key], (int, float)), (
+                f"Expected numeric value for '{key}', got {type(analysis_result[key])}"
             )
 
-    def test_stub_returns_zeros(self):
+    def test_stub_returns_zeros(self, analysis_result):
         """The stub implementation should return zero counts."""
-        result = analyze_dataset("/nonexistent/path")
-        assert result["files"] == 0
-        assert result["tokens"] == 0
-        assert result["vocab_size"] == 0
+        assert analysis_result["files"] == 0
+        assert analysis_result["tokens"] == 0
+        assert analysis_result["vocab_size"] == 0
 
 
 class TestCleanDataset:
@@ -59,3 +62,83 @@ class TestCleanDataset:
         """clean_dataset should return None (it operates via side effects)."""
         result = clean_dataset("/nonexistent/input", "/nonexistent/output")
         assert result is None
+
+
+class TestAnalyzeParquet:
+    """analyze_dataset over tokenized Parquet shards (needs pyarrow)."""
+
+    def test_counts_token_ids(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        for i, rows in enumerate(([[1, 2, 3], [3, 4]], [[4, 5, 6, 7]])):
+            table = pa.table({"input_ids": pa.array(rows, type=pa.list_(pa.uint16()))})
+            pq.write_table(table, tmp_path / f"shard_{i}.parquet")
+
+        result = analyze_dataset(str(tmp_path))
+        assert result == {
+            "files": 2, "tokens": 0, "vocab_size": 0, "token_ids": 9, "id_vocab_size": 7
+        }
+
+    def test_text_and_id_vocabularies_reported_separately(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pa.table({"input_ids": pa.array([[1, 2, 2]], type=pa.list_(pa.int64()))})
+        pq.write_table(table, tmp_path / "shard.parquet")
+        (tmp_path / "a.txt").write_text("boot ok ok")
+
+        result = analyze_dataset(str(tmp_path))
+        assert result == {
+            "files": 2, "tokens": 3, "vocab_size": 2, "token_ids": 3, "id_vocab_size": 2
+        }
+
+    def test_skipped_with_warning_without_pyarrow(self, tmp_path, monkeypatch):
+        (tmp_path / "shard.parquet").write_bytes(b"PAR1")
+        (tmp_path / "a.txt").write_text("boot ok")
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        monkeypatch.setitem(sys.modules, "pyarrow.dataset", None)
+
+        with pytest.warns(RuntimeWarning, match="skipping 1 Parquet file"):
+            result = analyze_dataset(str(tmp_path))
+        assert result == {"files": 1, "tokens": 2, "vocab_size": 2}
+
+    def test_skips_negative_ignore_ids(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        rows = [[-100, 5, 5], [7, -100]]
+        table = pa.table({"input_ids": pa.array(rows, type=pa.list_(pa.int64()))})
+        pq.write_table(table, tmp_path / "shard.parquet")
+
+        result = analyze_dataset(str(tmp_path))
+        assert result["token_ids"] == 3 and result["id_vocab_size"] == 2
+
+
+class TestCleanDatasetShards:
+    """clean_dataset packing many small inputs into a few shards."""
+
+    def test_packs_and_dedupes_across_files(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        for i in range(5):
+            (src / f"f{i}.jsonl").write_text(
+                json.dumps({"text": f"sample {i}"}) + "\n" + json.dumps({"text": "dup"}) + "\n"
+            )
+        out = tmp_path / "out"
+        clean_dataset(str(src), str(out), max_rows_per_file=4, workers=2)
+
+        shards = sorted(out.glob("part-*.jsonl"))
+        assert [s.name for s in shards] == ["part-00000.jsonl", "part-00001.jsonl"]
+        rows = [json.loads(line)["text"] for s in shards for line in s.read_text().splitlines()]
+        assert rows == ["sample 0", "dup", "sample 1", "sample 2", "sample 3", "sample 4"]
+
+
+class TestAnalyzeParallel:
+    """analyze_dataset scanning text files in a process pool."""
+
+    def test_matches_serial(self, tmp_path):
+        for i in range(3):
+            (tmp_path / f"f{i}.jsonl").write_text(
+                json.dumps({"text": f"boot stage {i}"}) + "\n" + json.dumps({"text": "ok"}) + "\n"
+            )
+        serial = analyze_dataset(str(tmp_path))
+        assert analyze_dataset(str(tmp_path), workers=2) == serial
+        assert serial == {"files": 3, "tokens": 12, "vocab_size": 6}
@@ -14,36 +14,21 @@ class TestExportGgufScript:
         """The export_gguf.py script should exist on disk."""
         assert SCRIPT.exists(), f"Script not found: {SCRIPT}"
 
-    def test_help_flag(self):
+    def test_help_flag(self, script_help):
         """export_gguf.py --help should exit cleanly and show usage info."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert result.returncode == 0
         stdout_lower = result.stdout.lower()
         assert "model" in stdout_lower or "usage" in stdout_lower
 
-    def test_help_mentions_output(self):
+    def test_help_mentions_output(self, script_help):
         """export_gguf.py --help should mention the --output option."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert "output" in result.stdout.lower()
 
-    def test_help_mentions_model(self):
+    def test_help_mentions_model(self, script_help):
         """export_gguf.py --help should mention the --model option."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert "model" in result.stdout.lower()
 
     def test_missing_required_args(self):
@@ -1,8 +1,11 @@
 """Unit tests for SLM.tools.gguf_validator module."""
 
+import struct
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the SLM package root is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -15,23 +18,32 @@ def _write_gguf(path: Path, tensor_count: int = 0, kv_count: int = 0, pad: int =
     return path
 
 
+@pytest.fixture(scope="module")
+def missing_result():
+    """validate_gguf result for a path that does not exist."""
+    return validate_gguf("/nonexistent/model.gguf")
+
+
+@pytest.fixture(scope="module")
+def valid_result(tmp_path_factory):
+    """validate_gguf result for one minimal well-formed GGUF file."""
+    return validate_gguf(str(_write_gguf(tmp_path_factory.mktemp("gguf") / "model.gguf")))
+
+
 class TestValidateGgufNonexistent:
     """Tests for validate_gguf with a file that does not exist."""
 
-    def test_nonexistent_file_invalid(self):
+    def test_nonexistent_file_invalid(self, missing_result):
         """A nonexistent file should be marked as invalid."""
-        result = validate_gguf("/nonexistent/model.gguf")
-        assert result["valid"] is False
+        assert missing_result["valid"] is False
 
-    def test_nonexistent_file_has_error(self):
+    def test_nonexistent_file_has_error(self, missing_result):
         """A nonexistent file result should contain an 'error' key."""
-        result = validate_gguf("/nonexistent/model.gguf")
-        assert "error" in result
+        assert "error" in missing_result
 
-    def test_nonexistent_file_error_message(self):
+    def test_nonexistent_file_error_message(self, missing_result):
         """The error message should indicate the file was not found."""
-        result = validate_gguf("/nonexistent/model.gguf")
-        assert "not found" in result["error"].lower()
+        assert "not found" in missing_result["error"].lower()
 
 
 class TestValidateGgufMalformed:
@@ -53,23 +65,68 @@ class TestValidateGgufMalformed:
         assert result["valid"] is False
 
 
+def _kv_string(key: str, value: str) -> bytes:
+    """Encode one string-valued GGUF metadata record (type 8)."""
+    k, v = key.encode(), value.encode()
+    return struct.pack("<Q", len(k)) + k + struct.pack("<IQ", 8, len(v)) + v
+
+
+class TestValidateGgufMetadata:
+    """Tests for the metadata KV walk."""
+
+    def test_reports_architecture(self, tmp_path):
+        """general.architecture is read out of the metadata section."""
+        u32_kv = struct.pack("<Q", 9) + b"some.u32k" + struct.pack("<II", 4, 7)
+        body = _kv_string("general.architecture", "auton-slm") + u32_kv
+        path = tmp_path / "m.gguf"
+        path.write_bytes(make_minimal_header(3, 0, 2) + body)
+        result = validate_gguf(str(path))
+        assert result["valid"] is True
+        assert result["architecture"] == "auton-slm"
+
+    def test_truncated_metadata_invalid(self, tmp_path):
+        """KV records that run past the end of the file are rejected."""
+        body = _kv_string("general.architecture", "auton-slm")[:-3]
+        path = tmp_path / "m.gguf"
+        path.write_bytes(make_minimal_header(3, 0, 1) + body)
+        result = validate_gguf(str(path))
+        assert result["valid"] is False
+        assert "truncated" in result["error"].lower()
+
+    def test_deeply_nested_arrays_do_not_recurse(self, tmp_path):
+        """Arrays nested far past the recursion limit are walked, not recursed."""
+        depth = sys.getrecursionlimit() * 2
+        value = struct.pack("<IQ", 9, 1) * depth + struct.pack("<IQ", 4, 0)
+        body = struct.pack("<Q", 4) + b"deep" + struct.pack("<I", 9) + value
+        path = tmp_path / "m.gguf"
+        path.write_bytes(make_minimal_header(3, 0, 1) + body)
+        assert validate_gguf(str(path))["valid"] is True
+        path.write_bytes(make_minimal_header(3, 0, 1) + body[:-4])
+        assert validate_gguf(str(path))["valid"] is False
+
+    def test_version_1_rejected(self, tmp_path):
+        """GGUF v1 used 32-bit lengths, which the metadata walk does not parse."""
+        path = tmp_path / "m.gguf"
+        path.write_bytes(make_minimal_header(1) + b"\x00" * 64)
+        result = validate_gguf(str(path))
+        assert result["valid"] is False
+        assert "version 1" in result["error"]
+
+
 class TestValidateGgufValid:
     """Tests for validate_gguf with a well-formed GGUF file."""
 
-    def test_valid_file(self, tmp_path):
+    def test_valid_file(self, valid_result):
         """A file with a correct GGUF header should be valid."""
-        result = validate_gguf(str(_write_gguf(tmp_path / "model.gguf")))
-        assert result["valid"] is True
+        assert valid_result["valid"] is True
 
-    def test_valid_file_has_size(self, tmp_path):
+    def test_valid_file_has_size(self, valid_result):
         """A valid file result should contain a 'size_mb' key."""
-        result = validate_gguf(str(_write_gguf(tmp_path / "model.gguf")))
-        assert "size_mb" in result
+        assert "size_mb" in valid_result
 
-    def test_valid_file_size_positive(self, tmp_path):
+    def test_valid_file_size_positive(self, valid_result):
         """The size_mb value should be positive for a non-empty file."""
-        result = validate_gguf(str(_write_gguf(tmp_path / "model.gguf")))
-        assert result["size_mb"] > 0
+        assert valid_result["size_mb"] > 0
 
     def test_valid_file_reports_header_fields(self, tmp_path):
         """A valid file should report parsed version and tensor_count."""
@@ -78,7 +135,6 @@ class TestValidateGgufValid:
         assert result["tensor_count"] == 5
         assert result["kv_count"] == 7
 
-    def test_no_error_key_for_valid_file(self, tmp_path):
+    def test_no_error_key_for_valid_file(self, valid_result):
         """A valid file result should not contain an 'error' key."""
-        result = validate_gguf(str(_write_gguf(tmp_path / "model.gguf", pad=512)))
-        assert "error" not in result
+        assert "error" not in valid_result
@@ -4,10 +4,17 @@ import math
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the SLM package root is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from tools.metrics import compute_perplexity, compute_accuracy
+from tools.metrics import (
+    compute_accuracy,
+    compute_perplexity,
+    compute_perplexity_array,
+    compute_perplexity_streaming,
+)
 
 
 class TestComputePerplexity:
@@ -48,6 +55,28 @@ class TestComputePerplexity:
         assert isinstance(result, float)
 
 
+class TestPerplexityAggregation:
+    """Tests for the streaming and array perplexity helpers."""
+
+    def test_streaming_is_token_weighted(self):
+        """Two batches of different sizes combine by token count, not by batch."""
+        # batch 1: 10 tokens at mean loss 1.0; batch 2: 30 tokens at mean loss 2.0
+        result = compute_perplexity_streaming(10 * 1.0 + 30 * 2.0, 40)
+        assert abs(result - math.exp(1.75)) < 1e-9
+
+    def test_streaming_zero_tokens(self):
+        """No tokens yields exp(0) rather than dividing by zero."""
+        assert compute_perplexity_streaming(0.0, 0) == 1.0
+
+    def test_array_matches_scalar(self):
+        """The vectorized helper agrees with the scalar API element-wise."""
+        pytest.importorskip("numpy")
+        result = compute_perplexity_array([0.0, 1.0, 3.0])
+        assert [round(float(v), 6) for v in result] == [
+            round(compute_perplexity(v), 6) for v in (0.0, 1.0, 3.0)
+        ]
+
+
 class TestComputeAccuracy:
     """Tests for the compute_accuracy function."""
 
@@ -69,3 +98,22 @@ class TestComputeAccuracy:
     def test_all_match_is_one(self):
         """Identical sequences score 1.0."""
         assert compute_accuracy([1, 2, 3], [1, 2, 3]) == 1.0
+
+    def test_ignore_index_excludes_positions(self):
+        """Labels equal to ignore_index don't count toward the denominator."""
+        assert compute_accuracy([1, 9, 3, 9], [1, -100, 4, -100], ignore_index=-100) == 0.5
+
+    def test_numpy_arrays(self):
+        """NumPy inputs take the vectorized path with the same semantics."""
+        np = pytest.importorskip("numpy")
+        preds = np.array([[1, 2], [3, 4]])
+        labels = np.array([[1, 0], [3, -100]])
+        assert compute_accuracy(preds, labels) == 0.5
+        assert abs(compute_accuracy(preds, labels, ignore_index=-100) - 2 / 3) < 1e-9
+
+    def test_torch_tensors(self):
+        """torch inputs are reduced on-device and return a Python float."""
+        torch = pytest.importorskip("torch")
+        result = compute_accuracy(torch.tensor([1, 2, 3]), torch.tensor([1, 2, 4]))
+        assert isinstance(result, float)
+        assert abs(result - 2 / 3) < 1e-9
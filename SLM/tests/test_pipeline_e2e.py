@@ -6,6 +6,7 @@ second on CPU, plus a check that the shipped tiny_10M.yaml config builds.
 """
 
 import json
+import subprocess
 import sys
 from pathlib import Path
 
@@ -121,3 +122,231 @@ def test_full_pipeline(tiny_config, tiny_dataset, tmp_path):
     result = validate_gguf(str(gguf_out))
     assert result["valid"] is True
     assert result["tensor_count"] == gguf_summary["tensors"]
+
+
+def test_int4_pack_roundtrip():
+    import torch
+
+    codes = torch.randint(0, 16, (3, 7), dtype=torch.uint8)
+    packed = quantize_mod.pack_int4(codes)
+    assert packed.shape == (3, 4)
+    assert torch.equal(quantize_mod.unpack_int4(packed)[:, :7], codes)
+
+
+def test_groupwise_quantization_error_is_bounded():
+    import torch
+
+    torch.manual_seed(0)
+    w = torch.randn(16, 256)
+    codes, scales, zeros = quantize_mod.quantize_groupwise(w, bits=4, group_size=128)
+    assert scales.shape == (16, 2) and scales.dtype == torch.float16
+    w_hat = quantize_mod.dequantize_groupwise(codes, scales, zeros)
+    # Round-to-nearest error is at most half a step per group.
+    assert (w_hat - w).abs().max() <= scales.float().max() / 2 + 1e-4
+
+
+def test_awq_quantize_with_calibration(tiny_config, tiny_dataset, tmp_path):
+    import torch
+
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=2, seq_len=8, batch_size=2,
+    )
+    q_out = tmp_path / "model_awq.pt"
+    stats = quantize_mod.quantize_checkpoint(
+        summary["checkpoint"], str(q_out), 4,
+        calib_dataset=str(tiny_dataset), calib_samples=16, calib_seq_len=8,
+    )
+    assert stats["method"] == "awq"
+    assert stats["awq_layers"] > 0
+
+    manifest = json.loads(Path(stats["manifest"]).read_text())
+    assert manifest["version"] == "GEMM"
+    assert manifest["group_size"] == 128
+    assert manifest["zero_point"] is True
+
+    model, _ = quantize_mod.load_quantized(str(q_out))
+    ids = torch.randint(0, model.cfg.vocab_size, (1, 8))
+    logits, _ = model(ids)
+    assert torch.isfinite(logits).all()
+
+
+def test_skip_modules_keeps_head_and_embeddings_full_precision(tiny_config, tiny_dataset, tmp_path):
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=1, seq_len=8, batch_size=2,
+    )
+    q_out = tmp_path / "model_int4.pt"
+    stats = quantize_mod.quantize_checkpoint(summary["checkpoint"], str(q_out), 4)
+    assert stats["skipped_modules"] == ["embed_tokens", "lm_head"]
+    assert all(".attn." in m or ".ffn." in m for m in stats["quantized_modules"])
+
+    manifest = json.loads(Path(stats["manifest"]).read_text())
+    assert manifest["modules_to_not_convert"] == list(quantize_mod.DEFAULT_SKIP_MODULES)
+    assert manifest["skipped_modules"] == stats["skipped_modules"]
+
+    # Skipping one half of a tied pair keeps both; an empty list quantizes all.
+    stats = quantize_mod.quantize_checkpoint(
+        summary["checkpoint"], str(q_out), 4, skip_modules=["lm_head"]
+    )
+    assert stats["skipped_modules"] == ["embed_tokens", "lm_head"]
+    stats = quantize_mod.quantize_checkpoint(summary["checkpoint"], str(q_out), 4, skip_modules=[])
+    assert stats["skipped_modules"] == []
+    assert "lm_head" in stats["quantized_modules"]
+    assert quantize_mod.is_skipped("visual.blocks.0.proj.weight", ["visual.*"])
+    assert not quantize_mod.is_skipped("layers.0.attn.q_proj.weight", ["visual.*"])
+
+
+def test_gptq_beats_rtn_on_correlated_inputs():
+    import torch
+
+    torch.manual_seed(0)
+    w = torch.randn(32, 128)
+    x = torch.randn(1024, 8) @ torch.randn(8, 128) + 0.1 * torch.randn(1024, 128)
+    h = 2 * x.t() @ x / x.shape[0]
+    ref = x @ w.t()
+
+    rtn = quantize_mod.dequantize_groupwise(*quantize_mod.quantize_groupwise(w, 4, 128))
+    for act_order in (False, True):
+        gptq = quantize_mod.dequantize_groupwise(
+            *quantize_mod.gptq_quantize_weight(w, h, 4, 128, act_order=act_order)
+        )
+        assert (x @ gptq.t() - ref).pow(2).mean() < (x @ rtn.t() - ref).pow(2).mean()
+
+
+def test_gptq_quantize_checkpoint(tiny_config, tiny_dataset, tmp_path):
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=2, seq_len=8, batch_size=2,
+    )
+    q_out = tmp_path / "model_gptq.pt"
+    stats = quantize_mod.quantize_checkpoint(
+        summary["checkpoint"], str(q_out), 4, method="gptq",
+        calib_dataset=str(tiny_dataset), calib_samples=16, calib_seq_len=8,
+    )
+    assert stats["method"] == "gptq"
+    assert stats["gptq_layers"] > 0
+    manifest = json.loads(Path(stats["manifest"]).read_text())
+    assert manifest["version"] == "exllama"
+    assert manifest["desc_act"] is False
+    model, _ = quantize_mod.load_quantized(str(q_out))
+    assert model.num_parameters() > 0
+
+
+def test_gptq_requires_calibration(tmp_path):
+    with pytest.raises(ValueError):
+        quantize_mod.quantize_checkpoint("unused.pt", str(tmp_path / "q.pt"), 4, method="gptq")
+
+
+def test_train_bf16_with_gradient_checkpointing(tiny_config, tiny_dataset, tmp_path):
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "out"),
+        max_steps=2, seq_len=8, batch_size=2,
+        precision="bf16", gradient_checkpointing=True,
+    )
+    assert summary["precision"] == "bf16"
+    assert summary["final_loss"] == summary["final_loss"]  # not NaN
+    assert Path(summary["checkpoint"]).exists()
+
+
+def test_train_cuda_graphs_fall_back_off_gpu(tiny_config, tiny_dataset, tmp_path):
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "out"),
+        max_steps=2, seq_len=8, batch_size=2, cuda_graphs=True,
+    )
+    assert summary["cuda_graphs"] is False
+    assert summary["final_loss"] == summary["final_loss"]
+
+
+def test_train_two_ranks_via_torchrun(tiny_config, tiny_dataset, tmp_path):
+    """--num-gpus relaunches under torchrun; on CPU the ranks run DDP over gloo."""
+    out = tmp_path / "out"
+    result = subprocess.run(
+        [
+            sys.executable, str(SLM_ROOT / "scripts" / "train.py"),
+            "--config", str(tiny_config), "--dataset", str(tiny_dataset),
+            "--output", str(out), "--max-steps", "2", "--seq-len", "8",
+            "--batch-size", "2", "--num-gpus", "2",
+        ],
+        capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    summary = json.loads(result.stdout[result.stdout.index("{"):])
+    assert summary["world_size"] == 2
+    assert summary["steps"] == 2
+    assert (out / "final.pt").exists()
+    from model.checkpoint import load_checkpoint
+
+    model, _ = load_checkpoint(out / "final.pt")
+    assert model.num_parameters() == summary["parameters"]
+
+
+def test_prefetch_to_device_preserves_batches():
+    from model.data import make_batches, prefetch_to_device
+
+    tokens = list(range(64))
+    expected = list(make_batches(tokens, 8, 2))
+    got = list(prefetch_to_device(make_batches(tokens, 8, 2), "cpu"))
+    assert len(got) == len(expected) == 4
+    for (ids, labels), (exp_ids, _) in zip(got, expected):
+        assert ids.equal(exp_ids)
+        assert labels.equal(exp_ids)
+
+
+def test_export_onnx_static_shapes_optimized(tiny_config, tiny_dataset, tmp_path):
+    ort = pytest.importorskip("onnxruntime")
+    import numpy as np
+
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=1, seq_len=8, batch_size=2,
+    )
+    out = tmp_path / "model.onnx"
+    result = onnx_mod.export_onnx(
+        summary["checkpoint"], str(out), static_shapes=(2, 8), optimize=True
+    )
+    assert result["static_shapes"] == [2, 8]
+    opt_path = Path(result["optimized_output"])
+    assert opt_path.exists()
+
+    session = ort.InferenceSession(str(opt_path), providers=["CPUExecutionProvider"])
+    (logits,) = session.run(None, {"input_ids": np.zeros((2, 8), dtype=np.int64)})
+    assert logits.shape == (2, 8, 128)
+
+
+@pytest.mark.parametrize("quant", ["f16", "q8_0", "q4_0"])
+def test_export_gguf_quantized(tiny_config, tiny_dataset, tmp_path, quant):
+    from gguf import GGUFReader
+
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=1, seq_len=8, batch_size=2,
+    )
+    out = tmp_path / f"model-{quant}.gguf"
+    result = gguf_mod.export_gguf(summary["checkpoint"], str(out), quant=quant)
+    assert validate_gguf(str(out))["valid"] is True
+
+    reader = GGUFReader(str(out))
+    types = {t.name: t.tensor_type.name for t in reader.tensors}
+    assert len(types) == result["tensors"]
+    assert types["norm.weight"] == "F32"  # 1D tensors are never quantized
+    assert types["layers.0.ffn.up_proj.weight"] == quant.upper()
+
+
+def test_evaluate_sliding_window_scores_each_token_once(tiny_config, tiny_dataset, tmp_path):
+    summary = train_mod.train(
+        str(tiny_config), str(tiny_dataset), str(tmp_path / "ckpt"),
+        max_steps=1, seq_len=8, batch_size=2,
+    )
+    full = evaluate_mod.evaluate(summary["checkpoint"], str(tiny_dataset), seq_len=8, batch_size=2)
+    sliding = evaluate_mod.evaluate(
+        summary["checkpoint"], str(tiny_dataset), seq_len=8, batch_size=2, stride=4
+    )
+    # Non-overlapping windows score seq_len - 1 tokens each.
+    assert full["scored_tokens"] == full["windows"] * 7
+    # Sliding: the first window scores 7 tokens, each later one its 4 new tokens.
+    assert sliding["scored_tokens"] == 7 + (sliding["windows"] - 1) * 4
+    assert sliding["perplexity"] > 0
+
+    with pytest.raises(ValueError):
+        evaluate_mod.evaluate(summary["checkpoint"], str(tiny_dataset), seq_len=8, stride=9)
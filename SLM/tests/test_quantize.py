@@ -14,36 +14,21 @@ class TestQuantizeScript:
         """The quantize.py script should exist on disk."""
         assert SCRIPT.exists(), f"Script not found: {SCRIPT}"
 
-    def test_help_flag(self):
+    def test_help_flag(self, script_help):
         """quantize.py --help should exit cleanly and show usage info."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert result.returncode == 0
         stdout_lower = result.stdout.lower()
         assert "checkpoint" in stdout_lower or "usage" in stdout_lower
 
-    def test_help_mentions_bits(self):
+    def test_help_mentions_bits(self, script_help):
         """quantize.py --help should mention the --bits option."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert "bits" in result.stdout.lower()
 
-    def test_help_mentions_output(self):
+    def test_help_mentions_output(self, script_help):
         """quantize.py --help should mention the --output option."""
-        result = subprocess.run(
-            [sys.executable, str(SCRIPT), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
+        result = script_help(SCRIPT)
         assert "output" in result.stdout.lower()
 
     def test_missing_required_args(self):
@@ -55,3 +40,21 @@ class TestQuantizeScript:
             timeout=30,
         )
         assert result.returncode != 0
+
+    def test_int8_rejects_int4_methods(self, tmp_path):
+        """--bits 8 with --method gptq/awq is a usage error, not a silent rtn."""
+        result = subprocess.run(
+            [
+                sys.executable, str(SCRIPT),
+                "--checkpoint", str(tmp_path / "model.pt"),
+                "--output", str(tmp_path / "model.int8.pt"),
+                "--bits", "8",
+                "--method", "gptq",
+                "--calib-dataset", str(tmp_path / "calib.jsonl"),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        assert result.returncode == 2
+        assert "INT4-only" in result.stderr
@@ -1,12 +1,16 @@
 """Unit tests for SLM.tools.tokenizer module."""
 
+import json
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the SLM package root is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from tools.tokenizer import train_tokenizer, tokenize_dataset
+from model.token_bin import read_token_bin
+from tools.tokenizer import tokenize_dataset, train_tokenizer
 
 
 class TestTrainTokenizer:
@@ -54,3 +58,68 @@ class TestTokenizeDataset:
         """tokenize_dataset should return None."""
         result = tokenize_dataset("/fake/input", "/fake/output", "/fake/vocab")
         assert result is None
+
+
+class TestBpeTokenizer:
+    """Byte-level BPE training via the optional `tokenizers` library."""
+
+    def test_train_and_tokenize(self, tmp_path):
+        pytest.importorskip("tokenizers")
+        data = tmp_path / "data.jsonl"
+        data.write_text(
+            "\n".join(json.dumps({"text": f"load driver e1000 on bus {i}"}) for i in range(50))
+        )
+        tok_path = tmp_path / "tokenizer.json"
+
+        summary = train_tokenizer(str(data), vocab_size=300, output_path=str(tok_path), model="bpe")
+        assert summary["vocab_size"] == 300
+        assert 4 < summary["learned"] <= 300
+        assert tok_path.exists()
+
+        out = tmp_path / "ids.jsonl"
+        tokenize_dataset(str(data), str(out), str(tok_path))
+        rows = [json.loads(line)["ids"] for line in out.read_text().splitlines()]
+        assert len(rows) == 50
+        assert all(rows)
+
+
+class TestPackedTokenBin:
+    """tokenize_dataset writing a packed .bin + .idx stream."""
+
+    def test_bin_matches_jsonl(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        for i in range(3):
+            (src / f"part{i}.jsonl").write_text(
+                "\n".join(json.dumps({"text": f"scan pci bus {i} {j}"}) for j in range(4))
+            )
+        vocab = tmp_path / "vocab.json"
+        train_tokenizer(str(src), vocab_size=64, output_path=str(vocab))
+
+        tokenize_dataset(str(src), str(tmp_path / "ids.jsonl"), str(vocab))
+        tokenize_dataset(str(src), str(tmp_path / "ids.bin"), str(vocab), workers=2)
+
+        expected = [
+            json.loads(line)["ids"] for line in (tmp_path / "ids.jsonl").read_text().splitlines()
+        ]
+        ids, offsets = read_token_bin(tmp_path / "ids.bin")
+        assert ids.itemsize == 2  # small vocab packs as uint16
+        assert len(offsets) == len(expected) + 1
+        docs = [ids[offsets[i] : offsets[i + 1]].tolist() for i in range(len(expected))]
+        assert docs == expected
+
+
+class TestParallelVocab:
+    """train_tokenizer counting files in a process pool."""
+
+    def test_matches_serial_vocab(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        for i in range(4):
+            (src / f"part{i}.jsonl").write_text(
+                "\n".join(json.dumps({"text": f"irq {i} vector {j % 3}"}) for j in range(5))
+            )
+        serial, parallel = tmp_path / "serial.json", tmp_path / "parallel.json"
+        train_tokenizer(str(src), vocab_size=16, output_path=str(serial))
+        train_tokenizer(str(src), vocab_size=16, output_path=str(parallel), workers=2)
+        assert parallel.read_text() == serial.read_text()
@@ -1,7 +1,9 @@
 """Dataset preprocessing and analysis utilities.
 
 Operates on JSONL datasets of OS-task samples (see README "Dataset Structure"):
-each line is a JSON object with at least a "text" field.
+each line is a JSON object with at least a "text" field. ``analyze`` also
+accepts tokenized Parquet shards (an ``input_ids`` list column), which are
+scanned in large record batches with ``pyarrow`` and counted with NumPy.
 """
 
 from __future__ import annotations
@@ -9,15 +11,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+import warnings
 from pathlib import Path
 
+PARQUET_BATCH_ROWS = 65536
 
-def _iter_text_files(path: Path):
-    """Yield .jsonl/.json/.txt files under a path (file or directory)."""
+
+def _iter_text_files(path: Path, exts: tuple[str, ...] = ("*.jsonl", "*.json", "*.txt")):
+    """Yield dataset files under a path (file or directory)."""
     if path.is_file():
         yield path
     elif path.is_dir():
-        for ext in ("*.jsonl", "*.json", "*.txt"):
+        for ext in exts:
             yield from sorted(path.rglob(ext))
 
 
@@ -43,57 +48,166 @@ def _iter_texts(file_path: Path):
         return
 
 
-def analyze_dataset(dataset_path: str) -> dict:
-    """Analyze dataset statistics.
+def _analyze_parquet(files: list[Path]) -> tuple[int, int]:
+    """Count token IDs and distinct IDs across tokenized Parquet shards.
 
-    Returns counts of files, whitespace tokens, and unique-token vocab size.
-    A nonexistent path yields zero counts.
+    Streams ``input_ids`` in large record batches and folds each batch's flat
+    ID buffer into a running ``np.bincount`` histogram, so counting runs as
+    vectorized C loops rather than per-token Python. Negative IDs (ignore
+    markers such as ``-100``) are not tokens and are left out of both counts.
     """
-    path = Path(dataset_path)
-    files = 0
+    import numpy as np
+    import pyarrow.dataset as pads
+
+    ds = pads.dataset([str(f) for f in files], format="parquet")
+    scanner = ds.scanner(columns=["input_ids"], batch_size=PARQUET_BATCH_ROWS)
+    tokens = 0
+    hist = np.zeros(0, dtype=np.int64)
+    for batch in scanner.to_batches():
+        column = batch.column("input_ids")
+        if len(column) == 0:
+            continue
+        ids = column.flatten().to_numpy(zero_copy_only=False)
+        if ids.dtype.kind == "i":
+            ids = ids[ids >= 0]
+        if ids.size == 0:
+            continue
+        tokens += int(ids.size)
+        counts = np.bincount(ids, minlength=hist.size)
+        counts[: hist.size] += hist
+        hist = counts
+    return tokens, int(np.count_nonzero(hist))
+
+
+def _text_file_stats(file_path: Path) -> tuple[int, set[str]]:
+    """Whitespace-token count and distinct tokens of one file (worker-safe)."""
     tokens = 0
     vocab: set[str] = set()
+    for text in _iter_texts(file_path):
+        words = text.split()
+        tokens += len(words)
+        vocab.update(words)
+    return tokens, vocab
+
+
+def analyze_dataset(dataset_path: str, workers: int = 1) -> dict:
+    """Analyze dataset statistics.
+
+    Returns counts of files, whitespace tokens, and unique-token vocab size of
+    the text records. Tokenized Parquet shards are a different vocabulary, so
+    their token-ID count and distinct-ID count are reported separately as
+    ``token_ids`` and ``id_vocab_size`` (present only when shards were
+    analyzed). Without ``pyarrow`` + ``numpy`` shards are skipped with a
+    warning. A nonexistent path yields zero counts. ``workers > 1`` scans text
+    files in a process pool.
+    """
+    path = Path(dataset_path)
+    text_files: list[Path] = []
+    parquet: list[Path] = []
+    for file_path in _iter_text_files(path, ("*.jsonl", "*.json", "*.txt", "*.parquet")):
+        if file_path.suffix.lower() == ".parquet":
+            parquet.append(file_path)
+        else:
+            text_files.append(file_path)
+
+    if workers > 1 and len(text_files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
 
-    for file_path in _iter_text_files(path):
-        files += 1
-        for text in _iter_texts(file_path):
-            words = text.split()
-            tokens += len(words)
-            vocab.update(words)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stats = list(pool.map(_text_file_stats, text_files))
+    else:
+        stats = [_text_file_stats(fp) for fp in text_files]
 
-    return {
-        "files": files,
+    tokens = sum(count for count, _ in stats)
+    vocab: set[str] = set()
+    for _, words in stats:
+        vocab |= words
+
+    result = {
+        "files": len(text_files),
         "tokens": tokens,
         "vocab_size": len(vocab),
     }
+    if parquet:
+        try:
+            id_tokens, id_vocab = _analyze_parquet(parquet)
+        except ImportError as exc:
+            warnings.warn(
+                f"skipping {len(parquet)} Parquet file(s): {exc.name or exc} is not installed",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        else:
+            result["files"] += len(parquet)
+            result["token_ids"] = id_tokens
+            result["id_vocab_size"] = id_vocab
+    return result
 
 
-def clean_dataset(input_path: str, output_path: str) -> None:
+def _normalized_texts(file_path: Path) -> list[str]:
+    """Whitespace-normalized, non-empty texts of one file (worker-safe)."""
+    return [norm for norm in (" ".join(t.split()) for t in _iter_texts(file_path)) if norm]
+
+
+def clean_dataset(
+    input_path: str,
+    output_path: str,
+    max_rows_per_file: int | None = None,
+    workers: int = 1,
+    sort_by_length: bool = False,
+) -> None:
     """Clean and preprocess a dataset.
 
     Deduplicates records by their normalized "text", drops empty/whitespace-only
     samples, and writes the result as JSONL. No-ops silently if the input is
     missing (operates via side effects, returns None).
+
+    With ``max_rows_per_file``, ``output_path`` is a directory and records are
+    packed into ``part-NNNNN.jsonl`` shards of at most that many rows, so a
+    corpus of many small files becomes a few large ones that downstream readers
+    consume sequentially. ``workers > 1`` reads and normalizes input files in a
+    process pool (file order, and so first-seen dedup, is preserved).
+    ``sort_by_length`` orders records by text length so shards hold similarly
+    sized samples.
     """
     in_path = Path(input_path)
     if not in_path.exists():
         return
 
+    files = list(_iter_text_files(in_path))
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_file = list(pool.map(_normalized_texts, files, chunksize=8))
+    else:
+        per_file = [_normalized_texts(fp) for fp in files]
+
     seen: set[str] = set()
-    cleaned: list[dict] = []
-    for file_path in _iter_text_files(in_path):
-        for text in _iter_texts(file_path):
-            norm = " ".join(text.split())
-            if not norm or norm in seen:
+    cleaned: list[str] = []
+    for texts in per_file:
+        for norm in texts:
+            if norm in seen:
                 continue
             seen.add(norm)
-            cleaned.append({"text": norm})
+            cleaned.append(norm)
+    if sort_by_length:
+        cleaned.sort(key=len)
 
     out_path = Path(output_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as fh:
-        for rec in cleaned:
-            fh.write(json.dumps(rec) + "\n")
+    if max_rows_per_file is None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        shards = [(out_path, cleaned)]
+    else:
+        out_path.mkdir(parents=True, exist_ok=True)
+        step = max(1, max_rows_per_file)
+        shards = [
+            (out_path / f"part-{i // step:05d}.jsonl", cleaned[i : i + step])
+            for i in range(0, len(cleaned), step)
+        ]
+    for shard_path, rows in shards:
+        with shard_path.open("w", encoding="utf-8") as fh:
+            fh.writelines(json.dumps({"text": norm}) + "\n" for norm in rows)
 
 
 def split_dataset(input_path: str, output_dir: str, train_ratio: float = 0.9) -> dict:
@@ -122,10 +236,16 @@ def main(argv: list[str] | None = None) -> int:
 
     p_analyze = sub.add_parser("analyze", help="report dataset statistics")
     p_analyze.add_argument("path")
+    p_analyze.add_argument("--workers", type=int, default=1, help="parallel reader processes")
 
     p_clean = sub.add_parser("clean", help="dedupe + normalize into JSONL")
     p_clean.add_argument("--input", required=True)
     p_clean.add_argument("--output", required=True)
+    p_clean.add_argument(
+        "--shard-rows", type=int, default=None, help="pack output into shards of N rows"
+    )
+    p_clean.add_argument("--workers", type=int, default=1, help="parallel reader processes")
+    p_clean.add_argument("--sort-by-length", action="store_true")
 
     p_split = sub.add_parser("split", help="train/val split")
     p_split.add_argument("--input", required=True)
@@ -135,9 +255,11 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.command == "analyze":
-        print(json.dumps(analyze_dataset(args.path), indent=2))
+        print(json.dumps(analyze_dataset(args.path, args.workers), indent=2))
     elif args.command == "clean":
-        clean_dataset(args.input, args.output)
+        clean_dataset(
+            args.input, args.output, args.shard_rows, args.workers, args.sort_by_length
+        )
         print(f"cleaned -> {args.output}")
     elif args.command == "split":
         summary = split_dataset(args.input, args.output, args.train_ratio)
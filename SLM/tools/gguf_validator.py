@@ -1,25 +1,114 @@
 """GGUF format validator.
 
 Performs real structural validation of a GGUF container: it checks the ``GGUF``
-magic bytes and parses the little-endian header (version, tensor count, metadata
-KV count). Dependency-free — it reads the header directly rather than requiring
-the ``gguf`` package.
+magic bytes, parses the little-endian header (version, tensor count, metadata
+KV count) and walks the metadata key/value records to make sure they are
+well-formed and fit inside the file. Dependency-free — it reads the file
+directly rather than requiring the ``gguf`` package.
+
+The file is memory-mapped and parsed with ``struct.unpack_from`` at offsets, so
+only the header and metadata pages are ever touched: validating a multi-GB
+model costs the same as validating a tiny one.
 """
 
 from __future__ import annotations
 
+import mmap
 import struct
 from pathlib import Path
 
 GGUF_MAGIC = b"GGUF"
 _HEADER = struct.Struct("<4sIQQ")  # magic, version(u32), tensor_count(u64), kv_count(u64)
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+# v1 used u32 string/array lengths; the walk below reads the u64 ones of v2+.
+_MIN_VERSION = 2
+
+# GGUF metadata value types -> fixed byte width (strings/arrays are variable).
+_GGUF_STRING = 8
+_GGUF_ARRAY = 9
+_SCALAR_SIZES = {0: 1, 1: 1, 2: 2, 3: 2, 4: 4, 5: 4, 6: 4, 7: 1, 10: 8, 11: 8, 12: 8}
+
+
+class _TruncatedError(Exception):
+    pass
+
+
+def _read_u32(buf, offset: int) -> tuple[int, int]:
+    if offset + 4 > len(buf):
+        raise _TruncatedError
+    return _U32.unpack_from(buf, offset)[0], offset + 4
+
+
+def _read_u64(buf, offset: int) -> tuple[int, int]:
+    if offset + 8 > len(buf):
+        raise _TruncatedError
+    return _U64.unpack_from(buf, offset)[0], offset + 8
+
+
+def _skip_string(buf, offset: int) -> tuple[int, int]:
+    """Return ``(start, end)`` of a length-prefixed string's bytes."""
+    length, start = _read_u64(buf, offset)
+    end = start + length
+    if end > len(buf):
+        raise _TruncatedError
+    return start, end
+
+
+def _skip_value(buf, offset: int, vtype: int) -> int:
+    """Advance past one metadata value of type ``vtype`` without copying it.
+
+    Nested arrays are walked with an explicit stack of ``(item type, items
+    left)``, so a file nesting arrays thousands deep cannot exhaust Python's
+    recursion limit.
+    """
+    pending = [(vtype, 1)]
+    while pending:
+        vtype, left = pending.pop()
+        if left > 1:
+            pending.append((vtype, left - 1))
+        if vtype in _SCALAR_SIZES:
+            offset += _SCALAR_SIZES[vtype]
+            if offset > len(buf):
+                raise _TruncatedError
+        elif vtype == _GGUF_STRING:
+            offset = _skip_string(buf, offset)[1]
+        elif vtype == _GGUF_ARRAY:
+            item_type, offset = _read_u32(buf, offset)
+            count, offset = _read_u64(buf, offset)
+            if item_type in _SCALAR_SIZES:
+                offset += count * _SCALAR_SIZES[item_type]
+                if offset > len(buf):
+                    raise _TruncatedError
+            elif count:
+                pending.append((item_type, count))
+        else:
+            raise ValueError(f"unknown metadata value type {vtype}")
+    return offset
+
+
+def _walk_metadata(buf, kv_count: int) -> tuple[int, str | None]:
+    """Walk ``kv_count`` KV records; return ``(end_offset, general.architecture)``."""
+    offset = _HEADER.size
+    architecture = None
+    for _ in range(kv_count):
+        key_start, key_end = _skip_string(buf, offset)
+        vtype, offset = _read_u32(buf, key_end)
+        if vtype == _GGUF_STRING and buf[key_start:key_end] == b"general.architecture":
+            start, end = _skip_string(buf, offset)
+            architecture = bytes(buf[start:end]).decode("utf-8", errors="replace")
+            offset = end
+        else:
+            offset = _skip_value(buf, offset, vtype)
+    return offset, architecture
 
 
 def validate_gguf(file_path: str) -> dict:
     """Validate a GGUF file.
 
-    Returns ``{"valid": True, "size_mb", "version", "tensor_count", "kv_count"}``
-    for a well-formed header, or ``{"valid": False, "error": ...}`` otherwise.
+    Returns ``{"valid": True, "size_mb", "version", "tensor_count", "kv_count",
+    "architecture"}`` for a well-formed header and metadata section, or
+    ``{"valid": False, "error": ...}`` otherwise.
     """
     path = Path(file_path)
 
@@ -30,12 +119,18 @@ def validate_gguf(file_path: str) -> dict:
     if size_bytes < _HEADER.size:
         return {"valid": False, "error": "File too small to contain a GGUF header"}
 
-    with path.open("rb") as fh:
-        header = fh.read(_HEADER.size)
-
-    magic, version, tensor_count, kv_count = _HEADER.unpack(header)
-    if magic != GGUF_MAGIC:
-        return {"valid": False, "error": f"Invalid magic: expected GGUF, got {magic!r}"}
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, tensor_count, kv_count = _HEADER.unpack_from(mm, 0)
+        if magic != GGUF_MAGIC:
+            return {"valid": False, "error": f"Invalid magic: expected GGUF, got {magic!r}"}
+        if version < _MIN_VERSION:
+            return {"valid": False, "error": f"Unsupported GGUF version {version}"}
+        try:
+            _, architecture = _walk_metadata(mm, kv_count)
+        except _TruncatedError:
+            return {"valid": False, "error": "Truncated metadata: KV records overrun the file"}
+        except ValueError as exc:
+            return {"valid": False, "error": f"Malformed metadata: {exc}"}
 
     return {
         "valid": True,
@@ -43,6 +138,7 @@ def validate_gguf(file_path: str) -> dict:
         "version": version,
         "tensor_count": tensor_count,
         "kv_count": kv_count,
+        "architecture": architecture,
     }
 
 
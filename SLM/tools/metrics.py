@@ -11,15 +11,69 @@ def compute_perplexity(loss: float) -> float:
     return math.exp(loss)
 
 
-def compute_accuracy(predictions: Sequence, labels: Sequence) -> float:
+def compute_perplexity_streaming(total_nll: float, total_tokens: int) -> float:
+    """Corpus perplexity from a summed NLL: ``exp(total_nll / total_tokens)``.
+
+    Accumulate ``cross_entropy(..., reduction="sum")`` and the token count per
+    batch (on-device, if the batches are tensors) and exponentiate once at the
+    end. Averaging per-batch perplexities instead is both slower (one ``exp``
+    per batch) and wrong whenever batches hold different token counts.
+    """
+    return math.exp(total_nll / max(total_tokens, 1))
+
+
+def compute_perplexity_array(losses):
+    """Element-wise perplexity of many losses in one vectorized ``np.exp``."""
+    import numpy as np
+
+    return np.exp(np.asarray(losses, dtype=np.float64))
+
+
+def compute_accuracy(
+    predictions: Sequence, labels: Sequence, ignore_index: int | None = None
+) -> float:
     """Compute prediction accuracy in [0.0, 1.0].
 
     Returns the fraction of positions where prediction == label over the
     overlapping length. Returns 0.0 for empty input or a length mismatch with
-    no overlap.
+    no overlap. Positions whose label equals ``ignore_index`` (e.g. ``-100``
+    padding) are excluded.
+
+    torch tensors are compared on their own device (one reduction, a single
+    scalar copied back) and NumPy arrays with one vectorized compare; other
+    sequences fall back to a Python loop.
     """
+    if hasattr(predictions, "eq") and hasattr(labels, "eq"):
+        return _tensor_accuracy(predictions.reshape(-1), labels.reshape(-1), ignore_index)
+    if hasattr(predictions, "__array__") or hasattr(labels, "__array__"):
+        import numpy as np
+
+        return _tensor_accuracy(
+            np.asarray(predictions).reshape(-1), np.asarray(labels).reshape(-1), ignore_index
+        )
+
     n = min(len(predictions), len(labels))
     if n == 0:
         return 0.0
-    correct = sum(1 for pred, label in zip(predictions, labels) if pred == label)
+    pairs = zip(predictions, labels)
+    if ignore_index is not None:
+        pairs = [(pred, label) for pred, label in pairs if label != ignore_index]
+        if not pairs:
+            return 0.0
+        n = len(pairs)
+    correct = sum(1 for pred, label in pairs if pred == label)
     return correct / n
+
+
+def _tensor_accuracy(predictions, labels, ignore_index: int | None) -> float:
+    """Accuracy over flat torch tensors or NumPy arrays (shared operator API)."""
+    n = min(predictions.shape[0], labels.shape[0])
+    if n == 0:
+        return 0.0
+    predictions, labels = predictions[:n], labels[:n]
+    hits = predictions == labels
+    if ignore_index is None:
+        return float(hits.sum()) / n
+    mask = labels != ignore_index
+    total = int(mask.sum())
+    return float((hits & mask).sum()) / total if total else 0.0
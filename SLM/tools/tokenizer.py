@@ -1,33 +1,55 @@
-"""Word-level tokenizer trainer/encoder.
+"""Tokenizer trainer/encoder.
 
-A dependency-free, deterministic tokenizer: it builds a frequency-ranked
-vocabulary (plus special tokens) and encodes text to integer IDs. This keeps the
-data pipeline runnable without heavyweight tokenizer libraries; the neural
-backend can swap in a BPE vocab of the same JSON shape later.
+The default ``word`` model is a dependency-free, deterministic tokenizer: it
+builds a frequency-ranked vocabulary (plus special tokens) and encodes text to
+integer IDs. This keeps the data pipeline runnable without heavyweight
+tokenizer libraries.
+
+The ``bpe`` model trains a byte-level BPE with the Rust-backed ``tokenizers``
+library (optional dependency), whose pair counting and merges run natively
+across all cores. It is saved as a standard ``tokenizer.json`` and
+:func:`tokenize_dataset` accepts either kind of file.
+
+:func:`tokenize_dataset` writes JSONL ``{"ids": [...]}`` by default, or — for a
+``.bin`` output — a packed token stream (``uint16`` when the vocab fits, else
+``uint32``) with a ``.idx`` sidecar of document offsets (see
+:func:`model.token_bin.read_token_bin`), a quarter of the bytes of int64 ids.
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import sys
+from array import array
 from collections import Counter
 from pathlib import Path
 
+# Make the SLM package root importable when run as a script.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 SPECIAL_TOKENS = ["<pad>", "<unk>", "<bos>", "<eos>"]
 
+# Texts per encode_batch call; large batches amortize the Python->Rust hop.
+ENCODE_BATCH_SIZE = 65536
 
-def _read_texts(path: Path):
-    """Yield text payloads from a JSONL/JSON ("text" field) or plain-text file."""
+
+def _dataset_files(path: Path) -> list[Path]:
+    """List the text/JSONL files of a dataset path (file or directory)."""
     if not path.exists():
-        return
-    targets = []
+        return []
     if path.is_file():
-        targets = [path]
-    else:
-        for ext in ("*.jsonl", "*.json", "*.txt"):
-            targets.extend(sorted(path.rglob(ext)))
-    for fp in targets:
+        return [path]
+    targets: list[Path] = []
+    for ext in ("*.jsonl", "*.json", "*.txt"):
+        targets.extend(sorted(path.rglob(ext)))
+    return targets
+
+
+def _read_texts(path: Path):
+    """Yield text payloads from a JSONL/JSON ("text" field) or plain-text file."""
+    for fp in _dataset_files(path):
         try:
             if fp.suffix.lower() in (".jsonl", ".json"):
                 for line in fp.read_text(encoding="utf-8").splitlines():
@@ -46,16 +68,67 @@ def _read_texts(path: Path):
             continue
 
 
-def train_tokenizer(input_path: str, vocab_size: int = 32000, output_path: str | None = None) -> dict:
-    """Build a frequency-ranked vocabulary from a dataset.
+def _count_words(file_path: Path) -> Counter[str]:
+    """Whitespace-token counts of one dataset file (worker-safe)."""
+    counter: Counter[str] = Counter()
+    for text in _read_texts(file_path):
+        counter.update(text.split())
+    return counter
+
+
+def _train_bpe(input_path: str, vocab_size: int, output_path: str | None) -> dict:
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+
+    tok = Tokenizer(models.BPE(unk_token="<unk>"))
+    tok.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tok.decoder = decoders.ByteLevel()
+    trainer = trainers.BpeTrainer(
+        vocab_size=vocab_size,
+        special_tokens=SPECIAL_TOKENS,
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet(),
+        show_progress=False,
+    )
+    tok.train_from_iterator(_read_texts(Path(input_path)), trainer=trainer)
+
+    summary = {"vocab_size": vocab_size, "learned": tok.get_vocab_size(), "model": "bpe"}
+    if output_path:
+        out = Path(output_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tok.save(str(out))
+        summary["path"] = str(out)
+    return summary
+
+
+def train_tokenizer(
+    input_path: str,
+    vocab_size: int = 32000,
+    output_path: str | None = None,
+    model: str = "word",
+    workers: int = 1,
+) -> dict:
+    """Build a frequency-ranked vocabulary (or a byte-level BPE) from a dataset.
 
     Returns a summary dict that always echoes the requested ``vocab_size``.
     Missing input paths yield an empty learned vocab (no error). If
-    ``output_path`` is given, the vocab is written there as JSON.
+    ``output_path`` is given, the vocab is written there as JSON. ``model="bpe"``
+    trains with the ``tokenizers`` library and writes a ``tokenizer.json``.
+    ``workers > 1`` counts word-model files in a process pool; per-file counts
+    are merged in file order, so the vocab is identical to a serial run.
     """
+    if model == "bpe":
+        return _train_bpe(input_path, vocab_size, output_path)
+
     counter: Counter[str] = Counter()
-    for text in _read_texts(Path(input_path)):
-        counter.update(text.split())
+    files = _dataset_files(Path(input_path))
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for counts in pool.map(_count_words, files):
+                counter.update(counts)
+    else:
+        for fp in files:
+            counter.update(_count_words(fp))
 
     # Reserve slots for special tokens; fill the rest by frequency.
     capacity = max(0, vocab_size - len(SPECIAL_TOKENS))
@@ -80,27 +153,111 @@ def _load_vocab(vocab_path: str) -> dict[str, int]:
         return {tok: i for i, tok in enumerate(SPECIAL_TOKENS)}
 
 
+@functools.lru_cache(maxsize=4)
+def _load_encoder(vocab_path: str):
+    """Return ``(texts -> list of ids, vocab_size)`` for a vocab or tokenizer file.
+
+    Handles both the word-level vocab JSON and a ``tokenizers`` JSON file (the
+    latter encodes whole batches natively via ``encode_batch``). Cached so each
+    worker process loads the tokenizer once.
+    """
+    path = Path(vocab_path)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    except (OSError, json.JSONDecodeError):
+        raw = None
+    if isinstance(raw, dict) and isinstance(raw.get("model"), dict):
+        from tokenizers import Tokenizer
+
+        tok = Tokenizer.from_file(str(path))
+        return (
+            lambda texts: [enc.ids for enc in tok.encode_batch(texts)],
+            tok.get_vocab_size(),
+        )
+    vocab = _load_vocab(vocab_path)
+    return (
+        lambda texts: [encode(text, vocab) for text in texts],
+        max(vocab.values(), default=0) + 1,
+    )
+
+
+def _encode_file(file_path: Path, vocab_path: str) -> list[list[int]]:
+    """Encode every record of one file, ``ENCODE_BATCH_SIZE`` texts at a time."""
+    encode_batch, _ = _load_encoder(vocab_path)
+    docs: list[list[int]] = []
+    batch: list[str] = []
+    for text in _read_texts(file_path):
+        batch.append(text)
+        if len(batch) >= ENCODE_BATCH_SIZE:
+            docs.extend(encode_batch(batch))
+            batch = []
+    if batch:
+        docs.extend(encode_batch(batch))
+    return docs
+
+
 def encode(text: str, vocab: dict[str, int]) -> list[int]:
     """Encode text to token IDs, mapping unknown tokens to <unk>."""
     unk = vocab.get("<unk>", 1)
     return [vocab.get(tok, unk) for tok in text.split()]
 
 
-def tokenize_dataset(input_path: str, output_path: str, vocab_path: str) -> None:
-    """Tokenize a dataset to JSONL of {"ids": [...]} using a saved vocab.
+def tokenize_dataset(
+    input_path: str, output_path: str, vocab_path: str, workers: int = 1
+) -> None:
+    """Tokenize a dataset using a saved vocab or ``tokenizers`` file.
 
-    No-ops silently if the input is missing (returns None).
+    Writes JSONL of ``{"ids": [...]}``, or a packed ``.bin`` + ``.idx`` pair
+    when ``output_path`` ends in ``.bin``. ``workers > 1`` encodes input files
+    in a process pool (output order follows file order). No-ops silently if the
+    input is missing (returns None).
     """
     in_path = Path(input_path)
     if not in_path.exists():
         return
-    vocab = _load_vocab(vocab_path)
+    files = _dataset_files(in_path)
+    _, vocab_size = _load_encoder(vocab_path)
+
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=workers)
+        per_file = pool.map(_encode_file, files, [vocab_path] * len(files))
+    else:
+        pool = None
+        per_file = (_encode_file(fp, vocab_path) for fp in files)
 
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("w", encoding="utf-8") as fh:
-        for text in _read_texts(in_path):
-            fh.write(json.dumps({"ids": encode(text, vocab)}) + "\n")
+    try:
+        if out.suffix == ".bin":
+            _write_token_bin(out, per_file, vocab_size)
+        else:
+            with out.open("w", encoding="utf-8") as fh:
+                for docs in per_file:
+                    fh.writelines(json.dumps({"ids": ids}) + "\n" for ids in docs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _write_token_bin(out: Path, per_file, vocab_size: int) -> None:
+    from model.token_bin import INDEX_HEADER, INDEX_MAGIC
+
+    typecode = "H" if vocab_size <= 1 << 16 else "I"
+    offsets = array("Q", [0])
+    with out.open("wb") as fh:
+        for docs in per_file:
+            for ids in docs:
+                packed = array(typecode, ids)
+                if sys.byteorder == "big":
+                    packed.byteswap()
+                packed.tofile(fh)
+                offsets.append(offsets[-1] + len(ids))
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    header = INDEX_HEADER.pack(INDEX_MAGIC, array(typecode).itemsize, len(offsets) - 1)
+    out.with_suffix(".idx").write_bytes(header + offsets.tobytes())
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -108,13 +265,26 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--input", required=True, help="dataset file or directory")
     parser.add_argument("--output", required=True, help="vocab JSON output path")
     parser.add_argument("--vocab-size", type=int, default=32000)
-    parser.add_argument("--tokenize-to", help="also tokenize the input to this JSONL path")
+    parser.add_argument(
+        "--model",
+        choices=["word", "bpe"],
+        default="word",
+        help="word-level vocab (no deps) or byte-level BPE (needs `tokenizers`)",
+    )
+    parser.add_argument(
+        "--tokenize-to", help="also tokenize the input to this path (.jsonl, or packed .bin)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="word-counting and encoder processes"
+    )
     args = parser.parse_args(argv)
 
-    summary = train_tokenizer(args.input, args.vocab_size, args.output)
+    summary = train_tokenizer(
+        args.input, args.vocab_size, args.output, args.model, args.workers
+    )
     print(json.dumps(summary, indent=2))
     if args.tokenize_to:
-        tokenize_dataset(args.input, args.tokenize_to, args.output)
+        tokenize_dataset(args.input, args.tokenize_to, args.output, args.workers)
         print(f"tokenized -> {args.tokenize_to}")
     return 0
 
@@ -7,441 +7,621 @@ Tests work by:
 1. Building the kernel
 2. Booting it in QEMU with serial output capture
 3. Parsing serial output for [TEST], [BOOT], and diagnostic markers
+
+When the optional ``hyperscan`` package is installed, the patterns of a test
+set (one architecture's tests) are compiled once into a multi-pattern database
+and the serial log is scanned in a single pass. Otherwise pure-literal patterns
+(most ``[TEST] <name>: PASS`` markers) are found by one Aho-Corasick pass
+(``pyahocorasick``, or substring search without it) and only the rest go
+through one combined regex per line. Regexes are compiled with RE2 when
+``google-re2`` is installed (see :func:`compile_regex`).
 """
 
+import functools
 import re
-from dataclasses import dataclass
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import IntFlag
+from types import MappingProxyType
+from typing import NamedTuple
+
+try:  # optional: single-pass multi-pattern scanning
+    import hyperscan
+except ImportError:  # pragma: no cover - depends on the environment
+    hyperscan = None
+
+try:  # optional: single-pass literal matching
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on the environment
+    ahocorasick = None
+
+try:  # optional: linear-time (non-backtracking) regex engine
+    import re2
+except ImportError:  # pragma: no cover - depends on the environment
+    re2 = None
+    _RE2_OPTIONS = None
+else:
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False  # unsupported patterns fall back quietly
+
+
+class Subsystem(IntFlag):
+    """Kernel subsystems as bits, so dependency checks are a single AND."""
+
+    BOOT = 1
+    MM = 2
+    SCHED = 4
+    IPC = 8
+    DEV = 16
+    SLM = 32
+    DRIVERS = 64
+    FS = 128
+    NET = 256
+    INTEGRATION = 512
+
+    @classmethod
+    def from_name(cls, name: str) -> "Subsystem":
+        """``"mm"`` -> ``Subsystem.MM``."""
+        return cls[name.upper()]
+
+
+def is_line_anchored(pattern: str) -> bool:
+    """Tagged markers (``[BOOT] ...``, ``[MM] ...``) are printed at column 0.
+
+    Untagged patterns such as the boot banner may follow firmware output on
+    the same line, so they stay unanchored.
+    """
+    return pattern.startswith("\\[")
+
+
+def anchored_source(pattern: str) -> str:
+    """``pattern`` anchored to a line start if it is a tagged marker."""
+    return f"^{pattern}" if is_line_anchored(pattern) else pattern
+
 
+# Shared fragments of the in-kernel self-test markers "[TEST] <name>: PASS".
+_TEST_PREFIX = sys.intern(r"\[TEST\] ")
+_TEST_PASS = sys.intern(r": PASS")
 
-@dataclass
+
+@functools.cache
+def pass_marker(name: str) -> str:
+    """Pattern for the ``[TEST] <name>: PASS`` marker (``name`` may be a regex)."""
+    return sys.intern(f"{_TEST_PREFIX}{name}{_TEST_PASS}")
+
+
+_REGEX_META = set(".^$*+?{}[]()|")
+
+
+def longest_literal(pattern: str) -> str:
+    """Longest run of text every match of ``pattern`` must contain, or ``""``.
+
+    Used as a substring prefilter before running the regex. Patterns with
+    groups or alternation get no anchor; a character made optional by a
+    following ``*``/``?``/``{`` is dropped from its run.
+    """
+    if "(" in pattern or "|" in pattern:
+        return ""
+    runs: list[str] = []
+    run: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            run.append(pattern[i + 1])
+            i += 2
+            continue
+        if ch not in _REGEX_META and ch != "\\":
+            run.append(ch)
+            i += 1
+            continue
+        if ch in "*?{" and run:
+            run.pop()
+        runs.append("".join(run))
+        run = []
+        if ch == "[":  # skip a character class
+            close = pattern.find("]", i + 2)
+            i = len(pattern) if close < 0 else close
+        elif ch == "\\":  # class escape such as \d: skip its letter too
+            i += 1
+        i += 1
+    runs.append("".join(run))
+    return max(runs, key=len)
+
+
+def compile_regex(source: str, multiline: bool = False) -> re.Pattern[str]:
+    """Compile with RE2 when installed, else ``re``.
+
+    RE2 scans in time linear in the input, so garbage on the serial line
+    cannot make a ``\\d+``-heavy pattern backtrack. Its pattern objects offer
+    the same ``search``/``match``/``lastgroup`` API. Anything RE2 cannot
+    express (backreferences, lookaround) is compiled by ``re`` instead.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(f"(?m){source}" if multiline else source, _RE2_OPTIONS)
+        except re2.error:
+            pass
+    return re.compile(source, re.MULTILINE if multiline else 0)
+
+
+@functools.cache
+def compile_pattern(source: str) -> re.Pattern[str]:
+    """Compile a serial pattern once; tests sharing a source share the object."""
+    return compile_regex(anchored_source(source), multiline=True)
+
+
+@dataclass(frozen=True, slots=True)
 class AcceptanceTest:
-    """Definition of an acceptance test."""
+    """Definition of an acceptance test.
+
+    Instances are immutable (and hashable); list arguments are stored as
+    tuples. Dependencies are a :class:`Subsystem` mask.
+    ``expected_serial_patterns`` are compiled once into ``compiled`` (tagged
+    markers anchored to line starts, see :func:`anchored_source`); matchers
+    use the compiled forms rather than re-resolving the sources per scan.
+    ``anchors`` holds each pattern's longest required literal, checked with a
+    plain substring test before the regex runs.
+    """
 
     name: str
     subsystem: str
     description: str
-    expected_serial_patterns: list[str]
+    expected_serial_patterns: tuple[str, ...]
     timeout_secs: int = 30
-    requires_subsystems: list[str] | None = None
+    requires: Subsystem = Subsystem(0)
+    compiled: tuple[re.Pattern[str], ...] = field(
+        init=False, repr=False, compare=False, default=()
+    )
+    anchors: tuple[str, ...] = field(init=False, repr=False, compare=False, default=())
+
+    def __post_init__(self) -> None:
+        # Literal names are interned by the compiler already; this covers tests
+        # built at runtime, so subsystem/name dict lookups compare by identity.
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "subsystem", sys.intern(self.subsystem))
+        patterns = tuple(self.expected_serial_patterns)
+        object.__setattr__(self, "expected_serial_patterns", patterns)
+        object.__setattr__(self, "compiled", tuple(compile_pattern(p) for p in patterns))
+        object.__setattr__(self, "anchors", tuple(longest_literal(p) for p in patterns))
+
+    @property
+    def requires_subsystems(self) -> tuple[str, ...]:
+        """Names of the required subsystems, in bit order.
+
+        Tests with the same mask share one tuple.
+        """
+        return subsystem_names(self.requires)
+
+
+@functools.cache
+def subsystem_names(mask: Subsystem) -> tuple[str, ...]:
+    """``Subsystem.BOOT | Subsystem.MM`` -> ``("boot", "mm")`` (one tuple per mask)."""
+    return tuple(sys.intern(s.name.lower()) for s in mask)
+
+
+def requirements_met(test: AcceptanceTest, ready: int) -> bool:
+    """True if every subsystem ``test`` requires is set in the ``ready`` mask."""
+    return ready & test.requires == test.requires
+
+
+# Named requirement masks for the test tables below.
+_REQ_BOOT = Subsystem.BOOT
+_REQ_BOOT_MM = _REQ_BOOT | Subsystem.MM
+_REQ_BOOT_MM_SCHED = _REQ_BOOT_MM | Subsystem.SCHED
+_REQ_BOOT_MM_DEV = _REQ_BOOT_MM | Subsystem.DEV
+_REQ_BOOT_MM_DRIVERS = _REQ_BOOT_MM | Subsystem.DRIVERS
+_REQ_BOOT_MM_DEV_DRIVERS = _REQ_BOOT_MM_DEV | Subsystem.DRIVERS
 
 
 # Boot subsystem tests — portable (all architectures)
-BOOT_TESTS_COMMON = [
+BOOT_TESTS_COMMON = (
     AcceptanceTest(
         name="boot_kernel_main",
         subsystem="boot",
         description="kernel_main() is called and prints banner",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"AUTON Kernel booting",
-        ],
+        ),
     ),
     AcceptanceTest(
         name="boot_interrupts",
         subsystem="boot",
         description="Interrupt/exception table is set up",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Interrupts initialized",
-        ],
+        ),
     ),
     AcceptanceTest(
         name="boot_hw_handoff",
         subsystem="boot",
         description="Hardware summary collected and passed to kernel_main",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Hardware summary: \d+ MB RAM",
-        ],
+        ),
     ),
-]
+)
 
 # Boot tests — architecture-specific
-BOOT_TESTS_X86_64 = [
+BOOT_TESTS_X86_64 = (
     AcceptanceTest(
         name="boot_multiboot2",
         subsystem="boot",
         description="Kernel loads via Multiboot2 and validates magic number",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Multiboot2 magic valid",
-        ],
+        ),
     ),
     AcceptanceTest(
         name="boot_long_mode",
         subsystem="boot",
         description="CPU transitions to 64-bit long mode",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Long mode enabled",
             r"\[BOOT\] 64-bit GDT loaded",
-        ],
+        ),
     ),
-]
+)
 
-BOOT_TESTS_AARCH64 = [
-    AcceptanceTest(
-        name="boot_dtb_valid",
-        subsystem="boot",
-        description="Device Tree Blob parsed successfully",
-        expected_serial_patterns=[
-            r"\[BOOT\] DTB parsed",
-        ],
+# Shared by every Device Tree architecture (one instance, not a copy per arch)
+_BOOT_DTB_VALID = AcceptanceTest(
+    name="boot_dtb_valid",
+    subsystem="boot",
+    description="Device Tree Blob parsed successfully",
+    expected_serial_patterns=(
+        r"\[BOOT\] DTB parsed",
     ),
+)
+
+BOOT_TESTS_AARCH64 = (
+    _BOOT_DTB_VALID,
     AcceptanceTest(
         name="boot_el1_entry",
         subsystem="boot",
         description="CPU entered EL1 from EL2",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Running at EL1",
-        ],
+        ),
     ),
-]
+)
 
-BOOT_TESTS_RISCV64 = [
-    AcceptanceTest(
-        name="boot_dtb_valid",
-        subsystem="boot",
-        description="Device Tree Blob parsed successfully",
-        expected_serial_patterns=[
-            r"\[BOOT\] DTB parsed",
-        ],
-    ),
+BOOT_TESTS_RISCV64 = (
+    _BOOT_DTB_VALID,
     AcceptanceTest(
         name="boot_smode_entry",
         subsystem="boot",
         description="CPU entered S-mode via OpenSBI",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[BOOT\] Running in S-mode",
-        ],
+        ),
     ),
-]
+)
 
 # Combined boot tests (backward compat)
 BOOT_TESTS = BOOT_TESTS_COMMON + BOOT_TESTS_X86_64
 
 # Memory management tests
-MM_TESTS = [
+MM_TESTS = (
     AcceptanceTest(
         name="mm_pmm_init",
         subsystem="mm",
         description="PMM initializes from boot memory map",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[MM\] PMM initialized: \d+ pages free",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
     AcceptanceTest(
         name="mm_pmm_alloc_free",
         subsystem="mm",
         description="Page allocation and free round-trip",
-        expected_serial_patterns=[
-            r"\[TEST\] pmm_alloc_free: PASS",
-        ],
-        requires_subsystems=["boot"],
+        expected_serial_patterns=(
+            pass_marker("pmm_alloc_free"),
+        ),
+        requires=_REQ_BOOT,
     ),
     AcceptanceTest(
         name="mm_vmm_map",
         subsystem="mm",
         description="Virtual memory mapping works",
-        expected_serial_patterns=[
-            r"\[TEST\] vmm_map_page: PASS",
-        ],
-        requires_subsystems=["boot"],
+        expected_serial_patterns=(
+            pass_marker("vmm_map_page"),
+        ),
+        requires=_REQ_BOOT,
     ),
     AcceptanceTest(
         name="mm_slab_alloc",
         subsystem="mm",
         description="Slab allocator handles various sizes",
-        expected_serial_patterns=[
-            r"\[TEST\] slab_alloc_\d+: PASS",
-        ],
-        requires_subsystems=["boot"],
+        expected_serial_patterns=(
+            pass_marker(r"slab_alloc_\d+"),
+        ),
+        requires=_REQ_BOOT,
     ),
     AcceptanceTest(
         name="mm_slm_pool",
         subsystem="mm",
         description="SLM memory pool allocated and accessible",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[MM\] SLM pool: \d+ KB allocated",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
-]
+)
 
 # Scheduler tests
-SCHED_TESTS = [
+SCHED_TESTS = (
     AcceptanceTest(
         name="sched_create_process",
         subsystem="sched",
         description="Process creation and listing",
-        expected_serial_patterns=[
-            r"\[TEST\] sched_create: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("sched_create"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="sched_context_switch",
         subsystem="sched",
         description="Context switch between two processes",
-        expected_serial_patterns=[
-            r"\[TEST\] context_switch: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("context_switch"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="sched_priority",
         subsystem="sched",
         description="SLM priority class runs before USER tasks",
-        expected_serial_patterns=[
-            r"\[TEST\] sched_priority: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("sched_priority"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
-]
+)
 
 # IPC tests
-IPC_TESTS = [
+IPC_TESTS = (
     AcceptanceTest(
         name="ipc_send_receive",
         subsystem="ipc",
         description="Structured message send and receive",
-        expected_serial_patterns=[
-            r"\[TEST\] ipc_send_receive: PASS",
-        ],
-        requires_subsystems=["boot", "mm", "sched"],
+        expected_serial_patterns=(
+            pass_marker("ipc_send_receive"),
+        ),
+        requires=_REQ_BOOT_MM_SCHED,
     ),
     AcceptanceTest(
         name="ipc_slm_channel",
         subsystem="ipc",
         description="SLM command channel request/response works",
-        expected_serial_patterns=[
-            r"\[TEST\] ipc_slm_channel: PASS",
-        ],
-        requires_subsystems=["boot", "mm", "sched"],
+        expected_serial_patterns=(
+            pass_marker("ipc_slm_channel"),
+        ),
+        requires=_REQ_BOOT_MM_SCHED,
     ),
-]
+)
 
 # Device framework tests
-DEV_TESTS = [
+DEV_TESTS = (
     AcceptanceTest(
         name="dev_pci_scan",
         subsystem="dev",
         description="PCI bus enumeration finds at least one device",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[DEV\] PCI scan: \d+ devices found",
-        ],
-        requires_subsystems=["boot", "mm"],
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="dev_driver_register",
         subsystem="dev",
         description="Driver registration and probe callback works",
-        expected_serial_patterns=[
-            r"\[TEST\] dev_driver_register: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("dev_driver_register"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
-]
+)
 
 # SLM runtime tests
-SLM_TESTS = [
+SLM_TESTS = (
     AcceptanceTest(
         name="slm_rule_engine_init",
         subsystem="slm",
         description="Rule-based SLM backend initializes",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[SLM\] Rule engine initialized",
-        ],
-        requires_subsystems=["boot", "mm"],
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="slm_intent_classify",
         subsystem="slm",
         description="SLM classifies a hardware identification intent",
-        expected_serial_patterns=[
-            r"\[TEST\] slm_intent_classify: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("slm_intent_classify"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="slm_driver_select",
         subsystem="slm",
         description="SLM selects correct driver for a known PCI device",
-        expected_serial_patterns=[
-            r"\[TEST\] slm_driver_select: PASS",
-        ],
-        requires_subsystems=["boot", "mm", "dev"],
+        expected_serial_patterns=(
+            pass_marker("slm_driver_select"),
+        ),
+        requires=_REQ_BOOT_MM_DEV,
     ),
-]
+)
 
 # Driver tests — portable
-DRIVER_TESTS_COMMON = [
+DRIVER_TESTS_COMMON = (
     AcceptanceTest(
         name="driver_serial_output",
         subsystem="drivers",
         description="Serial console outputs text (this test is self-proving)",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[DRV\] Serial .+ initialized",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
     AcceptanceTest(
         name="driver_timer_tick",
         subsystem="drivers",
         description="System timer generates interrupts",
-        expected_serial_patterns=[
-            r"\[TEST\] timer_tick: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("timer_tick"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
-]
+)
 
 # Driver tests — architecture-specific
-DRIVER_TESTS_X86_64 = [
+DRIVER_TESTS_X86_64 = (
     AcceptanceTest(
         name="driver_vga_text",
         subsystem="drivers",
         description="VGA text mode driver displays output",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[DRV\] VGA text initialized",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
-]
+)
 
-DRIVER_TESTS_AARCH64 = [
+DRIVER_TESTS_AARCH64 = (
     AcceptanceTest(
         name="driver_pl011",
         subsystem="drivers",
         description="PL011 UART driver initialized",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[DRV\] PL011 initialized",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
-]
+)
 
-DRIVER_TESTS_RISCV64 = [
+DRIVER_TESTS_RISCV64 = (
     AcceptanceTest(
         name="driver_ns16550",
         subsystem="drivers",
         description="ns16550 UART driver initialized",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[DRV\] ns16550 initialized",
-        ],
-        requires_subsystems=["boot"],
+        ),
+        requires=_REQ_BOOT,
     ),
-]
+)
 
 # Combined (backward compat)
 DRIVER_TESTS = DRIVER_TESTS_COMMON + DRIVER_TESTS_X86_64
 
 # Filesystem tests
-FS_TESTS = [
+FS_TESTS = (
     AcceptanceTest(
         name="fs_vfs_mount",
         subsystem="fs",
         description="VFS mounts initramfs at /",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[FS\] Mounted initramfs at /",
-        ],
-        requires_subsystems=["boot", "mm"],
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="fs_read_write",
         subsystem="fs",
         description="Create, write, read, unlink a file in initramfs",
-        expected_serial_patterns=[
-            r"\[TEST\] fs_read_write: PASS",
-        ],
-        requires_subsystems=["boot", "mm"],
+        expected_serial_patterns=(
+            pass_marker("fs_read_write"),
+        ),
+        requires=_REQ_BOOT_MM,
     ),
     AcceptanceTest(
         name="fs_devfs",
         subsystem="fs",
         description="devfs populates /dev with device nodes",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[FS\] devfs mounted at /dev",
-        ],
-        requires_subsystems=["boot", "mm", "dev"],
+        ),
+        requires=_REQ_BOOT_MM_DEV,
     ),
-]
+)
 
 # Network tests
-NET_TESTS = [
+NET_TESTS = (
     AcceptanceTest(
         name="net_stack_init",
         subsystem="net",
         description="Network stack initializes",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[NET\] Stack initialized",
-        ],
-        requires_subsystems=["boot", "mm", "drivers"],
+        ),
+        requires=_REQ_BOOT_MM_DRIVERS,
     ),
     AcceptanceTest(
         name="net_dhcp",
         subsystem="net",
         description="DHCP client obtains an IP address",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[NET\] DHCP: obtained \d+\.\d+\.\d+\.\d+",
-        ],
+        ),
         timeout_secs=30,
-        requires_subsystems=["boot", "mm", "drivers", "dev"],
+        requires=_REQ_BOOT_MM_DEV_DRIVERS,
     ),
-]
+)
 
 # Integration tests
-INTEGRATION_TESTS = [
+INTEGRATION_TESTS = (
     AcceptanceTest(
         name="full_boot_to_slm",
         subsystem="integration",
         description="Full system: boot → init subsystems → SLM ready",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"AUTON Kernel booting",
             r"\[MM\] PMM initialized",
             r"\[SCHED\] Scheduler initialized",
             r"\[SLM\] .+ engine initialized",
             r"\[SLM\] Ready",
-        ],
+        ),
         timeout_secs=60,
-        requires_subsystems=["boot", "mm", "sched", "ipc", "dev", "slm", "drivers"],
+        requires=(
+            Subsystem.BOOT | Subsystem.MM | Subsystem.SCHED | Subsystem.IPC | Subsystem.DEV
+            | Subsystem.SLM | Subsystem.DRIVERS
+        ),
     ),
     AcceptanceTest(
         name="slm_hw_discovery",
         subsystem="integration",
         description="SLM discovers hardware and loads at least one driver",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[SLM\] Hardware scan complete: \d+ devices",
             r"\[SLM\] Loaded driver:",
-        ],
+        ),
         timeout_secs=60,
-        requires_subsystems=["boot", "mm", "sched", "dev", "slm", "drivers"],
+        requires=(
+            Subsystem.BOOT | Subsystem.MM | Subsystem.SCHED | Subsystem.DEV | Subsystem.SLM
+            | Subsystem.DRIVERS
+        ),
     ),
     AcceptanceTest(
         name="slm_full_setup",
         subsystem="integration",
         description="SLM performs full setup: hw detect → drivers → filesystem → ready",
-        expected_serial_patterns=[
+        expected_serial_patterns=(
             r"\[SLM\] Hardware scan complete",
             r"\[SLM\] Loaded driver:",
             r"\[FS\] Mounted",
             r"\[SLM\] System ready",
-        ],
+        ),
         timeout_secs=120,
-        requires_subsystems=["boot", "mm", "sched", "ipc", "dev", "slm", "drivers", "fs"],
+        requires=(
+            Subsystem.BOOT | Subsystem.MM | Subsystem.SCHED | Subsystem.IPC | Subsystem.DEV
+            | Subsystem.SLM | Subsystem.DRIVERS | Subsystem.FS
+        ),
     ),
-]
-
-# All tests grouped (default x86_64)
-ALL_TESTS = {
-    "boot": BOOT_TESTS,
-    "mm": MM_TESTS,
-    "sched": SCHED_TESTS,
-    "ipc": IPC_TESTS,
-    "dev": DEV_TESTS,
-    "slm": SLM_TESTS,
-    "drivers": DRIVER_TESTS,
-    "fs": FS_TESTS,
-    "net": NET_TESTS,
-    "integration": INTEGRATION_TESTS,
-}
-
+)
 
 # --- Architecture-aware test accessors ---
 
@@ -458,35 +638,282 @@ _ARCH_DRIVER_TESTS = {
 }
 
 
-def get_boot_tests(arch: str) -> list[AcceptanceTest]:
-    """Get boot tests for a specific architecture."""
-    arch_tests = _ARCH_BOOT_TESTS.get(arch, [])
-    return BOOT_TESTS_COMMON + arch_tests
-
-
-def get_driver_tests(arch: str) -> list[AcceptanceTest]:
-    """Get driver tests for a specific architecture."""
-    arch_tests = _ARCH_DRIVER_TESTS.get(arch, [])
-    return DRIVER_TESTS_COMMON + arch_tests
-
-
-def get_all_tests(arch: str) -> dict[str, list[AcceptanceTest]]:
-    """Get all tests for a specific architecture.
-
-    Returns a dict keyed by subsystem name with per-arch test lists.
-    """
-    return {
-        "boot": get_boot_tests(arch),
+def _build_all_tests(arch: str) -> Mapping[str, tuple[AcceptanceTest, ...]]:
+    """Read-only subsystem -> tests mapping for ``arch``."""
+    return MappingProxyType({
+        "boot": BOOT_TESTS_COMMON + _ARCH_BOOT_TESTS.get(arch, ()),
         "mm": MM_TESTS,
         "sched": SCHED_TESTS,
         "ipc": IPC_TESTS,
         "dev": DEV_TESTS,
         "slm": SLM_TESTS,
-        "drivers": get_driver_tests(arch),
+        "drivers": DRIVER_TESTS_COMMON + _ARCH_DRIVER_TESTS.get(arch, ()),
         "fs": FS_TESTS,
         "net": NET_TESTS,
         "integration": INTEGRATION_TESTS,
-    }
+    })
+
+
+# Built once at import; the accessors below are plain lookups.
+_ALL_TESTS_BY_ARCH = {arch: _build_all_tests(arch) for arch in _ARCH_BOOT_TESTS}
+# Unknown architectures get the portable tests only.
+_PORTABLE_TESTS = _build_all_tests("")
+
+
+def get_all_tests(arch: str) -> Mapping[str, tuple[AcceptanceTest, ...]]:
+    """Get all tests for a specific architecture.
+
+    Returns a read-only mapping keyed by subsystem name with per-arch test
+    tuples. The same mapping is returned on every call; being immutable,
+    callers may cache anything derived from it.
+    """
+    return _ALL_TESTS_BY_ARCH.get(arch, _PORTABLE_TESTS)
+
+
+def get_boot_tests(arch: str) -> tuple[AcceptanceTest, ...]:
+    """Get boot tests for a specific architecture."""
+    return get_all_tests(arch)["boot"]
+
+
+def get_driver_tests(arch: str) -> tuple[AcceptanceTest, ...]:
+    """Get driver tests for a specific architecture."""
+    return get_all_tests(arch)["drivers"]
+
+
+# All tests grouped (default x86_64)
+ALL_TESTS = get_all_tests("x86_64")
+
+
+# --- Serial matching ---
+
+def _distinct(tests: Iterable[AcceptanceTest]) -> tuple[AcceptanceTest, ...]:
+    """``tests`` without repeats, in order.
+
+    Shared tests (e.g. ``_BOOT_DTB_VALID``) are one instance, so identity is
+    enough and skips hashing every field of the dataclass.
+    """
+    return tuple({id(t): t for t in tests}.values())
+
+
+@functools.cache
+def _every_test() -> tuple[AcceptanceTest, ...]:
+    """Each distinct test across all architectures, once."""
+    return _distinct(
+        t for groups in _ALL_TESTS_BY_ARCH.values() for ts in groups.values() for t in ts
+    )
+
+
+# Every ``(test, pattern index, compiled pattern)`` across all architectures,
+# flattened once so scans are a single loop instead of subsystem/test/pattern.
+FLAT_PATTERNS: tuple[tuple[AcceptanceTest, int, re.Pattern[str]], ...] = tuple(
+    (t, i, compiled) for t in _every_test() for i, compiled in enumerate(t.compiled)
+)
+
+
+def _unique_patterns() -> dict[str, re.Pattern[str]]:
+    """Every distinct pattern source across all tests, with its compiled form."""
+    return {t.expected_serial_patterns[i]: compiled for t, i, compiled in FLAT_PATTERNS}
+
+
+def literal_text(pattern: str) -> str | None:
+    """The text ``pattern`` matches if it is a pure literal, else ``None``."""
+    out = []
+    chars = iter(pattern)
+    for ch in chars:
+        if ch == "\\":
+            nxt = next(chars, "")
+            if not nxt or nxt.isalnum():  # \d, \s, \b, ... are not literals
+                return None
+            out.append(nxt)
+        elif ch in _REGEX_META:
+            return None
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+_PATTERNS = _unique_patterns()
+
+
+def _literal_needles() -> dict[str, str]:
+    """Pure-literal sources mapped to the needle to find in ``"\\n" + serial``.
+
+    Line-anchored markers get a leading newline so they only hit at a line
+    start, mirroring ``^`` under ``re.MULTILINE``.
+    """
+    needles = {}
+    for source in _PATTERNS:
+        text = literal_text(source)
+        if text:
+            needles[source] = f"\n{text}" if is_line_anchored(source) else text
+    return needles
+
+
+_LITERALS = _literal_needles()
+
+
+@functools.cache
+def _literal_automaton():
+    """Aho-Corasick automaton over the literal needles, built once."""
+    automaton = ahocorasick.Automaton()
+    by_needle: dict[str, list[str]] = {}
+    for source, needle in _LITERALS.items():
+        by_needle.setdefault(needle, []).append(source)
+    for needle, sources in by_needle.items():
+        automaton.add_word(needle, tuple(sources))
+    automaton.make_automaton()
+    return automaton
+
+
+def _literal_matches(serial: str) -> set[str]:
+    text = f"\n{serial}"
+    if ahocorasick is None:
+        return {source for source, needle in _LITERALS.items() if needle in text}
+    return {source for _, sources in _literal_automaton().iter(text) for source in sources}
+
+
+@functools.cache
+def build_hyperscan_db(tests: tuple[AcceptanceTest, ...], stream: bool = False):
+    """Multi-pattern database for ``tests``: ``(database, sources by id)``.
+
+    Built once per test set (e.g. one architecture's tests) and reused for
+    every serial log scanned against it. ``stream`` builds a streaming-mode
+    database, which carries match state across successive chunks.
+    """
+    sources = tuple(dict.fromkeys(p for t in tests for p in t.expected_serial_patterns))
+    mode = hyperscan.HS_MODE_STREAM if stream else hyperscan.HS_MODE_BLOCK
+    db = hyperscan.Database(mode=mode)
+    # SINGLEMATCH: one callback per pattern is all the pass/fail check needs.
+    # No DOTALL, so ``.`` stays within a line as it does under ``re``;
+    # MULTILINE makes the ``^`` of anchored markers match at line starts.
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_MULTILINE
+    db.compile(
+        expressions=[anchored_source(p).encode() for p in sources],
+        ids=list(range(len(sources))),
+        elements=len(sources),
+        flags=[flags] * len(sources),
+    )
+    return db, sources
+
+
+@functools.cache
+def arch_tests(arch: str) -> tuple[AcceptanceTest, ...]:
+    """Every test run for ``arch``, once, in subsystem order."""
+    return _distinct(t for ts in get_all_tests(arch).values() for t in ts)
+
+
+class CombinedMatcher(NamedTuple):
+    """One alternation over many patterns; named group ``p<i>`` is ``sources[i]``."""
+
+    pattern: re.Pattern[str]
+    sources: tuple[str, ...]
+
+
+@functools.cache
+def build_combined_matcher(
+    tests: tuple[AcceptanceTest, ...], regex_only: bool = False
+) -> CombinedMatcher:
+    """Compile the tests' distinct patterns into a single named-group regex.
+
+    Alternatives are sorted by source so patterns sharing a prefix sit
+    together in the compiled program. With ``regex_only``, pure literals
+    (handled by the literal matcher) are left out. Cached per ``tests`` tuple.
+    """
+    sources = dict.fromkeys(
+        p
+        for t in tests
+        for p in t.expected_serial_patterns
+        if not (regex_only and literal_text(p))
+    )
+    ordered = tuple(sorted(sources))
+    alternation = "|".join(f"(?P<p{i}>{anchored_source(p)})" for i, p in enumerate(ordered))
+    return CombinedMatcher(compile_regex(alternation), ordered)
+
+
+@functools.cache
+def make_scanner(
+    tests: tuple[AcceptanceTest, ...], regex_only: bool = False
+) -> Callable[[str], frozenset[str]]:
+    """A line scanner for ``tests``' patterns, cached per ``tests`` tuple.
+
+    Each line is first checked against the combined regex; only lines it
+    hits are tested against every pattern, since one line can satisfy
+    several (``[SLM] Hardware scan complete`` and its ``: \\d+ devices``
+    variant). A pattern's anchor literal is checked before its regex.
+    """
+    pattern, sources = build_combined_matcher(tests, regex_only)
+    combined = pattern.search
+    checks = tuple(
+        (source, longest_literal(source), compile_pattern(source).search) for source in sources
+    )
+
+    def scan(serial: str) -> frozenset[str]:
+        found = set()
+        for line in serial.splitlines():
+            if combined(line) is None:
+                continue
+            found.update(
+                source for source, anchor, search in checks if anchor in line and search(line)
+            )
+        return frozenset(found)
+
+    return scan
+
+
+def matched_patterns(
+    serial: str, tests: tuple[AcceptanceTest, ...] | None = None
+) -> set[str]:
+    """Sources of the acceptance patterns present in ``serial``.
+
+    ``tests`` narrows the scan to one test set (default: every known test);
+    patterns outside it may be missing from the result.
+    """
+    if tests is None:
+        tests = _every_test()
+    if hyperscan is not None:
+        db, sources = build_hyperscan_db(tests)
+        seen: set[str] = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            seen.add(sources[pattern_id])
+
+        db.scan(serial.encode("utf-8", errors="replace"), match_event_handler=on_match)
+        return seen
+
+    seen = _literal_matches(serial)
+    seen |= make_scanner(tests, regex_only=True)(serial)
+    return seen
+
+
+def scan_serial_file(
+    path, tests: tuple[AcceptanceTest, ...] | None = None, chunk_size: int = 1 << 20
+) -> set[str]:
+    """Like :func:`matched_patterns`, for a serial log on disk of any size.
+
+    With ``hyperscan`` the file is fed in ``chunk_size`` blocks through a
+    streaming database (matches may straddle blocks), so it is never decoded
+    or held in memory whole. Otherwise only the lines that can hold a marker
+    (:data:`SERIAL_LINE_NEEDLES`) are kept and matched.
+    """
+    if tests is None:
+        tests = _every_test()
+    with open(path, "rb") as f:
+        if hyperscan is None:
+            kept = b"".join(
+                line for line in f if any(n in line for n in SERIAL_LINE_NEEDLES)
+            )
+            return matched_patterns(kept.decode("utf-8", errors="replace"), tests)
+
+        db, sources = build_hyperscan_db(tests, stream=True)
+        seen: set[str] = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            seen.add(sources[pattern_id])
+
+        with db.stream(match_event_handler=on_match) as stream:
+            while chunk := f.read(chunk_size):
+                stream.scan(chunk)
+    return seen
 
 
 # Acceptance tests the committed seed kernel actually delivers (real subsystem
@@ -507,9 +934,23 @@ CORE_GATE_TESTS = (
 )
 
 
-def test_passes(test: "AcceptanceTest", serial: str) -> bool:
-    """True if every expected serial pattern for ``test`` is present."""
-    return all(re.search(p, serial) for p in test.expected_serial_patterns)
+def test_passes(
+    test: "AcceptanceTest", serial: str, matched: set[str] | None = None
+) -> bool:
+    """True if every expected serial pattern for ``test`` is present.
+
+    ``matched`` (from :func:`matched_patterns`) answers from one scan of the
+    serial for all tests; patterns it does not know are searched directly.
+    """
+    if matched is None:
+        return all(
+            anchor in serial and p.search(serial)
+            for anchor, p in zip(test.anchors, test.compiled)
+        )
+    return all(
+        source in matched if source in _PATTERNS else compiled.search(serial)
+        for source, compiled in zip(test.expected_serial_patterns, test.compiled)
+    )
 
 
 def evaluate(serial: str, arch: str = "x86_64") -> dict:
@@ -518,29 +959,126 @@ def evaluate(serial: str, arch: str = "x86_64") -> dict:
     Returns ``{subsystem: {"passed": [names], "failed": [names], "total": n}}``
     plus a top-level ``"ok"`` gating on the core seed subsystems.
     """
+    # Tests of other architectures are never reported, so only scan for
+    # this one's patterns.
+    return evaluate_matched(matched_patterns(serial, arch_tests(arch)), arch)
+
+
+def evaluate_matched(matched: set[str], arch: str = "x86_64") -> dict:
+    """:func:`evaluate` from already-scanned pattern sources (``matched``).
+
+    ``matched`` must cover ``arch_tests(arch)``; tests of other architectures
+    may be marked failing internally but are not reported.
+    """
     groups = get_all_tests(arch)
+    failing = {t for t, i, _ in FLAT_PATTERNS if t.expected_serial_patterns[i] not in matched}
     results: dict = {}
+    named: set[str] = set()
     for subsystem, tests in groups.items():
-        passed = [t.name for t in tests if test_passes(t, serial)]
-        failed = [t.name for t in tests if not test_passes(t, serial)]
+        passed, failed = [], []
+        for t in tests:
+            (failed if t in failing else passed).append(t.name)
+        named.update(passed)
         results[subsystem] = {
             "passed": passed,
             "failed": failed,
             "total": len(tests),
         }
 
-    named = {t.name for ts in groups.values() for t in ts if test_passes(t, serial)}
     results["ok"] = all(name in named for name in CORE_GATE_TESTS)
     return results
 
 
+# The seed prints this after every acceptance marker, right before its REPL.
+SERIAL_DONE_MARKER = b"[BOOT] OK"
+
+
+def _line_needles() -> tuple[bytes, ...]:
+    """Byte strings, one of which every line that can match a pattern contains.
+
+    Tagged markers all contain ``[``; untagged ones contribute their longest
+    literal. A pattern with no literal would need every line (``b""``).
+    """
+    needles = {
+        b"[" if is_line_anchored(p) else longest_literal(p).encode() for p in _PATTERNS
+    }
+    return (b"",) if b"" in needles else tuple(sorted(needles))
+
+
+SERIAL_LINE_NEEDLES = _line_needles()
+
+
+def marker_lines(data: bytes, needles: tuple[bytes, ...] = SERIAL_LINE_NEEDLES) -> str:
+    """Decode just the lines of raw serial ``data`` that contain a needle.
+
+    Patterns never span lines, so dropping the rest cannot change a verdict;
+    the byte-level ``in`` checks skip UTF-8 decoding of boot noise entirely.
+    """
+    return "\n".join(
+        line.decode("utf-8", errors="replace")
+        for line in data.splitlines()
+        if any(needle in line for needle in needles)
+    )
+
+
+def stream_serial(
+    procs: dict,
+    timeout_secs: float,
+    until: bytes | None = SERIAL_DONE_MARKER,
+    lines_only: bool = False,
+) -> dict[str, str]:
+    """Collect the stdout of several running QEMU processes in one event loop.
+
+    ``procs`` maps a key (e.g. the arch) to a ``subprocess.Popen`` with
+    ``stdout=PIPE``. All pipes are multiplexed through one selector (epoll on
+    Linux), so N kernels cost one wait per batch of ready streams rather than
+    a blocking read per process. A stream is finished when its process exits
+    or ``until`` appears in its output; whatever is still running at that
+    point or at the deadline is killed. Returns the decoded serial per key,
+    reduced to the lines that can hold a marker if ``lines_only`` (see
+    :func:`marker_lines`).
+    """
+    import os
+    import selectors
+    import time
+
+    buffers = {key: bytearray() for key in procs}
+    sel = selectors.DefaultSelector()
+    for key, proc in procs.items():
+        os.set_blocking(proc.stdout.fileno(), False)
+        sel.register(proc.stdout, selectors.EVENT_READ, key)
+    deadline = time.monotonic() + timeout_secs
+    try:
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for selkey, _ in sel.select(remaining):
+                buf = buffers[selkey.data]
+                start = max(0, len(buf) - len(until or b""))
+                chunk = os.read(selkey.fd, 65536)
+                buf += chunk
+                # Only the new bytes (plus a marker-sized overlap) are searched.
+                if not chunk or (until and buf.find(until, start) != -1):
+                    sel.unregister(selkey.fileobj)
+                    procs[selkey.data].kill()
+    finally:
+        sel.close()
+        for proc in procs.values():
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+    if lines_only:
+        return {key: marker_lines(buf) for key, buf in buffers.items()}
+    return {key: buf.decode("utf-8", errors="replace") for key, buf in buffers.items()}
+
+
 def _capture_serial(arch: str, timeout_secs: int) -> str:
     """Build the seed ISO and boot it in QEMU, returning captured serial.
 
-    The seed kernel never exits (it boots into the chat REPL), so QEMU is run
-    under the ``timeout`` command — which kills it after ``timeout_secs`` and
-    leaves the serial printed so far on stdout. All acceptance markers print
-    before the REPL, so the capture is complete.
+    The seed kernel never exits (it boots into the chat REPL), so QEMU is
+    stopped as soon as it prints :data:`SERIAL_DONE_MARKER` — all acceptance
+    markers come before it — or after ``timeout_secs`` at the latest.
     """
     import subprocess
     from pathlib import Path
@@ -551,15 +1089,14 @@ def _capture_serial(arch: str, timeout_secs: int) -> str:
         ["make", "CC=gcc", "iso"], cwd=kdir, check=True,
         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
     )
-    proc = subprocess.run(
+    proc = subprocess.Popen(
         [
-            "timeout", str(timeout_secs),
             "qemu-system-x86_64", "-cdrom", str(kdir / "build" / "auton.iso"),
             "-serial", "stdio", "-display", "none", "-no-reboot", "-m", "128M",
         ],
-        capture_output=True, text=True, timeout=timeout_secs + 15,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
     )
-    return proc.stdout
+    return stream_serial({arch: proc}, timeout_secs, lines_only=True)[arch]
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -575,16 +1112,15 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.serial:
-        from pathlib import Path
-        serial = Path(args.serial).read_text(encoding="utf-8", errors="replace")
+        matched = scan_serial_file(args.serial, arch_tests(args.arch))
+        results = evaluate_matched(matched, args.arch)
     else:
         try:
             serial = _capture_serial(args.arch, args.timeout)
         except Exception as exc:  # build/boot failure → report, fail
             print(f"boot failed: {exc}")
             return 1
-
-    results = evaluate(serial, args.arch)
+        results = evaluate(serial, args.arch)
     for subsystem, r in results.items():
         if subsystem == "ok":
             continue
@@ -595,9 +1131,8 @@ def main(argv: list[str] | None = None) -> int:
     if results["ok"]:
         print("ALL PASS (seed-delivered acceptance markers)")
         return 0
-    missing = [n for n in CORE_GATE_TESTS if n not in
-               {t.name for ts in get_all_tests(args.arch).values()
-                for t in ts if test_passes(t, serial)}]
+    named = {n for k, r in results.items() if k != "ok" for n in r["passed"]}
+    missing = [n for n in CORE_GATE_TESTS if n not in named]
     print(f"FAILURES (missing: {', '.join(missing)})")
     return 1
 
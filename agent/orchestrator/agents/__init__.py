@@ -1,15 +1,41 @@
-"""Agent classes for AUTON orchestration."""
-
-from orchestrator.agents.architect_agent import ArchitectAgent
-from orchestrator.agents.base_agent import Agent, AgentRole, AgentState, TaskResult
-from orchestrator.agents.data_scientist_agent import DataScientistAgent
-from orchestrator.agents.developer_agent import DeveloperAgent
-from orchestrator.agents.integrator_agent import IntegratorAgent
-from orchestrator.agents.manager_agent import ManagerAgent
-from orchestrator.agents.model_architect_agent import ModelArchitectAgent
-from orchestrator.agents.reviewer_agent import ReviewerAgent
-from orchestrator.agents.tester_agent import TesterAgent
-from orchestrator.agents.training_agent import TrainingAgent
+"""Agent classes for AUTON orchestration.
+
+Agent classes are imported on first attribute access (PEP 562), so a process
+that drives one agent does not load every agent's prompts and tools.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from orchestrator.agents.architect_agent import ArchitectAgent
+    from orchestrator.agents.base_agent import Agent, AgentRole, AgentState, TaskResult
+    from orchestrator.agents.data_scientist_agent import DataScientistAgent
+    from orchestrator.agents.developer_agent import DeveloperAgent
+    from orchestrator.agents.integrator_agent import IntegratorAgent
+    from orchestrator.agents.manager_agent import ManagerAgent
+    from orchestrator.agents.model_architect_agent import ModelArchitectAgent
+    from orchestrator.agents.reviewer_agent import ReviewerAgent
+    from orchestrator.agents.tester_agent import TesterAgent
+    from orchestrator.agents.training_agent import TrainingAgent
+
+_LAZY = {
+    "Agent": "orchestrator.agents.base_agent",
+    "AgentRole": "orchestrator.agents.base_agent",
+    "AgentState": "orchestrator.agents.base_agent",
+    "TaskResult": "orchestrator.agents.base_agent",
+    "ManagerAgent": "orchestrator.agents.manager_agent",
+    "ArchitectAgent": "orchestrator.agents.architect_agent",
+    "DeveloperAgent": "orchestrator.agents.developer_agent",
+    "ReviewerAgent": "orchestrator.agents.reviewer_agent",
+    "TesterAgent": "orchestrator.agents.tester_agent",
+    "IntegratorAgent": "orchestrator.agents.integrator_agent",
+    "DataScientistAgent": "orchestrator.agents.data_scientist_agent",
+    "ModelArchitectAgent": "orchestrator.agents.model_architect_agent",
+    "TrainingAgent": "orchestrator.agents.training_agent",
+}
 
 __all__ = [
     "Agent",
@@ -26,3 +52,17 @@ __all__ = [
     "ModelArchitectAgent",
     "TrainingAgent",
 ]
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    obj = getattr(importlib.import_module(module), name)
+    globals()[name] = obj  # later lookups skip __getattr__
+    return obj
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
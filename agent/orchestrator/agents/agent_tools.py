@@ -18,7 +18,8 @@ class ToolExecutor:
     def __init__(self, workspace: GitWorkspace, kernel_spec_path: Path):
         self.workspace = workspace
         self.kernel_spec_path = kernel_spec_path
-        self._file_writes: list[str] = []
+        # Insertion-ordered set: O(1) dedupe, write order kept for reporting.
+        self._file_writes: dict[str, None] = {}
 
     @property
     def files_written(self) -> list[str]:
@@ -27,8 +28,7 @@ class ToolExecutor:
 
     def track_write(self, path: str) -> None:
         """Track a file write."""
-        if path not in self._file_writes:
-            self._file_writes.append(path)
+        self._file_writes.setdefault(path, None)
 
     def reset_tracking(self) -> None:
         """Reset file write tracking."""
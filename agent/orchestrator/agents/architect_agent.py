@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any
 
 from orchestrator.agents.base_agent import Agent, AgentRole
@@ -11,6 +14,80 @@ from orchestrator.llm.tools import ARCHITECT_TOOLS
 
 logger = logging.getLogger(__name__)
 
+_DESIGN_DESC_TMPL = """Design the interface for the {subsystem} kernel subsystem.
+
+1. Read the {subsystem} specification (use read_spec tool)
+2. Read the architecture specification for overall context
+3. Design the public API as C header files
+4. Write the header files to the workspace under kernel/include/
+5. Document design decisions as comments in the headers
+6. Ensure compatibility with interfaces from other subsystems
+7. Commit the header files
+
+The headers should be complete enough that a Developer agent can implement
+the subsystem without further guidance."""
+
+_DESIGN_CRITERIA_TMPL: tuple[str, ...] = (
+    "Header file(s) for {subsystem} written to kernel/include/",
+    "All public functions documented with comments",
+    "No circular dependencies with other subsystem headers",
+    "Types and constants clearly defined",
+)
+
+_REVIEW_DESC_TMPL = """Review the integration points between these subsystems: {subsystem_list}
+
+1. Read the header files for each subsystem
+2. Read the implementation code for each subsystem
+3. Identify potential conflicts:
+   - Shared data structures used differently
+   - Locking order violations
+   - Memory allocation patterns that conflict
+   - Interrupt handling conflicts
+   - Global state that could cause race conditions
+4. Check for the "Frankenstein effect" - subsystems that work in isolation
+   but will fail when composed
+
+Output a JSON report with:
+- conflicts: list of identified conflicts
+- risks: potential issues that need testing
+- recommendations: changes needed before merging"""
+
+_REVIEW_CRITERIA: tuple[str, ...] = (
+    "All cross-subsystem interfaces reviewed",
+    "Potential conflicts identified and documented",
+    "Recommendations provided for each conflict",
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_design_task(subsystem: str) -> Mapping[str, Any]:
+    """Design task for ``subsystem``, built once and shared by retries.
+
+    The cached mapping is read-only; callers copy it before handing it on.
+    """
+    return MappingProxyType({
+        "task_id": f"arch-{subsystem}",
+        "title": f"Design {subsystem} subsystem interface",
+        "subsystem": subsystem,
+        "description": _DESIGN_DESC_TMPL.format(subsystem=subsystem),
+        "acceptance_criteria": tuple(
+            c.format(subsystem=subsystem) for c in _DESIGN_CRITERIA_TMPL
+        ),
+    })
+
+
+@functools.lru_cache(maxsize=32)
+def _build_review_task(subsystems: tuple[str, ...]) -> Mapping[str, Any]:
+    """Integration review task for ``subsystems`` (cached, read-only)."""
+    subsystem_list = ", ".join(subsystems)
+    return MappingProxyType({
+        "task_id": "arch-integration-review",
+        "title": f"Review integration of {subsystem_list}",
+        "subsystem": "cross-cutting",
+        "description": _REVIEW_DESC_TMPL.format(subsystem_list=subsystem_list),
+        "acceptance_criteria": _REVIEW_CRITERIA,
+    })
+
 
 def _get_prompt(kwargs):
     arch = kwargs.get('arch_profile')
@@ -43,29 +120,7 @@ class ArchitectAgent(Agent):
         """
         logger.info("[%s] Designing subsystem: %s", self.agent_id, subsystem)
 
-        task = {
-            "task_id": f"arch-{subsystem}",
-            "title": f"Design {subsystem} subsystem interface",
-            "subsystem": subsystem,
-            "description": f"""Design the interface for the {subsystem} kernel subsystem.
-
-1. Read the {subsystem} specification (use read_spec tool)
-2. Read the architecture specification for overall context
-3. Design the public API as C header files
-4. Write the header files to the workspace under kernel/include/
-5. Document design decisions as comments in the headers
-6. Ensure compatibility with interfaces from other subsystems
-7. Commit the header files
-
-The headers should be complete enough that a Developer agent can implement
-the subsystem without further guidance.""",
-            "acceptance_criteria": [
-                f"Header file(s) for {subsystem} written to kernel/include/",
-                "All public functions documented with comments",
-                "No circular dependencies with other subsystem headers",
-                "Types and constants clearly defined",
-            ],
-        }
+        task = dict(_build_design_task(subsystem))
 
         # Create a branch for this design work
         branch = self.workspace.create_branch(self.agent_id, "arch", subsystem)
@@ -76,6 +131,24 @@ the subsystem without further guidance.""",
             "result": result,
         }
 
+    async def design_subsystems(self, subsystems: list[str]) -> dict[str, Any]:
+        """Design several subsystems, one after another.
+
+        Designs run sequentially: each checks out its own branch in the
+        shared working tree, and execute_task keeps per-task state (artifacts,
+        conversation) on the agent. Every branch starts from main. A design
+        that raises is reported as its exception rather than stopping the rest.
+        """
+        results: dict[str, Any] = {}
+        for subsystem in subsystems:
+            try:
+                results[subsystem] = await self.design_subsystem(subsystem)
+            except Exception as e:
+                results[subsystem] = e
+            finally:
+                self.workspace.checkout_main()
+        return results
+
     async def review_integration(self, subsystems: list[str]) -> dict[str, Any]:
         """Review how multiple subsystems integrate and flag conflicts.
 
@@ -83,33 +156,5 @@ the subsystem without further guidance.""",
         """
         logger.info("[%s] Reviewing integration of: %s", self.agent_id, subsystems)
 
-        subsystem_list = ", ".join(subsystems)
-        task = {
-            "task_id": "arch-integration-review",
-            "title": f"Review integration of {subsystem_list}",
-            "subsystem": "cross-cutting",
-            "description": f"""Review the integration points between these subsystems: {subsystem_list}
-
-1. Read the header files for each subsystem
-2. Read the implementation code for each subsystem
-3. Identify potential conflicts:
-   - Shared data structures used differently
-   - Locking order violations
-   - Memory allocation patterns that conflict
-   - Interrupt handling conflicts
-   - Global state that could cause race conditions
-4. Check for the "Frankenstein effect" - subsystems that work in isolation
-   but will fail when composed
-
-Output a JSON report with:
-- conflicts: list of identified conflicts
-- risks: potential issues that need testing
-- recommendations: changes needed before merging""",
-            "acceptance_criteria": [
-                "All cross-subsystem interfaces reviewed",
-                "Potential conflicts identified and documented",
-                "Recommendations provided for each conflict",
-            ],
-        }
-
+        task = dict(_build_review_task(tuple(subsystems)))
         return await self.execute_task(task)
@@ -3,21 +3,217 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
+import os
+import shlex
+import shutil
+import signal
 import subprocess
+import time
+import uuid
+import zlib
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+import yaml
+
+try:  # optional: faster and tighter than zlib for retained transcripts
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
 
 from orchestrator.arch_registry import ArchProfile
 from orchestrator.comms.git_workspace import GitWorkspace
 from orchestrator.comms.message_bus import Message, MessageBus
-from orchestrator.llm.client import LLMClient
+from orchestrator.llm.cache import READ_ONLY_TOOLS, LLMCache, cache_key
+from orchestrator.llm.client import LLMClient, supports_cache_control, with_cached_prefix
 
 logger = logging.getLogger(__name__)
 
+# Spec documents are read-mostly and re-read many times per task; shared by
+# every agent in the process, keyed by path and validated by (mtime_ns, size).
+_SPEC_CACHE: OrderedDict[Path, tuple[int, int, str]] = OrderedDict()
+_SPEC_CACHE_SIZE = 64
+
+# Blocking file reads and YAML parsing run here so they never stall the event
+# loop that every agent's shell, message-bus and LLM coroutines share.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-io")
+
+
+async def _in_io_pool(fn: Any, *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_IO_POOL, fn, *args)
+
+
+# libyaml-backed loader when PyYAML was built with it; same semantics as safe_load.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml(path: str) -> Any:
+    return yaml.load(Path(path).read_bytes(), Loader=_YAML_LOADER)
+
+
+def _copy_file(src: Path, dst: Path) -> int:
+    """Copy ``src`` to ``dst`` in the kernel where possible; returns bytes copied.
+
+    ``copy_file_range`` keeps multi-GB model files out of userspace buffers
+    (and may reflink on CoW filesystems); ``shutil.copyfile`` uses sendfile
+    on Linux and is the fallback where that call is missing or refused.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                copied = 0
+                while n := os.copy_file_range(fin.fileno(), fout.fileno(), 1 << 30):
+                    copied += n
+                return copied
+        except OSError:
+            pass  # e.g. EXDEV/ENOSYS/EOPNOTSUPP on some kernels and filesystems
+    shutil.copyfile(src, dst)
+    return dst.stat().st_size
+
+
+# Finished task transcripts are kept compressed: they are rarely read back,
+# and many agents holding multi-MB tool transcripts dominate a long run's RSS.
+if zstandard is not None:
+    _compress = zstandard.ZstdCompressor(level=3).compress
+    _decompress = zstandard.ZstdDecompressor().decompress
+else:
+    def _compress(data: bytes) -> bytes:
+        return zlib.compress(data, 6)
+
+    _decompress = zlib.decompress
+
+_TASK_PROMPT_FOOTER = (
+    "\nExecute this task using the tools available to you. "
+    "Build and test your code. Commit when everything passes."
+)
+
+# Matches returned by the search_code tool.
+_SEARCH_RESULTS = 50
+
+# Messages an agent may have queued but not yet consumed; beyond this the
+# bus's JSON files still hold them, but they are not pushed to the agent.
+_INBOX_SIZE = 1024
+
+# Lines of stdout/stderr kept per command; agents act on the tail of build
+# output, and a multi-MB make log must not grow the orchestrator's RSS.
+_OUTPUT_TAIL_LINES = 10_000
+
+# Build/test/training commands stream their full output to a log under the
+# workspace and return only this much tail per stream. Logs are git-ignored
+# (workspace.commit stages everything) and only the newest are kept.
+_LOG_TAIL_KB = 8
+_LOG_DIR = Path(".auton") / "logs"
+_LOG_KEEP = 50
+
+# ccache's masquerade directory (symlinks named after compilers), put first on
+# PATH for build_kernel so repeated builds recompile only changed sources.
+# make still resolves CC exactly as it would without it; a compiler with no
+# symlink there simply runs uncached.
+_CCACHE_DIR = next(
+    (
+        d for d in (
+            "/usr/lib/ccache",
+            "/usr/lib64/ccache",
+            "/usr/local/opt/ccache/libexec",
+            "/opt/homebrew/opt/ccache/libexec",
+        )
+        if os.path.isdir(d)
+    ),
+    None,
+) if shutil.which("ccache") else None
+
+# Dataset analysis/tokenization fan out over every core, at best-effort I/O
+# priority (where ionice exists) so agents' builds and reads stay responsive.
+_DATA_WORKERS = os.cpu_count() or 1
+_DATA_TOOL_PREFIX = "ionice -c 2 -n 4 " if shutil.which("ionice") else ""
+
+# A timed-out command's process group gets SIGTERM, then SIGKILL if anything
+# in it is still running this many seconds later (make forwards SIGTERM to
+# its jobs and removes half-written targets; SIGKILL would leave them).
+_KILL_GRACE_SECS = 2.0
+
+# Characters that need a shell to mean what the caller intended (pipes,
+# redirects, globs, substitutions, command lists, env assignments).
+_SHELL_SYNTAX = frozenset("|&;<>()$`*?[]{}~=\n")
+
+
+def _exec_argv(command: str) -> list[str] | None:
+    """Split ``command`` for direct exec, or None if it needs ``/bin/sh``."""
+    if _SHELL_SYNTAX.intersection(command):
+        return None
+    try:
+        return shlex.split(command) or None
+    except ValueError:
+        return None
+
+
+async def _drain(
+    stream: asyncio.StreamReader,
+    tail: deque[str],
+    log: BinaryIO | None = None,
+    log_prefix: bytes = b"",
+) -> int:
+    """Read ``stream`` to EOF into ``tail`` (and ``log``); returns the line count."""
+    lines = 0
+    partial = b""
+    while chunk := await stream.read(1 << 16):
+        *complete, partial = (partial + chunk).split(b"\n")
+        lines += len(complete)
+        tail.extend(line.decode("utf-8", errors="replace") for line in complete)
+        if log is not None and complete:
+            log.write(b"".join(log_prefix + line + b"\n" for line in complete))
+    if partial:
+        lines += 1
+        tail.append(partial.decode("utf-8", errors="replace"))
+        if log is not None:
+            log.write(log_prefix + partial + b"\n")
+    return lines
+
+
+async def _terminate_group(proc: asyncio.subprocess.Process) -> None:
+    """Stop ``proc``'s whole process group: SIGTERM, then SIGKILL after a grace."""
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGTERM)
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(proc.wait(), _KILL_GRACE_SECS)
+    # The leader may have exited while children that ignore SIGTERM linger.
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGKILL)
+    await proc.wait()
+
+
+def _format_tail(tail: deque[str], lines: int, max_chars: int | None = None) -> str:
+    text = "\n".join(tail)
+    kept = len(tail)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[-max_chars:]
+        # Drop the partial first line so the tail starts on a line boundary.
+        text = text[text.find("\n") + 1:] if "\n" in text else text
+        kept = text.count("\n") + 1
+    if lines > kept:
+        return f"[... {lines - kept} earlier lines truncated ...]\n{text}"
+    return text
+
+
+def _new_command_log(workspace_path: Path) -> Path:
+    """Reserve a log file path under the workspace, pruning the oldest logs."""
+    log_dir = workspace_path / _LOG_DIR
+    if not log_dir.is_dir():
+        log_dir.mkdir(parents=True, exist_ok=True)
+        (log_dir / ".gitignore").write_text("*\n", encoding="utf-8")
+    logs = sorted(log_dir.glob("*.log"), key=lambda p: p.stat().st_mtime)
+    for old in logs[: max(0, len(logs) - _LOG_KEEP + 1)]:
+        old.unlink(missing_ok=True)
+    return log_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.log"
+
 
 class AgentRole(str, Enum):
     MANAGER = "manager"
@@ -78,6 +274,8 @@ class Agent:
         kernel_spec_path: Path,
         model_override: str | None = None,
         arch_profile: ArchProfile | None = None,
+        llm_cache: LLMCache | None = None,
+        prompt_caching: bool = True,
     ):
         self.agent_id = agent_id
         self.role = role
@@ -89,8 +287,40 @@ class Agent:
         self.kernel_spec_path = kernel_spec_path
         self.model_override = model_override
         self.arch_profile = arch_profile
+        self.llm_cache = llm_cache
+        # system_prompt and tools are fixed per agent: a stable cacheable prefix.
+        self.prompt_caching = prompt_caching
         self.state = AgentState.IDLE
-        self._conversation: list[dict[str, Any]] = []
+        self._conversation_blob = b""
+        # Paths written by write_file during the current task, once each in
+        # first-write order (a dict used as an ordered set).
+        self._artifacts: dict[str, None] = {}
+        # (tool name, canonical input) -> result for READ_ONLY_TOOLS. Repeats
+        # are served from here while the shared workspace's generation is
+        # unchanged, i.e. until any agent writes, commits, builds or runs a
+        # command there.
+        self._action_cache: dict[tuple[str, str], str] = {}
+        self._action_generation: int | None = None
+        # Tool name -> handler, resolved once instead of matched per call.
+        self._tool_dispatch = self._tool_handlers()
+        self._inbox: asyncio.Queue[Message] = asyncio.Queue(maxsize=_INBOX_SIZE)
+        # Queue what is already waiting on disk (sent before this agent existed,
+        # e.g. across a restart), then take pushes. Nothing can be sent between
+        # the two, so no message is queued twice.
+        for message in sorted(message_bus.receive(agent_id), key=lambda m: m.timestamp):
+            self._deliver(message)
+        message_bus.subscribe(agent_id, self._deliver)
+
+    @property
+    def conversation(self) -> list[dict[str, Any]]:
+        """Messages of the last completed task, decompressed on access."""
+        if not self._conversation_blob:
+            return []
+        return json.loads(_decompress(self._conversation_blob))
+
+    @conversation.setter
+    def conversation(self, messages: list[dict[str, Any]]) -> None:
+        self._conversation_blob = _compress(json.dumps(messages).encode("utf-8"))
 
     async def execute_task(self, task: dict[str, Any]) -> TaskResult:
         """Execute a task using the Claude agentic loop.
@@ -103,25 +333,20 @@ class Agent:
 
         # Build the initial message
         task_prompt = self._format_task_prompt(task)
-        messages = [{"role": "user", "content": task_prompt}]
+        messages = [{"role": "user", "content": self._task_content(task, task_prompt)}]
+        self._artifacts.clear()
+        self._action_cache.clear()
 
         try:
             self.state = AgentState.EXECUTING
-            result_messages = await self.client.send_with_tools(
-                agent_id=self.agent_id,
-                system=self.system_prompt,
-                messages=messages,
-                tools=self.tools,
-                tool_executor=self._execute_tool,
-                model_override=self.model_override,
-            )
+            result_messages = await self._run_tool_loop(messages)
 
-            self._conversation = result_messages
+            self.conversation = result_messages
             self.state = AgentState.DONE
 
             # Extract the final text response
             summary = self._extract_final_text(result_messages)
-            artifacts = self._extract_artifacts(result_messages)
+            artifacts = list(self._artifacts)
 
             return TaskResult(
                 success=True,
@@ -143,9 +368,64 @@ class Agent:
                 error=str(e),
             )
 
+    async def _run_tool_loop(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Run the tool-use loop, or replay it from ``llm_cache`` on a hit."""
+
+        def run() -> Any:
+            return self.client.send_with_tools(
+                agent_id=self.agent_id,
+                system=self.system_prompt,
+                messages=messages,
+                tools=self.tools,
+                tool_executor=self._execute_tool,
+                model_override=self.model_override,
+                prompt_caching=self.prompt_caching,
+            )
+
+        if self.llm_cache is None:
+            return await run()
+
+        try:
+            snapshot = self.workspace.snapshot_id()
+        except Exception as e:  # no usable repo: nothing to key replays on
+            logger.debug("[%s] Response cache bypassed: %s", self.agent_id, e)
+            return await run()
+        model = self.model_override or self.client.model
+        key = cache_key(model, self.system_prompt, messages, self.tools, snapshot)
+        hit = await self.llm_cache.get(key)
+        if hit is not None:
+            logger.info("[%s] cache_hit=True tokens_saved=%d", self.agent_id, hit.tokens)
+            return hit.messages
+
+        usage = self.client.cost_tracker.get_agent_usage(self.agent_id)
+        before = usage.input_tokens + usage.output_tokens
+        result_messages = await run()
+        tokens = usage.input_tokens + usage.output_tokens - before
+        await self.llm_cache.set(key, result_messages, tokens)
+        return result_messages
+
+    def _deliver(self, message: Message) -> None:
+        try:
+            self._inbox.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(
+                "[%s] Inbox full, dropping %s from %s (still on the bus)",
+                self.agent_id, message.msg_id, message.from_agent,
+            )
+
     async def check_messages(self) -> list[Message]:
-        """Check for new messages from other agents."""
-        return self.message_bus.receive(self.agent_id)
+        """Return messages delivered since the last check, without waiting."""
+        messages = []
+        while not self._inbox.empty():
+            messages.append(self._inbox.get_nowait())
+        return messages
+
+    async def wait_for_message(self, timeout: float | None = None) -> Message | None:
+        """Wait for the next message; None if ``timeout`` seconds pass first."""
+        try:
+            return await asyncio.wait_for(self._inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
 
     async def send_message(self, to_agent: str, msg_type: Any, payload: dict) -> None:
         """Send a message to another agent."""
@@ -157,129 +437,154 @@ class Agent:
         )
         self.message_bus.send(msg)
 
+    def _tool_handlers(self) -> dict[str, Callable[[dict], Awaitable[str]]]:
+        """Map tool names to handlers; subclasses extend this to add tools."""
+        return {
+            "read_file": self._tool_read_file,
+            "write_file": self._tool_write_file,
+            "search_code": self._tool_search_code,
+            "list_files": self._tool_list_files,
+            "build_kernel": self._tool_build_kernel,
+            "run_test": self._tool_run_test,
+            "git_commit": self._tool_git_commit,
+            "git_diff": self._tool_git_diff,
+            "read_spec": self._tool_read_spec,
+            "shell": self._tool_shell,
+            # SLM tools
+            "analyze_dataset": self._tool_analyze_dataset,
+            "tokenize_data": self._tool_tokenize_data,
+            "validate_architecture": self._tool_validate_architecture,
+            "estimate_flops": self._tool_estimate_flops,
+            "train_model": self._tool_train_model,
+            "evaluate_model": self._tool_evaluate_model,
+            "quantize_model": self._tool_quantize_model,
+            "export_gguf": self._tool_export_gguf,
+            "export_onnx": self._tool_export_onnx,
+            "integrate_slm": self._tool_integrate_slm,
+        }
+
     async def _execute_tool(self, tool_name: str, tool_input: dict) -> str:
         """Execute a tool call from Claude. Returns the result as a string."""
         logger.debug("[%s] Tool call: %s(%s)", self.agent_id, tool_name, tool_input)
 
+        handler = self._tool_dispatch.get(tool_name)
+        if handler is None:
+            return f"Unknown tool: {tool_name}"
+        read_only = tool_name in READ_ONLY_TOOLS
+        if read_only:
+            generation = self.workspace.generation
+            if generation != self._action_generation:
+                self._action_cache.clear()
+                self._action_generation = generation
+            key = (tool_name, json.dumps(tool_input, sort_keys=True, default=str))
+            if (cached := self._action_cache.get(key)) is not None:
+                return cached
         try:
-            match tool_name:
-                case "read_file":
-                    return self.workspace.read_file(tool_input["path"])
-
-                case "write_file":
-                    self.workspace.write_file(tool_input["path"], tool_input["content"])
-                    return f"Written {len(tool_input['content'])} bytes to {tool_input['path']}"
-
-                case "search_code":
-                    results = self.workspace.search_code(
-                        tool_input["pattern"],
-                        tool_input.get("glob", "*"),
-                    )
-                    if not results:
-                        return "No matches found."
-                    lines = [
-                        f"{r['file']}:{r['line']}: {r['content']}" for r in results[:50]
-                    ]
-                    return "\n".join(lines)
-
-                case "list_files":
-                    files = self.workspace.list_files(
-                        tool_input.get("path", "."),
-                        tool_input.get("recursive", False),
-                    )
-                    return "\n".join(files) if files else "No files found."
-
-                case "build_kernel":
-                    return await self._run_build(tool_input.get("target", "all"))
+            result = await handler(tool_input)
+        except Exception as e:
+            return f"Error executing {tool_name}: {e}"
+        finally:
+            if not read_only:
+                # Bumped after the tool finishes, so a read racing it is dropped.
+                self.workspace.mark_changed()
+        if read_only:
+            self._action_cache[key] = result
+        return result
+
+    async def _tool_read_file(self, tool_input: dict) -> str:
+        return await _in_io_pool(self.workspace.read_file, tool_input["path"])
+
+    async def _tool_write_file(self, tool_input: dict) -> str:
+        path, content = tool_input["path"], tool_input["content"]
+        if not await _in_io_pool(self.workspace.write_file, path, content):
+            return f"Unchanged: {path} already has this content"
+        self._artifacts[path] = None
+        return f"Written {len(content)} bytes to {path}"
+
+    async def _tool_search_code(self, tool_input: dict) -> str:
+        results = await _in_io_pool(
+            self.workspace.search_code,
+            tool_input["pattern"],
+            tool_input.get("glob", "*"),
+            _SEARCH_RESULTS,
+        )
+        if not results:
+            return "No matches found."
+        return "\n".join(f"{r['file']}:{r['line']}: {r['content']}" for r in results)
+
+    async def _tool_list_files(self, tool_input: dict) -> str:
+        files = self.workspace.list_files(
+            tool_input.get("path", "."),
+            tool_input.get("recursive", False),
+        )
+        return "\n".join(files) if files else "No files found."
 
-                case "run_test":
-                    return await self._run_test(
-                        tool_input["test_name"],
-                        tool_input.get("timeout", 60),
-                    )
+    async def _tool_build_kernel(self, tool_input: dict) -> str:
+        return await self._run_build(tool_input.get("target", "all"))
 
-                case "git_commit":
-                    sha = self.workspace.commit(
-                        tool_input["message"],
-                        tool_input.get("files"),
-                    )
-                    return f"Committed: {sha[:8]}"
+    async def _tool_run_test(self, tool_input: dict) -> str:
+        return await self._run_test(tool_input["test_name"], tool_input.get("timeout", 60))
 
-                case "git_diff":
-                    diff = self.workspace.diff(tool_input.get("branch"))
-                    return diff if diff else "No changes."
+    async def _tool_git_commit(self, tool_input: dict) -> str:
+        sha = self.workspace.commit(tool_input["message"], tool_input.get("files"))
+        return f"Committed: {sha[:8]}"
 
-                case "read_spec":
-                    return self._read_spec(tool_input["subsystem"])
+    async def _tool_git_diff(self, tool_input: dict) -> str:
+        diff = self.workspace.diff(tool_input.get("branch"))
+        return diff if diff else "No changes."
 
-                case "shell":
-                    return await self._run_shell(
-                        tool_input["command"],
-                        tool_input.get("timeout", 120),
-                    )
-
-                # SLM tools
-                case "analyze_dataset":
-                    return await self._analyze_dataset(tool_input["dataset_path"])
+    async def _tool_read_spec(self, tool_input: dict) -> str:
+        return await self._read_spec(tool_input["subsystem"])
 
-                case "tokenize_data":
-                    return await self._tokenize_data(
-                        tool_input["input_path"],
-                        tool_input["output_path"],
-                        tool_input.get("vocab_size", 32000),
-                    )
+    async def _tool_shell(self, tool_input: dict) -> str:
+        return await self._run_shell(tool_input["command"], tool_input.get("timeout", 120))
 
-                case "validate_architecture":
-                    return self._validate_architecture(tool_input["config_path"])
+    async def _tool_analyze_dataset(self, tool_input: dict) -> str:
+        return await self._analyze_dataset(tool_input["dataset_path"])
 
-                case "estimate_flops":
-                    return self._estimate_flops(tool_input["config_path"])
+    async def _tool_tokenize_data(self, tool_input: dict) -> str:
+        return await self._tokenize_data(
+            tool_input["input_path"],
+            tool_input["output_path"],
+            tool_input.get("vocab_size", 32000),
+        )
 
-                case "train_model":
-                    return await self._train_model(
-                        tool_input["config_path"],
-                        tool_input["dataset_path"],
-                        tool_input.get("max_steps", 10000),
-                    )
+    async def _tool_validate_architecture(self, tool_input: dict) -> str:
+        return await self._validate_architecture(tool_input["config_path"])
 
-                case "evaluate_model":
-                    return await self._evaluate_model(
-                        tool_input["checkpoint_path"],
-                        tool_input["test_dataset"],
-                    )
+    async def _tool_estimate_flops(self, tool_input: dict) -> str:
+        return await self._estimate_flops(tool_input["config_path"])
 
-                case "quantize_model":
-                    return await self._quantize_model(
-                        tool_input["checkpoint_path"],
-                        tool_input["output_path"],
-                        tool_input.get("bits", 4),
-                    )
+    async def _tool_train_model(self, tool_input: dict) -> str:
+        return await self._train_model(
+            tool_input["config_path"],
+            tool_input["dataset_path"],
+            tool_input.get("max_steps", 10000),
+        )
 
-                case "export_gguf":
-                    return await self._export_gguf(
-                        tool_input["model_path"],
-                        tool_input["output_path"],
-                    )
+    async def _tool_evaluate_model(self, tool_input: dict) -> str:
+        return await self._evaluate_model(
+            tool_input["checkpoint_path"],
+            tool_input["test_dataset"],
+        )
 
-                case "export_onnx":
-                    return await self._export_onnx(
-                        tool_input["model_path"],
-                        tool_input["output_path"],
-                    )
+    async def _tool_quantize_model(self, tool_input: dict) -> str:
+        return await self._quantize_model(
+            tool_input["checkpoint_path"],
+            tool_input["output_path"],
+            tool_input.get("bits", 4),
+        )
 
-                case "integrate_slm":
-                    return await self._integrate_slm(
-                        tool_input["model_path"],
-                        tool_input["kernel_arch"],
-                    )
+    async def _tool_export_gguf(self, tool_input: dict) -> str:
+        return await self._export_gguf(tool_input["model_path"], tool_input["output_path"])
 
-                case _:
-                    return f"Unknown tool: {tool_name}"
+    async def _tool_export_onnx(self, tool_input: dict) -> str:
+        return await self._export_onnx(tool_input["model_path"], tool_input["output_path"])
 
-        except Exception as e:
-            return f"Error executing {tool_name}: {e}"
+    async def _tool_integrate_slm(self, tool_input: dict) -> str:
+        return await self._integrate_slm(tool_input["model_path"], tool_input["kernel_arch"])
 
-    def _read_spec(self, subsystem: str) -> str:
+    async def _read_spec(self, subsystem: str) -> str:
         """Read a kernel specification document.
 
         Supports subsystem names like 'boot', 'mm', 'sched', etc.
@@ -297,9 +602,20 @@ class Agent:
         else:
             path = self.kernel_spec_path / "subsystems" / f"{subsystem}.md"
 
-        if not path.exists():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
             return f"Specification not found: {subsystem}"
-        return path.read_text(encoding="utf-8")
+        cached = _SPEC_CACHE.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _SPEC_CACHE.move_to_end(path)
+            return cached[2]
+        text = await _in_io_pool(path.read_text, "utf-8")
+        _SPEC_CACHE[path] = (st.st_mtime_ns, st.st_size, text)
+        _SPEC_CACHE.move_to_end(path)
+        if len(_SPEC_CACHE) > _SPEC_CACHE_SIZE:
+            _SPEC_CACHE.popitem(last=False)
+        return text
 
     async def _run_build(self, target: str) -> str:
         """Run the kernel build. Delegates to the build system."""
@@ -307,69 +623,128 @@ class Agent:
         if not makefile.exists():
             return "No Makefile found in workspace. Cannot build."
 
-        cmd = ["make", "-C", str(self.workspace.path), target]
-        return await self._run_shell(" ".join(cmd), timeout=120)
+        env = None
+        if _CCACHE_DIR is not None:
+            env = {**os.environ, "PATH": _CCACHE_DIR + os.pathsep + os.environ.get("PATH", "")}
+        return await self._run_shell(
+            ["make", "-C", str(self.workspace.path), target],
+            timeout=120,
+            tail_kb=_LOG_TAIL_KB,
+            env=env,
+        )
 
     async def _run_test(self, test_name: str, timeout: int) -> str:
         """Run a kernel test."""
         return await self._run_shell(
-            f"make -C {self.workspace.path} test-{test_name}",
+            ["make", "-C", str(self.workspace.path), f"test-{test_name}"],
             timeout=timeout,
+            tail_kb=_LOG_TAIL_KB,
         )
 
-    async def _run_shell(self, command: str, timeout: int = 120) -> str:
-        """Execute a shell command and return stdout+stderr."""
+    async def _run_shell(
+        self,
+        command: str | list[str],
+        timeout: int = 120,
+        tail_kb: int | None = None,
+        env: dict[str, str] | None = None,
+    ) -> str:
+        """Execute a command and return the tail of its stdout+stderr.
+
+        An argv list, or a string without shell syntax, is exec'd directly;
+        anything else (or a shell builtin) goes through ``/bin/sh``. With
+        ``tail_kb`` the full output is also written to a log file whose path
+        is returned, and each stream's tail is capped at that many KiB.
+        ``env`` replaces the inherited environment when given.
+        """
+        if isinstance(command, str):
+            argv = _exec_argv(command)
+        else:
+            argv, command = command, shlex.join(command)
+        pipes = {
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+            "cwd": str(self.workspace.path),
+            # Own process group, so a timeout can kill make's children too.
+            "start_new_session": True,
+            "env": env,
+        }
+        log_path = None if tail_kb is None else _new_command_log(self.workspace.path)
+        max_chars = None if tail_kb is None else tail_kb * 1024
         try:
-            proc = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.workspace.path),
-            )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(), timeout=timeout
-            )
-            output = ""
-            if stdout:
-                output += stdout.decode("utf-8", errors="replace")
-            if stderr:
-                output += "\n[stderr]\n" + stderr.decode("utf-8", errors="replace")
+            try:
+                if argv is None:
+                    raise FileNotFoundError
+                proc = await asyncio.create_subprocess_exec(*argv, **pipes)
+            except FileNotFoundError:
+                proc = await asyncio.create_subprocess_shell(command, **pipes)
+
+            out: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+            err: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+            with contextlib.ExitStack() as stack:
+                log = None
+                if log_path is not None:
+                    log = stack.enter_context(open(log_path, "wb", buffering=1 << 17))
+                    log.write(f"$ {command}\n".encode())
+                try:
+                    out_lines, err_lines, _ = await asyncio.wait_for(
+                        asyncio.gather(
+                            _drain(proc.stdout, out, log),
+                            _drain(proc.stderr, err, log, b"[stderr] "),
+                            proc.wait(),
+                        ),
+                        timeout=timeout,
+                    )
+                except asyncio.TimeoutError:
+                    await _terminate_group(proc)
+                    raise
+
+            output = _format_tail(out, out_lines, max_chars)
+            if err_lines:
+                output += "\n[stderr]\n" + _format_tail(err, err_lines, max_chars)
             output += f"\n[exit code: {proc.returncode}]"
+            if log_path is not None:
+                output += f"\n[full log: {log_path}]"
             return output
         except asyncio.TimeoutError:
+            if log_path is not None:
+                return f"Command timed out after {timeout}s: {command}\n[full log: {log_path}]"
             return f"Command timed out after {timeout}s: {command}"
         except Exception as e:
             return f"Shell error: {e}"
 
     def _format_task_prompt(self, task: dict[str, Any]) -> str:
         """Format a task as a user prompt for Claude."""
-        parts = [f"## Task: {task.get('title', 'Unnamed task')}"]
-
-        if desc := task.get("description"):
-            parts.append(f"\n{desc}")
-
-        if subsystem := task.get("subsystem"):
-            parts.append(f"\n**Subsystem**: {subsystem}")
-
-        if spec_ref := task.get("spec_reference"):
-            parts.append(f"**Specification**: {spec_ref}")
-
-        if deps := task.get("dependencies"):
-            parts.append(f"**Dependencies**: {', '.join(deps)}")
-
-        if criteria := task.get("acceptance_criteria"):
-            parts.append("\n**Acceptance Criteria**:")
-            for c in criteria:
-                parts.append(f"- {c}")
+        get = task.get
+        deps = get("dependencies")
+        criteria = get("acceptance_criteria")
+        context = get("context")
+        # One join over the optional sections; absent ones are falsy and skipped.
+        sections = (
+            f"## Task: {get('title', 'Unnamed task')}",
+            (desc := get("description")) and f"\n{desc}",
+            (subsystem := get("subsystem")) and f"\n**Subsystem**: {subsystem}",
+            (spec_ref := get("spec_reference")) and f"**Specification**: {spec_ref}",
+            deps and f"**Dependencies**: {', '.join(deps)}",
+            criteria and "\n**Acceptance Criteria**:\n- " + "\n- ".join(map(str, criteria)),
+            context and f"\n**Additional Context**:\n{context}",
+            _TASK_PROMPT_FOOTER,
+        )
+        return "\n".join(section for section in sections if section)
 
-        if context := task.get("context"):
-            parts.append(f"\n**Additional Context**:\n{context}")
+    def _task_content(self, task: dict[str, Any], task_prompt: str) -> Any:
+        """First user message: the task's fixed ``instructions``, then its prompt.
 
-        parts.append(
-            "\nExecute this task using the tools available to you. "
-            "Build and test your code. Commit when everything passes."
-        )
-        return "\n".join(parts)
+        Instructions are the same for every task of a kind (every review,
+        every test run), so they lead the message; on providers that take
+        cache breakpoints they close the cached prefix after system + tools.
+        """
+        instructions = task.get("instructions")
+        if not instructions:
+            return task_prompt
+        model = self.model_override or self.client.model
+        if self.prompt_caching and supports_cache_control(model):
+            return with_cached_prefix(instructions, task_prompt)
+        return f"{instructions}\n\n{task_prompt}"
 
     def _extract_final_text(self, messages: list[dict[str, Any]]) -> str:
         """Extract the final text response from the conversation."""
@@ -380,47 +755,34 @@ class Agent:
                     return content
         return "No text response."
 
-    def _extract_artifacts(self, messages: list[dict[str, Any]]) -> list[str]:
-        """Extract file paths from write_file tool calls."""
-        artifacts = []
-        for msg in messages:
-            if msg.get("role") == "assistant":
-                for tc in msg.get("tool_calls", []):
-                    func = tc.get("function", {})
-                    if func.get("name") == "write_file":
-                        try:
-                            args = json.loads(func.get("arguments", "{}"))
-                        except (json.JSONDecodeError, TypeError):
-                            args = {}
-                        path = args.get("path", "")
-                        if path:
-                            artifacts.append(path)
-        return artifacts
-
     def _current_branch(self) -> str | None:
         """Get the current git branch name."""
         try:
-            return self.workspace.repo.active_branch.name
+            return self.workspace.current_branch()
         except Exception:
             return None
 
     # SLM tool executors
     async def _analyze_dataset(self, dataset_path: str) -> str:
         """Analyze dataset statistics."""
-        cmd = f"python SLM/tools/dataset_builder.py analyze {dataset_path}"
+        cmd = (
+            f"{_DATA_TOOL_PREFIX}python SLM/tools/dataset_builder.py analyze {dataset_path}"
+            f" --workers {_DATA_WORKERS}"
+        )
         return await self._run_shell(cmd)
 
     async def _tokenize_data(self, input_path: str, output_path: str, vocab_size: int) -> str:
         """Tokenize dataset."""
-        cmd = f"python SLM/tools/tokenizer.py --input {input_path} --output {output_path} --vocab-size {vocab_size}"
+        cmd = (
+            f"{_DATA_TOOL_PREFIX}python SLM/tools/tokenizer.py --input {input_path}"
+            f" --output {output_path} --vocab-size {vocab_size} --workers {_DATA_WORKERS}"
+        )
         return await self._run_shell(cmd)
 
-    def _validate_architecture(self, config_path: str) -> str:
+    async def _validate_architecture(self, config_path: str) -> str:
         """Validate model config YAML."""
-        import yaml
         try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
+            config = await _in_io_pool(_load_yaml, config_path)
             required = ["model", "architecture", "training"]
             missing = [k for k in required if k not in config]
             if missing:
@@ -429,12 +791,10 @@ class Agent:
         except Exception as e:
             return f"Config validation error: {e}"
 
-    def _estimate_flops(self, config_path: str) -> str:
+    async def _estimate_flops(self, config_path: str) -> str:
         """Estimate model FLOPs."""
-        import yaml
         try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f)
+            config = await _in_io_pool(_load_yaml, config_path)
             arch = config["architecture"]
             params = config["model"]["parameters"]
             return f"Estimated {params:,} parameters, ~{params * 6 / 1e9:.2f}B FLOPs per token"
@@ -444,38 +804,40 @@ class Agent:
     async def _train_model(self, config_path: str, dataset_path: str, max_steps: int) -> str:
         """Train SLM model."""
         cmd = f"python SLM/scripts/train.py --config {config_path} --dataset {dataset_path} --max-steps {max_steps}"
-        return await self._run_shell(cmd, timeout=3600)
+        return await self._run_shell(cmd, timeout=3600, tail_kb=_LOG_TAIL_KB)
 
     async def _evaluate_model(self, checkpoint_path: str, test_dataset: str) -> str:
         """Evaluate model checkpoint."""
         cmd = f"python SLM/scripts/evaluate.py --checkpoint {checkpoint_path} --dataset {test_dataset}"
-        return await self._run_shell(cmd, timeout=600)
+        return await self._run_shell(cmd, timeout=600, tail_kb=_LOG_TAIL_KB)
 
     async def _quantize_model(self, checkpoint_path: str, output_path: str, bits: int) -> str:
         """Quantize model."""
         cmd = f"python SLM/scripts/quantize.py --checkpoint {checkpoint_path} --bits {bits} --output {output_path}"
-        return await self._run_shell(cmd, timeout=1800)
+        return await self._run_shell(cmd, timeout=1800, tail_kb=_LOG_TAIL_KB)
 
     async def _export_gguf(self, model_path: str, output_path: str) -> str:
         """Export to GGUF format."""
         cmd = f"python SLM/scripts/export_gguf.py --model {model_path} --output {output_path}"
-        return await self._run_shell(cmd, timeout=600)
+        return await self._run_shell(cmd, timeout=600, tail_kb=_LOG_TAIL_KB)
 
     async def _export_onnx(self, model_path: str, output_path: str) -> str:
         """Export to ONNX format."""
         cmd = f"python SLM/scripts/export_onnx.py --model {model_path} --output {output_path}"
-        return await self._run_shell(cmd, timeout=600)
+        return await self._run_shell(cmd, timeout=600, tail_kb=_LOG_TAIL_KB)
 
     async def _integrate_slm(self, model_path: str, kernel_arch: str) -> str:
         """Integrate SLM into kernel workspace."""
-        import shutil
-        from pathlib import Path
-        
         try:
             src = Path(model_path)
             dst = Path(f"kernels/{kernel_arch}/kernel/slm/models/auton-slm.gguf")
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy(src, dst)
+            start = time.monotonic()
+            copied = await _in_io_pool(_copy_file, src, dst)
+            logger.info(
+                "[%s] Copied %s (%d bytes) in %.2fs",
+                self.agent_id, src.name, copied, time.monotonic() - start,
+            )
             return f"Integrated {src.name} into {kernel_arch} kernel at {dst}"
         except Exception as e:
             return f"Integration error: {e}"
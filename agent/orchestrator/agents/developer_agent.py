@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
 from typing import Any
 
 from orchestrator.agents.base_agent import Agent, AgentRole, TaskResult
 from orchestrator.comms.diff_protocol import TaskMetadata, TaskStatus
+from orchestrator.comms.message_bus import MessageType
 from orchestrator.llm.prompts import build_developer_prompt
 from orchestrator.llm.tools import DEVELOPER_TOOLS
 
@@ -54,6 +57,12 @@ class DeveloperAgent(Agent):
 
         logger.info("[%s] Implementing %s", self.agent_id, task_id)
 
+        # Warm the spec cache for the read_spec call the model nearly always
+        # opens with; the read runs in the I/O pool during the first LLM turn.
+        prefetch = None
+        if subsystem != "unknown":
+            prefetch = asyncio.create_task(self._read_spec(subsystem))
+
         # Create feature branch
         branch = self.workspace.create_branch(self.agent_id, subsystem, component)
 
@@ -73,7 +82,12 @@ class DeveloperAgent(Agent):
         metadata.save(self.workspace.path)
 
         # Execute the task
-        result = await self.execute_task(task)
+        try:
+            result = await self.execute_task(task)
+        finally:
+            if prefetch is not None:
+                with contextlib.suppress(Exception):
+                    await prefetch
 
         # Update metadata with results
         metadata.status = TaskStatus.REVIEW if result.success else TaskStatus.BLOCKED
@@ -85,7 +99,7 @@ class DeveloperAgent(Agent):
         if result.success:
             await self.send_message(
                 to_agent="reviewer",
-                msg_type="review_request",
+                msg_type=MessageType.REVIEW_REQUEST,
                 payload={
                     "task_id": task_id,
                     "branch": branch,
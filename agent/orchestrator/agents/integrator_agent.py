@@ -21,6 +21,29 @@ def _get_prompt(kwargs):
     return build_integrator_prompt(arch)
 
 
+def _merge_order(approved: list[TaskMetadata]) -> list[TaskMetadata]:
+    """Order approved tasks so each merges after the approved tasks it depends on.
+
+    Otherwise stable: independent tasks keep their ``created_at`` order.
+    """
+    by_id = {t.task_id: t for t in approved}
+    order: list[TaskMetadata] = []
+    seen: set[str] = set()
+
+    def visit(task_meta: TaskMetadata) -> None:
+        if task_meta.task_id in seen:
+            return
+        seen.add(task_meta.task_id)
+        for dep in task_meta.dependencies:
+            if dep in by_id:
+                visit(by_id[dep])
+        order.append(task_meta)
+
+    for task_meta in approved:
+        visit(task_meta)
+    return order
+
+
 class IntegratorAgent(Agent):
     """Merges approved branches into main and validates the result.
 
@@ -40,6 +63,10 @@ class IntegratorAgent(Agent):
     async def merge_approved(self) -> list[dict[str, Any]]:
         """Find and merge all approved branches.
 
+        Merges share the main working tree and each one builds on the last,
+        so they run one at a time, dependencies first: a dependent merged
+        ahead of its parent would fail its build and stop the whole pass.
+
         Returns a list of merge results.
         """
         tasks = TaskMetadata.load_all(self.workspace.path)
@@ -50,7 +77,7 @@ class IntegratorAgent(Agent):
             return []
 
         results = []
-        for task_meta in approved:
+        for task_meta in _merge_order(approved):
             result = await self.merge_branch(task_meta)
             results.append(result)
             if not result.get("success"):
@@ -7,6 +7,11 @@ import logging
 from pathlib import Path
 from typing import Any
 
+try:  # optional: C parser for the (potentially large) task list
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
 from orchestrator.agents.base_agent import Agent, AgentRole, AgentState, TaskResult
 from orchestrator.comms.diff_protocol import TaskMetadata, TaskStatus
 from orchestrator.comms.message_bus import MessageType
@@ -15,6 +20,9 @@ from orchestrator.llm.tools import MANAGER_TOOLS
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type.
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 def _get_prompt(kwargs):
     arch = kwargs.get('arch_profile')
@@ -43,6 +51,8 @@ class ManagerAgent(Agent):
             tools=MANAGER_TOOLS,
             **kwargs,
         )
+        # (status summary, assessment) of the last successful assess_progress()
+        self._last_assessment: tuple[str, dict[str, Any]] | None = None
 
     async def decompose_goal(self, goal: str) -> list[dict[str, Any]]:
         """Decompose a high-level goal into actionable tasks.
@@ -111,6 +121,10 @@ Return ONLY the JSON array, no other text."""
     async def assess_progress(self) -> dict[str, Any]:
         """Assess overall project progress and identify issues.
 
+        The engine asks again every iteration it is stuck; while no task or
+        branch has changed, the previous report is returned without another
+        LLM round trip.
+
         Returns a status report with recommendations.
         """
         self.state = AgentState.THINKING
@@ -120,6 +134,9 @@ Return ONLY the JSON array, no other text."""
         branch_status = self.workspace.get_branch_status()
 
         status_summary = self._build_status_summary(tasks, branch_status)
+        if self._last_assessment is not None and self._last_assessment[0] == status_summary:
+            self.state = AgentState.DONE
+            return dict(self._last_assessment[1])
 
         prompt = f"""## Project Status Assessment
 
@@ -151,7 +168,10 @@ Return a JSON object with these fields:
         )
 
         self.state = AgentState.DONE
-        return self._parse_json_response(result_messages)
+        assessment = self._parse_json_response(result_messages)
+        if "error" not in assessment:
+            self._last_assessment = (status_summary, assessment)
+        return dict(assessment)
 
     def _parse_tasks(self, messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Extract task list from Claude's response."""
@@ -161,7 +181,7 @@ Return a JSON object with these fields:
             # Look for JSON array in the text
             start = text.index("[")
             end = text.rindex("]") + 1
-            return json.loads(text[start:end])
+            return _loads(text[start:end])
         except (ValueError, json.JSONDecodeError) as e:
             logger.error("[%s] Failed to parse tasks: %s", self.agent_id, e)
             return []
@@ -172,7 +192,7 @@ Return a JSON object with these fields:
         try:
             start = text.index("{")
             end = text.rindex("}") + 1
-            return json.loads(text[start:end])
+            return _loads(text[start:end])
         except (ValueError, json.JSONDecodeError):
             return {"error": "Failed to parse response", "raw": text}
 
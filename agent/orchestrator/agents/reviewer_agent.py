@@ -13,6 +13,40 @@ from orchestrator.llm.tools import REVIEWER_TOOLS
 
 logger = logging.getLogger(__name__)
 
+# Identical for every review; sent ahead of the per-branch task so it shares
+# the cached prompt prefix (see Agent._task_content).
+_REVIEW_INSTRUCTIONS = """## Instructions
+1. Use git_diff to see the changes on this branch (diff against main)
+2. Read the full files that were changed
+3. Read the subsystem specification for context
+4. Check for:
+   - **Correctness**: Does the code do what the spec says?
+   - **Memory safety**: No leaks, use-after-free, double-free, buffer overflows
+   - **Undefined behavior**: No UB per the C standard
+   - **API compliance**: Functions match the header file interfaces
+   - **Style**: Follows Linux kernel coding style
+   - **Composition risks**: Will this break when combined with other subsystems?
+
+## Output
+Return your review as a JSON object:
+```json
+{
+    "verdict": "approve" or "request_changes",
+    "summary": "Brief overall assessment",
+    "issues": [
+        {
+            "severity": "critical" | "warning" | "nit",
+            "file": "path/to/file.c",
+            "line": 42,
+            "description": "What's wrong and suggested fix"
+        }
+    ]
+}
+```
+
+Only block with "request_changes" for critical or warning issues.
+Approve with nits if issues are minor."""
+
 
 def _get_prompt(kwargs):
     arch = kwargs.get('arch_profile')
@@ -50,39 +84,8 @@ class ReviewerAgent(Agent):
             "task_id": f"review-{task_id}",
             "title": f"Review code for {task_id}",
             "subsystem": "review",
-            "description": f"""Review the code changes on branch '{branch}' for task '{task_id}'.
-
-## Instructions
-1. Use git_diff to see the changes on this branch (diff against main)
-2. Read the full files that were changed
-3. Read the subsystem specification for context
-4. Check for:
-   - **Correctness**: Does the code do what the spec says?
-   - **Memory safety**: No leaks, use-after-free, double-free, buffer overflows
-   - **Undefined behavior**: No UB per the C standard
-   - **API compliance**: Functions match the header file interfaces
-   - **Style**: Follows Linux kernel coding style
-   - **Composition risks**: Will this break when combined with other subsystems?
-
-## Output
-Return your review as a JSON object:
-```json
-{{
-    "verdict": "approve" or "request_changes",
-    "summary": "Brief overall assessment",
-    "issues": [
-        {{
-            "severity": "critical" | "warning" | "nit",
-            "file": "path/to/file.c",
-            "line": 42,
-            "description": "What's wrong and suggested fix"
-        }}
-    ]
-}}
-```
-
-Only block with "request_changes" for critical or warning issues.
-Approve with nits if issues are minor.""",
+            "description": f"Review the code changes on branch '{branch}' for task '{task_id}'.",
+            "instructions": _REVIEW_INSTRUCTIONS,
         }
 
         result = await self.execute_task(task)
@@ -12,6 +12,73 @@ from orchestrator.llm.tools import TESTER_TOOLS
 
 logger = logging.getLogger(__name__)
 
+# Fixed per kind of tester task; sent ahead of the task itself so they share
+# the cached prompt prefix (see Agent._task_content).
+_WRITE_TESTS_INSTRUCTIONS = """## Instructions
+1. Read the subsystem's specification (use read_spec)
+2. Read the implementation code
+3. Write unit tests that cover:
+   - Normal operation (happy path)
+   - Edge cases (empty input, max values, null pointers)
+   - Error conditions (out of memory, invalid arguments)
+   - Stress scenarios (rapid alloc/free cycles, concurrent access)
+4. Write integration tests if applicable (test interaction with other subsystems)
+5. Tests should output results to serial console:
+   ```
+   [TEST] test_name: PASS
+   [TEST] test_name: FAIL - expected X got Y
+   ```
+6. Place test files in tests/<subsystem>/
+7. Build and verify tests compile
+8. Commit test files
+
+Focus on tests that will catch real bugs, not trivial assertions."""
+
+_RUN_TESTS_INSTRUCTIONS = """## Instructions
+1. Build the kernel (use build_kernel)
+2. Run the tests (use run_test with the task's subsystem as test_name)
+3. Parse the output for PASS/FAIL results
+4. If any tests fail, investigate the failure:
+   - Read the relevant source code
+   - Identify the root cause
+   - Determine if it's a test bug or implementation bug
+
+Return results as JSON:
+```json
+{
+    "total": 10,
+    "passed": 8,
+    "failed": 2,
+    "failures": [
+        {
+            "test": "test_name",
+            "expected": "...",
+            "actual": "...",
+            "analysis": "Root cause explanation"
+        }
+    ],
+    "build_status": "success" or "failed"
+}
+```"""
+
+_COMPOSITION_INSTRUCTIONS = """## Instructions
+1. Build the kernel with all subsystems included
+2. Boot the kernel in QEMU
+3. Exercise each subsystem in sequence
+4. Exercise subsystems in combination:
+   - Allocate memory while scheduling tasks
+   - Send IPC messages while handling interrupts
+   - Run multiple operations concurrently
+5. Check for:
+   - Deadlocks (kernel hangs)
+   - Memory corruption (unexpected values)
+   - Race conditions (inconsistent results)
+   - Performance degradation (operations much slower than in isolation)
+
+This is the most important test. The "Frankenstein effect" means
+subsystems that pass all tests individually can fail catastrophically
+when composed. Look for subtle interactions."""
+
 
 def _get_prompt(kwargs):
     arch = kwargs.get('arch_profile')
@@ -47,27 +114,8 @@ class TesterAgent(Agent):
             "task_id": f"test-write-{subsystem}",
             "title": f"Write tests for {subsystem}",
             "subsystem": subsystem,
-            "description": f"""Write comprehensive tests for the {subsystem} kernel subsystem.
-
-## Instructions
-1. Read the {subsystem} specification (use read_spec)
-2. Read the implementation code
-3. Write unit tests that cover:
-   - Normal operation (happy path)
-   - Edge cases (empty input, max values, null pointers)
-   - Error conditions (out of memory, invalid arguments)
-   - Stress scenarios (rapid alloc/free cycles, concurrent access)
-4. Write integration tests if applicable (test interaction with other subsystems)
-5. Tests should output results to serial console:
-   ```
-   [TEST] test_name: PASS
-   [TEST] test_name: FAIL - expected X got Y
-   ```
-6. Place test files in tests/{subsystem}/
-7. Build and verify tests compile
-8. Commit test files
-
-Focus on tests that will catch real bugs, not trivial assertions.""",
+            "description": f"Write comprehensive tests for the {subsystem} kernel subsystem.",
+            "instructions": _WRITE_TESTS_INSTRUCTIONS,
             "acceptance_criteria": [
                 f"Test files created in tests/{subsystem}/",
                 "Tests compile without errors",
@@ -87,34 +135,8 @@ Focus on tests that will catch real bugs, not trivial assertions.""",
             "task_id": f"test-run-{target}",
             "title": f"Run tests for {target}",
             "subsystem": target,
-            "description": f"""Run the test suite for {target}.
-
-## Instructions
-1. Build the kernel (use build_kernel)
-2. Run the tests (use run_test with test_name='{target}')
-3. Parse the output for PASS/FAIL results
-4. If any tests fail, investigate the failure:
-   - Read the relevant source code
-   - Identify the root cause
-   - Determine if it's a test bug or implementation bug
-
-Return results as JSON:
-```json
-{{
-    "total": 10,
-    "passed": 8,
-    "failed": 2,
-    "failures": [
-        {{
-            "test": "test_name",
-            "expected": "...",
-            "actual": "...",
-            "analysis": "Root cause explanation"
-        }}
-    ],
-    "build_status": "success" or "failed"
-}}
-```""",
+            "description": f"Run the test suite for {target}.",
+            "instructions": _RUN_TESTS_INSTRUCTIONS,
         }
 
         result = await self.execute_task(task)
@@ -132,25 +154,8 @@ Return results as JSON:
             "task_id": f"test-compose-{'_'.join(subsystems)}",
             "title": f"Composition test: {sub_list}",
             "subsystem": "integration",
-            "description": f"""Test the composition of these subsystems working together: {sub_list}
-
-## Instructions
-1. Build the kernel with all subsystems included
-2. Boot the kernel in QEMU
-3. Exercise each subsystem in sequence
-4. Exercise subsystems in combination:
-   - Allocate memory while scheduling tasks
-   - Send IPC messages while handling interrupts
-   - Run multiple operations concurrently
-5. Check for:
-   - Deadlocks (kernel hangs)
-   - Memory corruption (unexpected values)
-   - Race conditions (inconsistent results)
-   - Performance degradation (operations much slower than in isolation)
-
-This is the most important test. The "Frankenstein effect" means
-subsystems that pass all tests individually can fail catastrophically
-when composed. Look for subtle interactions.""",
+            "description": f"Test the composition of these subsystems working together: {sub_list}",
+            "instructions": _COMPOSITION_INSTRUCTIONS,
         }
 
         result = await self.execute_task(task)
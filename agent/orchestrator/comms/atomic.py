@@ -0,0 +1,39 @@
+"""Atomic file replacement for the files agents share through the workspace.
+
+Task metadata and inbox messages are read by other agents (and the CLI)
+while they are being written. Writing to a sibling temp file and renaming
+it over the target means a reader sees either the old file or the new one,
+never a truncated prefix.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+from pathlib import Path
+
+# Distinguishes temp files written by different threads of one process.
+_counter = itertools.count()
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` in one rename.
+
+    The temp file is a hidden sibling (same directory, so the rename stays on
+    one filesystem) whose name does not end in the target's suffix, so
+    directory listings that filter on it never pick it up. A missing parent
+    directory raises FileNotFoundError, as ``Path.write_bytes`` would.
+    """
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}-{next(_counter)}")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -3,11 +3,31 @@
 from __future__ import annotations
 
 import json
+import os
 import time
-from dataclasses import asdict, dataclass, field
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 from pathlib import Path
 
+try:  # optional: C JSON codec for task metadata files
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from orchestrator.comms.atomic import write_bytes_atomic
+
+if orjson is not None:
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+else:  # pragma: no cover - depends on environment
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -19,6 +39,21 @@ class TaskStatus(str, Enum):
     BLOCKED = "blocked"
 
 
+# Parsed metadata files keyed by path and validated by (inode, mtime_ns, size);
+# save() refreshes its own entry, so only outside writers are ever re-read.
+# Writes replace the file, so the inode catches a same-size rewrite within
+# the mtime granularity.
+_LOADED: OrderedDict[Path, tuple[tuple[int, int, int], TaskMetadata]] = OrderedDict()
+_LOADED_SIZE = 4096
+
+
+def _remember(path: Path, st: os.stat_result, meta: TaskMetadata) -> None:
+    _LOADED[path] = ((st.st_ino, st.st_mtime_ns, st.st_size), meta)
+    _LOADED.move_to_end(path)
+    if len(_LOADED) > _LOADED_SIZE:
+        _LOADED.popitem(last=False)
+
+
 @dataclass
 class TaskMetadata:
     """Metadata for an agent-proposed change, stored alongside the git branch."""
@@ -40,13 +75,18 @@ class TaskMetadata:
     updated_at: float = field(default_factory=time.time)
 
     def to_json(self) -> str:
-        data = asdict(self)
+        return self._encode().decode("utf-8")
+
+    def _encode(self) -> bytes:
+        # A shallow dict of the fields: asdict() deep-copies them only to
+        # serialize the copy.
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
         data["status"] = self.status.value
-        return json.dumps(data, indent=2)
+        return _dumps(data)
 
     @classmethod
-    def from_json(cls, raw: str) -> TaskMetadata:
-        data = json.loads(raw)
+    def from_json(cls, raw: str | bytes) -> TaskMetadata:
+        data = _loads(raw)
         data["status"] = TaskStatus(data["status"])
         return cls(**data)
 
@@ -56,21 +96,50 @@ class TaskMetadata:
         tasks_dir.mkdir(parents=True, exist_ok=True)
         path = tasks_dir / f"{self.task_id}.json"
         self.updated_at = time.time()
-        path.write_text(self.to_json(), encoding="utf-8")
+        write_bytes_atomic(path, self._encode())
+        _remember(path, path.stat(), self.copy())
+
+    def copy(self) -> TaskMetadata:
+        """An independent copy, safe to mutate and save."""
+        return replace(
+            self,
+            dependencies=list(self.dependencies),
+            acceptance_criteria=list(self.acceptance_criteria),
+            review_comments=[dict(c) for c in self.review_comments],
+        )
 
     @classmethod
     def load(cls, workspace_path: Path, task_id: str) -> TaskMetadata:
         """Load task metadata from disk."""
         path = workspace_path / ".auton" / "tasks" / f"{task_id}.json"
-        return cls.from_json(path.read_text(encoding="utf-8"))
+        return cls.from_json(path.read_bytes())
 
     @classmethod
     def load_all(cls, workspace_path: Path) -> list[TaskMetadata]:
-        """Load all task metadata files."""
+        """Load all task metadata files.
+
+        Files unchanged since they were last loaded or saved are not re-read;
+        each call still returns its own copies.
+        """
         tasks_dir = workspace_path / ".auton" / "tasks"
-        if not tasks_dir.exists():
+        try:
+            with os.scandir(tasks_dir) as entries:
+                files = [e for e in entries if e.name.endswith(".json") and e.is_file()]
+        except FileNotFoundError:
             return []
         tasks = []
-        for path in tasks_dir.glob("*.json"):
-            tasks.append(cls.from_json(path.read_text(encoding="utf-8")))
+        for entry in files:
+            path = Path(entry.path)
+            st = entry.stat()
+            cached = _LOADED.get(path)
+            if cached is not None and cached[0] == (st.st_ino, st.st_mtime_ns, st.st_size):
+                _LOADED.move_to_end(path)
+                meta = cached[1]
+            else:
+                meta = cls.from_json(path.read_bytes())
+                _remember(path, st, meta)
+            tasks.append(meta.copy())
         return sorted(tasks, key=lambda t: t.created_at)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(TaskMetadata))
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import re
 import shutil
+import subprocess
+import threading
 from pathlib import Path
 
 import git as _git
@@ -29,6 +34,9 @@ from git.exc import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
 logger = logging.getLogger(__name__)
 
+# ripgrep, when installed, does search_code's matching in native code.
+_RG = shutil.which("rg")
+
 
 class GitWorkspace:
     """Manages the shared git repository where agents write kernel code.
@@ -42,6 +50,11 @@ class GitWorkspace:
         self.path = workspace_path.resolve()
         self.branch_prefix = branch_prefix
         self._repo: Repo | None = None
+        # Serializes branch switches from agents running concurrently.
+        self._branch_lock = threading.Lock()
+        # Bumped whenever the work tree or refs may have changed, by this class
+        # or by an agent's build/shell tool; agents drop cached reads on change.
+        self.generation = 0
 
     @property
     def repo(self) -> Repo:
@@ -77,22 +90,67 @@ class GitWorkspace:
         Returns the branch name.
         """
         branch_name = f"{self.branch_prefix}/{agent_id}/{subsystem}-{component}"
-        if branch_name in [b.name for b in self.repo.branches]:
-            logger.info("Branch %s already exists, checking out", branch_name)
-            self.repo.git.checkout(branch_name)
-        else:
-            self.repo.git.checkout("-b", branch_name)
-            logger.info("Created branch %s", branch_name)
+        with self._branch_lock:
+            if branch_name in [b.name for b in self.repo.branches]:
+                logger.info("Branch %s already exists, checking out", branch_name)
+                self.repo.git.checkout(branch_name)
+            else:
+                self.repo.git.checkout("-b", branch_name)
+                logger.info("Created branch %s", branch_name)
+        self.mark_changed()
         return branch_name
 
     def checkout(self, branch: str) -> None:
         """Switch to a branch."""
-        self.repo.git.checkout(branch)
+        with self._branch_lock:
+            self.repo.git.checkout(branch)
+        self.mark_changed()
 
     def checkout_main(self) -> None:
         """Switch back to main branch."""
         main = self._get_main_branch()
-        self.repo.git.checkout(main)
+        with self._branch_lock:
+            self.repo.git.checkout(main)
+        self.mark_changed()
+
+    def mark_changed(self) -> None:
+        """Record that files or refs may have changed (see ``generation``)."""
+        self.generation += 1
+
+    def current_branch(self) -> str | None:
+        """Name of the checked-out branch, or None if HEAD is detached.
+
+        Reads ``.git/HEAD`` directly (one small file read) rather than
+        resolving it through GitPython's ref objects.
+        """
+        try:
+            head = (self.path / ".git" / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:  # e.g. .git is a worktree/submodule pointer file
+            try:
+                return self.repo.active_branch.name
+            except TypeError:  # detached HEAD
+                return None
+        prefix = "ref: refs/heads/"
+        return head[len(prefix):] if head.startswith(prefix) else None
+
+    def snapshot_id(self) -> str:
+        """Fingerprint of everything a read-only tool could observe.
+
+        Covers HEAD, every branch tip (``git_diff`` can compare against any
+        of them) and uncommitted changes, tracked or not. Orchestrator state
+        under ``.auton/`` (messages, task metadata, caches) changes on every
+        send and is left out. Two calls return the same id only if the
+        repository looks the same to an agent.
+        """
+        git = self.repo.git
+        paths = ("--", ".", ":(exclude).auton")
+        state = "\0".join((
+            git.rev_parse("HEAD"),
+            git.for_each_ref("--format=%(refname) %(objectname)", "refs/heads"),
+            git.diff("HEAD", *paths),
+            git.ls_files("--others", "--exclude-standard", *paths),
+        ))
+        return hashlib.sha256(state.encode("utf-8", "surrogateescape")).hexdigest()
 
     def read_file(self, path: str) -> str:
         """Read a file from the workspace."""
@@ -101,11 +159,23 @@ class GitWorkspace:
             raise FileNotFoundError(f"File not found: {path}")
         return full_path.read_text(encoding="utf-8")
 
-    def write_file(self, path: str, content: str) -> None:
-        """Write a file to the workspace, creating parent directories."""
+    def write_file(self, path: str, content: str) -> bool:
+        """Write a file to the workspace, creating parent directories.
+
+        A file that already holds exactly ``content`` is left alone, so its
+        mtime is unchanged and neither make nor git sees anything to redo.
+        Returns whether the file was written.
+        """
         full_path = self.path / path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content, encoding="utf-8")
+        data = content.encode("utf-8")
+        try:
+            if full_path.stat().st_size == len(data) and full_path.read_bytes() == data:
+                return False
+        except FileNotFoundError:
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_bytes(data)
+        self.mark_changed()
+        return True
 
     def list_files(self, path: str = ".", recursive: bool = False) -> list[str]:
         """List files in a workspace directory."""
@@ -124,27 +194,75 @@ class GitWorkspace:
             if p.is_file() and ".git" not in p.parts
         ]
 
-    def search_code(self, pattern: str, glob: str = "*") -> list[dict]:
-        """Search workspace files for a pattern."""
-        import re
+    def search_code(
+        self, pattern: str, glob: str = "*", max_results: int | None = None
+    ) -> list[dict]:
+        """Search workspace files for a pattern.
+
+        Uses ripgrep when it is on PATH (which also skips .gitignored and
+        hidden files), else a Python scan. Stops after ``max_results``.
+        """
+        if _RG:
+            results = self._search_rg(pattern, glob, max_results)
+            if results is not None:
+                return results
+        return self._search_python(pattern, glob, max_results)
+
+    def _search_rg(self, pattern: str, glob: str, max_results: int | None) -> list[dict] | None:
+        """ripgrep ``--json`` search; None if rg rejected the pattern."""
+        proc = subprocess.Popen(
+            [_RG, "--json", "--glob", glob, "--", pattern],
+            cwd=self.path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        results = []
+        with proc:
+            for raw in proc.stdout:
+                event = json.loads(raw)
+                if event["type"] != "match":
+                    continue
+                data = event["data"]
+                text = data["lines"].get("text")
+                if text is None:  # not valid UTF-8; the Python scan skips these too
+                    continue
+                results.append(
+                    {
+                        "file": data["path"]["text"],
+                        "line": data["line_number"],
+                        "content": text.strip(),
+                    }
+                )
+                if max_results is not None and len(results) >= max_results:
+                    proc.kill()
+                    break
+        # rg exits 1 for "no matches" and 2 for errors such as a regex it
+        # does not support; only the latter falls back.
+        if proc.returncode == 2 and not results:
+            return None
+        return results
 
+    def _search_python(self, pattern: str, glob: str, max_results: int | None) -> list[dict]:
+        regex = re.compile(pattern)
         results = []
         for path in self.path.rglob(glob):
             if not path.is_file() or ".git" in path.parts:
                 continue
             try:
                 content = path.read_text(encoding="utf-8")
-                for i, line in enumerate(content.splitlines(), 1):
-                    if re.search(pattern, line):
-                        results.append(
-                            {
-                                "file": str(path.relative_to(self.path)),
-                                "line": i,
-                                "content": line.strip(),
-                            }
-                        )
             except (UnicodeDecodeError, PermissionError):
                 continue
+            for i, line in enumerate(content.splitlines(), 1):
+                if regex.search(line):
+                    results.append(
+                        {
+                            "file": str(path.relative_to(self.path)),
+                            "line": i,
+                            "content": line.strip(),
+                        }
+                    )
+                    if max_results is not None and len(results) >= max_results:
+                        return results
         return results
 
     def commit(self, message: str, files: list[str] | None = None) -> str:
@@ -154,11 +272,14 @@ class GitWorkspace:
         else:
             self.repo.git.add("-A")
 
-        if not self.repo.index.diff("HEAD") and not self.repo.untracked_files:
+        # Only staged changes matter; untracked files are not part of this commit
+        # (and after ``add -A`` there are none), so skip a second worktree scan.
+        if not self.repo.index.diff("HEAD"):
             logger.info("Nothing to commit")
             return self.repo.head.commit.hexsha
 
         commit = self.repo.index.commit(message)
+        self.mark_changed()
         logger.info("Committed %s: %s", commit.hexsha[:8], message)
         return commit.hexsha
 
@@ -198,6 +319,8 @@ class GitWorkspace:
             logger.error("Merge conflict merging %s: %s", branch, e)
             self.repo.git.merge("--abort")
             return False
+        finally:
+            self.mark_changed()
 
     def _get_main_branch(self) -> str:
         """Get the name of the main branch."""
@@ -3,12 +3,33 @@
 from __future__ import annotations
 
 import json
+import os
 import time
 import uuid
-from dataclasses import asdict, dataclass, field
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
 
+try:  # optional: C JSON codec for inbox files
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from orchestrator.comms.atomic import write_bytes_atomic
+
+if orjson is not None:
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+else:  # pragma: no cover - depends on environment
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
 
 class MessageType(str, Enum):
     TASK_ASSIGNMENT = "task_assignment"
@@ -24,7 +45,7 @@ class MessageType(str, Enum):
     STATUS_UPDATE = "status_update"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """A message between agents, persisted as a JSON file."""
 
@@ -37,70 +58,157 @@ class Message:
     read: bool = False
 
     def to_json(self) -> str:
-        data = asdict(self)
-        data["msg_type"] = self.msg_type.value
-        return json.dumps(data, indent=2)
+        return self._encode().decode("utf-8")
+
+    def _encode(self) -> bytes:
+        # Built by hand: asdict() deep-copies the payload only to serialize it.
+        data = {
+            "msg_type": self.msg_type.value,
+            "from_agent": self.from_agent,
+            "to_agent": self.to_agent,
+            "payload": self.payload,
+            "msg_id": self.msg_id,
+            "timestamp": self.timestamp,
+            "read": self.read,
+        }
+        return _dumps(data)
 
     @classmethod
-    def from_json(cls, raw: str) -> Message:
-        data = json.loads(raw)
+    def from_json(cls, raw: str | bytes) -> Message:
+        data = _loads(raw)
         data["msg_type"] = MessageType(data["msg_type"])
         return cls(**data)
 
 
+# Inbox subdirectories: a message is unread while its file is in _UNREAD and
+# read once mark_read has moved it to _READ, so polling lists pending files only.
+_UNREAD = "new"
+_READ = "read"
+
+
+# Parsed inbox files keyed by path and validated by (mtime_ns, size), so
+# re-listing an inbox or conversation re-parses only files that changed.
+_PARSED: OrderedDict[str, tuple[int, int, Message]] = OrderedDict()
+_PARSED_SIZE = 4096
+
+
+def _json_files(folder: Path) -> list[os.DirEntry[str]]:
+    """Message files directly in ``folder``; empty if it does not exist."""
+    try:
+        with os.scandir(folder) as entries:
+            return [e for e in entries if e.name.endswith(".json") and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _load(entry: os.DirEntry[str], read: bool) -> Message:
+    st = entry.stat()
+    cached = _PARSED.get(entry.path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _PARSED.move_to_end(entry.path)
+        msg = cached[2]
+    else:
+        with open(entry.path, "rb") as f:
+            msg = Message.from_json(f.read())
+        _PARSED[entry.path] = (st.st_mtime_ns, st.st_size, msg)
+        if len(_PARSED) > _PARSED_SIZE:
+            _PARSED.popitem(last=False)
+    # The directory, not the file, records whether it was read. Callers get
+    # their own copy; the cached one is never handed out.
+    return replace(msg, read=read, payload=dict(msg.payload))
+
+
 class MessageBus:
     """File-based message passing between agents.
 
     Messages are stored as JSON files in:
-        .auton/messages/<to_agent>/<msg_id>.json
+        .auton/messages/<to_agent>/new/<msg_id>.json   (unread)
+        .auton/messages/<to_agent>/read/<msg_id>.json  (read)
 
-    Agents poll their inbox directory for new messages.
+    The files are the durable record; in-process subscribers are also
+    handed each message as it is sent, so agents need not poll.
     """
 
     def __init__(self, workspace_path: Path):
         self.base_path = workspace_path / ".auton" / "messages"
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._subscribers: dict[str, list[Callable[[Message], None]]] = {}
+        self._inboxes: set[str] = set()  # agents whose new/ directory is known to exist
+        self._migrate_flat_inboxes()
+
+    def _migrate_flat_inboxes(self) -> None:
+        """Move messages left directly in an inbox (older layout) into new/ or read/."""
+        for inbox in self.base_path.iterdir():
+            if not inbox.is_dir():
+                continue
+            for entry in _json_files(inbox):
+                path = Path(entry.path)
+                folder = inbox / (_READ if Message.from_json(path.read_bytes()).read else _UNREAD)
+                folder.mkdir(exist_ok=True)
+                path.replace(folder / path.name)
+
+    def subscribe(self, agent_id: str, callback: Callable[[Message], None]) -> None:
+        """Call ``callback`` with every message sent to ``agent_id`` from now on."""
+        self._subscribers.setdefault(agent_id, []).append(callback)
 
     def send(self, message: Message) -> None:
         """Send a message to an agent's inbox."""
-        inbox = self.base_path / message.to_agent
-        inbox.mkdir(parents=True, exist_ok=True)
-        path = inbox / f"{message.msg_id}.json"
-        path.write_text(message.to_json(), encoding="utf-8")
+        self.send_batch((message,))
+
+    def send_batch(self, messages: Iterable[Message]) -> None:
+        """Send several messages, in order, to their agents' inboxes."""
+        for message in messages:
+            inbox = self.base_path / message.to_agent
+            if message.to_agent not in self._inboxes:
+                (inbox / _UNREAD).mkdir(parents=True, exist_ok=True)
+                self._inboxes.add(message.to_agent)
+            folder = inbox / (_READ if message.read else _UNREAD)
+            path = folder / f"{message.msg_id}.json"
+            raw = message._encode()
+            try:
+                write_bytes_atomic(path, raw)
+            except FileNotFoundError:  # inbox removed behind our back, or first read/
+                folder.mkdir(parents=True, exist_ok=True)
+                write_bytes_atomic(path, raw)
+            for callback in self._subscribers.get(message.to_agent, ()):
+                callback(message)
 
     def receive(self, agent_id: str, unread_only: bool = True) -> list[Message]:
-        """Read messages from an agent's inbox."""
-        inbox = self.base_path / agent_id
-        if not inbox.exists():
-            return []
+        """Read messages from an agent's inbox.
 
-        messages = []
-        for path in sorted(inbox.glob("*.json")):
-            msg = Message.from_json(path.read_text(encoding="utf-8"))
-            if unread_only and msg.read:
-                continue
-            messages.append(msg)
-        return messages
+        Unread messages are listed from new/ alone, so the cost follows the
+        pending messages rather than everything the agent was ever sent.
+        """
+        inbox = self.base_path / agent_id
+        entries = [(e, False) for e in _json_files(inbox / _UNREAD)]
+        if not unread_only:
+            entries += [(e, True) for e in _json_files(inbox / _READ)]
+        entries.sort(key=lambda pair: pair[0].name)
+        return [_load(entry, read) for entry, read in entries]
 
     def mark_read(self, agent_id: str, msg_id: str) -> None:
-        """Mark a message as read."""
-        path = self.base_path / agent_id / f"{msg_id}.json"
-        if path.exists():
-            msg = Message.from_json(path.read_text(encoding="utf-8"))
-            msg.read = True
-            path.write_text(msg.to_json(), encoding="utf-8")
+        """Mark a message as read by moving it from new/ to read/."""
+        inbox = self.base_path / agent_id
+        src = inbox / _UNREAD / f"{msg_id}.json"
+        dst = inbox / _READ / f"{msg_id}.json"
+        try:
+            src.replace(dst)
+        except FileNotFoundError:
+            if not src.exists():
+                return
+            dst.parent.mkdir(exist_ok=True)
+            src.replace(dst)
 
     def broadcast(self, from_agent: str, msg_type: MessageType, payload: dict) -> None:
         """Send a message to all agent inboxes."""
-        for inbox in self.base_path.iterdir():
-            if inbox.is_dir() and inbox.name != from_agent:
-                msg = Message(
-                    msg_type=msg_type,
-                    from_agent=from_agent,
-                    to_agent=inbox.name,
-                    payload=payload,
-                )
-                self.send(msg)
+        targets = [
+            inbox.name for inbox in self.base_path.iterdir()
+            if inbox.is_dir() and inbox.name != from_agent
+        ]
+        self.send_batch(
+            Message(msg_type=msg_type, from_agent=from_agent, to_agent=to_agent, payload=payload)
+            for to_agent in targets
+        )
 
     def get_conversation(
         self, agent_a: str, agent_b: str
@@ -109,10 +217,9 @@ class MessageBus:
         messages = []
         for agent_id in (agent_a, agent_b):
             inbox = self.base_path / agent_id
-            if not inbox.exists():
-                continue
-            for path in inbox.glob("*.json"):
-                msg = Message.from_json(path.read_text(encoding="utf-8"))
-                if msg.from_agent in (agent_a, agent_b):
-                    messages.append(msg)
+            for folder, read in ((_UNREAD, False), (_READ, True)):
+                for entry in _json_files(inbox / folder):
+                    msg = _load(entry, read)
+                    if msg.from_agent in (agent_a, agent_b):
+                        messages.append(msg)
         return sorted(messages, key=lambda m: m.timestamp)
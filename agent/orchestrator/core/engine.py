@@ -25,6 +25,7 @@ from orchestrator.core.scheduler import Scheduler
 from orchestrator.core.state import OrchestratorState
 from orchestrator.core.task_graph import TaskGraph, TaskState
 from orchestrator.arch_registry import ArchProfile, get_arch_profile
+from orchestrator.llm.cache import FileCacheBackend, LLMCache
 from orchestrator.llm.client import CostTracker, LLMClient, ProviderConfig
 from orchestrator.validation import (
     BuildValidator,
@@ -100,6 +101,7 @@ class OrchestrationEngine:
             provider_config=provider_config,
             cost_tracker=self.cost_tracker,
         )
+        self.llm_cache = self._build_llm_cache(llm_config.get("cache", {}), workspace_path)
         self.workspace = GitWorkspace(
             workspace_path=workspace_path,
             branch_prefix=config.get("workspace", {}).get("branch_prefix", "agent"),
@@ -129,6 +131,16 @@ class OrchestrationEngine:
         self.state: OrchestratorState | None = None
         self._agents: dict[str, Any] = {}
 
+    @staticmethod
+    def _build_llm_cache(cache_config: dict[str, Any], workspace_path: Path) -> LLMCache | None:
+        """Response cache shared by all agents, if ``[llm.cache] enabled``."""
+        if not cache_config.get("enabled", False):
+            return None
+        backend = None
+        if cache_config.get("backend", "memory") == "file":
+            backend = FileCacheBackend(workspace_path / ".auton" / "llm_cache")
+        return LLMCache(backend=backend, ttl_secs=cache_config.get("ttl_secs", 24 * 3600))
+
     def _create_agent(self, agent_id: str, role: AgentRole, cls: type) -> Any:
         """Create an agent instance with architecture awareness."""
         model_overrides = self.config.get("agents", {}).get("models", {})
@@ -140,6 +152,7 @@ class OrchestrationEngine:
             kernel_spec_path=self.kernel_spec_path,
             model_override=model_overrides.get(role.value),
             arch_profile=self.arch_profile,
+            llm_cache=self.llm_cache,
         )
 
     def _init_agents(self) -> None:
@@ -274,9 +287,11 @@ class OrchestrationEngine:
 
             architect: ArchitectAgent = self._agents["architect"]
             subsystems = sorted(set(t.get("subsystem", "") for t in tasks if t.get("subsystem")))
-            for subsystem in subsystems:
-                await architect.design_subsystem(subsystem)
-                self.workspace.checkout_main()
+            designs = await architect.design_subsystems(subsystems)
+            for subsystem, design in designs.items():
+                if isinstance(design, BaseException):
+                    logger.error("Design of %s failed: %s", subsystem, design)
+            self.workspace.checkout_main()
 
             # Phase 3: Development loop
             self.state.phase = "developing"
@@ -320,6 +335,7 @@ class OrchestrationEngine:
                     )
 
                     # Process results
+                    completed = []
                     for (slot, task_node), result in zip(assignments, results):
                         self.scheduler.release_agent(slot.agent.agent_id)
 
@@ -329,11 +345,13 @@ class OrchestrationEngine:
                             self.state.tasks_failed += 1
                         elif isinstance(result, TaskResult) and result.success:
                             self.task_graph.update_state(task_node.task_id, TaskState.REVIEW)
-                            # Trigger review
-                            await self._trigger_review(task_node, result)
+                            completed.append((task_node, result))
                         else:
                             self.task_graph.update_state(task_node.task_id, TaskState.BLOCKED)
 
+                    # Review the whole wave at once rather than one round trip per task
+                    await self._trigger_reviews(completed)
+
                 # Check for approved tasks to merge
                 approved = self.task_graph.get_tasks_by_state(TaskState.APPROVED)
                 if approved:
@@ -414,21 +432,38 @@ class OrchestrationEngine:
         else:
             return await agent.execute_task(task_node.data)
 
-    async def _trigger_review(self, task_node: Any, result: TaskResult) -> None:
-        """Trigger a code review for a completed task."""
-        if not result.branch:
+    async def _trigger_reviews(self, completed: list[tuple[Any, TaskResult]]) -> None:
+        """Trigger code reviews for completed tasks.
+
+        Idle reviewers work concurrently, each taking an even share of the
+        tasks in turn, so a wave of N tasks costs about N / reviewers review
+        round trips instead of N.
+        """
+        completed = [(task_node, result) for task_node, result in completed if result.branch]
+        if not completed:
             return
 
-        reviewer_slot = self.scheduler.get_available_agent("reviewer")
-        if reviewer_slot is None:
-            logger.info("No reviewer available, task %s queued for review", task_node.task_id)
+        slots = self.scheduler.get_available_agents("reviewer")
+        if not slots:
+            for task_node, _ in completed:
+                logger.info("No reviewer available, task %s queued for review", task_node.task_id)
             return
 
-        reviewer_slot.busy = True
-        review_result = await reviewer_slot.agent.review_branch(
-            task_node.task_id, result.branch
+        async def lane(reviewer_slot: Any, share: list[tuple[Any, TaskResult]]) -> None:
+            reviewer_slot.busy = True
+            try:
+                for task_node, result in share:
+                    await self._review(reviewer_slot.agent, task_node, result)
+            finally:
+                reviewer_slot.busy = False
+
+        await asyncio.gather(
+            *(lane(slot, completed[i::len(slots)]) for i, slot in enumerate(slots))
         )
-        reviewer_slot.busy = False
+
+    async def _review(self, reviewer: Any, task_node: Any, result: TaskResult) -> None:
+        """Review one task's branch and move it to APPROVED or BLOCKED."""
+        review_result = await reviewer.review_branch(task_node.task_id, result.branch)
 
         if review_result.get("verdict") == "approve":
             self.task_graph.update_state(task_node.task_id, TaskState.APPROVED)
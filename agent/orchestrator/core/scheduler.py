@@ -53,6 +53,13 @@ class Scheduler:
                 return slot
         return None
 
+    def get_available_agents(self, role: str) -> list[AgentSlot]:
+        """Get every idle agent of the given role."""
+        return [
+            slot for slot in self._agents.get(role, [])
+            if not slot.busy and slot.agent.state in (AgentState.IDLE, AgentState.DONE)
+        ]
+
     def get_assignments(self) -> list[tuple[AgentSlot, TaskNode]]:
         """Match ready tasks to available agents.
 
@@ -82,7 +82,8 @@ class TaskGraph:
     def get_ready_tasks(self) -> list[TaskNode]:
         """Get all tasks that are ready to execute (dependencies met).
 
-        Returns tasks sorted by priority (lower = higher priority).
+        Returns tasks sorted by priority (lower = higher priority), ties in
+        the order they were added.
         """
         ready = [n for n in self._nodes.values() if n.state == TaskState.READY]
         return sorted(ready, key=lambda n: n.priority)
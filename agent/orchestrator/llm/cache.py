@@ -0,0 +1,174 @@
+"""Response cache for agent tool-use conversations.
+
+A task prompt that an agent has already answered (a retry, or the same task
+handed to another agent of the same role) is served from the cache instead of
+re-running the agentic loop. Entries are keyed by the ``sha256`` of the model,
+system prompt, messages, tool set and a snapshot of the workspace the tools
+would read.
+
+Only conversations whose tool calls are all read-only are stored: replaying a
+cached conversation does not re-run its tools, so one that wrote files or
+committed would silently skip those side effects.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from orchestrator.comms.atomic import write_bytes_atomic
+
+# Tools that only observe the workspace; a conversation using nothing else
+# can be replayed from the cache without changing what the task achieved.
+READ_ONLY_TOOLS = frozenset({
+    "read_file",
+    "list_files",
+    "search_code",
+    "read_spec",
+    "git_diff",
+    "validate_architecture",
+    "estimate_flops",
+})
+
+
+class CacheBackend(Protocol):
+    """Key-value store for cached conversations."""
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, ttl_secs: float | None) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process backend; entries expire after their TTL."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float, Any]] = {}
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires and time.time() >= expires:
+            del self._entries[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ttl_secs: float | None) -> None:
+        self._entries[key] = (time.time() + ttl_secs if ttl_secs else 0.0, value)
+
+
+class FileCacheBackend:
+    """One JSON file per key under ``directory``; survives restarts.
+
+    File I/O runs in a worker thread so a slow disk does not stall the
+    event loop the agents share.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        if not self.directory.is_dir():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # The directory usually sits in the git workspace; keep entries out
+            # of the agents' ``add -A`` commits.
+            (self.directory / ".gitignore").write_text("*\n", encoding="utf-8")
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._get, self.directory / f"{key}.json")
+
+    async def set(self, key: str, value: Any, ttl_secs: float | None) -> None:
+        entry = {"expires": time.time() + ttl_secs if ttl_secs else 0.0, "value": value}
+        data = json.dumps(entry).encode("utf-8")
+        await asyncio.to_thread(write_bytes_atomic, self.directory / f"{key}.json", data)
+
+    @staticmethod
+    def _get(path: Path) -> Any | None:
+        try:
+            entry = json.loads(path.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry["expires"] and time.time() >= entry["expires"]:
+            path.unlink(missing_ok=True)
+            return None
+        return entry["value"]
+
+
+def cache_key(
+    model: str,
+    system: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]],
+    workspace: str,
+) -> str:
+    """Exact-match key over everything that determines the model's answer.
+
+    ``workspace`` identifies the repository state the tools would observe
+    (see ``GitWorkspace.snapshot_id``): the same review request against a
+    branch that has since moved must not replay the old verdict.
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "system": system,
+            "messages": messages,
+            "tools": tools,
+            "workspace": workspace,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_replayable(messages: list[dict[str, Any]]) -> bool:
+    """True if every tool call in the conversation is in :data:`READ_ONLY_TOOLS`."""
+    return all(
+        tc.get("function", {}).get("name") in READ_ONLY_TOOLS
+        for msg in messages
+        if msg.get("role") == "assistant"
+        for tc in msg.get("tool_calls", ())
+    )
+
+
+@dataclass
+class CacheHit:
+    """A cached conversation and the tokens its original run consumed."""
+
+    messages: list[dict[str, Any]]
+    tokens: int
+
+
+class LLMCache:
+    """Exact-match cache of tool-use conversations."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl_secs: float | None = 24 * 3600,
+    ):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl_secs = ttl_secs
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> CacheHit | None:
+        """Look ``key`` up."""
+        entry = await self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CacheHit(entry["messages"], entry["tokens"])
+
+    async def set(self, key: str, messages: list[dict[str, Any]], tokens: int = 0) -> bool:
+        """Store a finished conversation; returns False if it is not replayable."""
+        if not is_replayable(messages):
+            return False
+        await self.backend.set(key, {"messages": messages, "tokens": tokens}, self.ttl_secs)
+        return True
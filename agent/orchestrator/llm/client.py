@@ -6,6 +6,7 @@ Uses LiteLLM for multi-provider support (Anthropic, OpenAI, Ollama, Gemini, etc.
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
 import time
@@ -14,17 +15,94 @@ from typing import Any
 
 import litellm
 
+from orchestrator.llm.cache import READ_ONLY_TOOLS
 from orchestrator.llm.response import LLMResponse, ToolCall
 
 logger = logging.getLogger(__name__)
 
 
+# Retries after a 429, waiting 30s, 60s, 120s; the wait applies to every
+# caller of that model, not just the one that was refused.
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_BACKOFF_SECS = 30.0
+
+# Anthropic-style cache breakpoint: the prompt prefix up to and including the
+# marked block is reused by the provider on later calls.
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+def cached_prompt_tokens(usage) -> int:
+    """Prompt tokens served from the provider's prompt cache, if reported."""
+    cached = getattr(usage, "cache_read_input_tokens", None)
+    if cached is None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+    return cached if isinstance(cached, int) else 0
+
+
+def supports_cache_control(model: str) -> bool:
+    """Whether ``model`` takes explicit ``cache_control`` breakpoints.
+
+    Anthropic models need them; OpenAI-style providers cache prefixes
+    automatically and reject the extra fields on some endpoints.
+    """
+    provider = model.split("/")[0] if "/" in model else ""
+    return provider in ("anthropic", "bedrock", "vertex_ai") and "claude" in model
+
+
+def with_cache_breakpoints(
+    system: str, tools: list[dict[str, Any]] | None
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+    """Mark the system prompt and the last tool as cacheable prefix ends."""
+    system_blocks = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+    if tools:
+        tools = [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL}]
+    return system_blocks, tools
+
+
+def with_cached_prefix(prefix: str, text: str) -> list[dict[str, Any]]:
+    """User-message content whose static ``prefix`` ends a cacheable block."""
+    return [
+        {"type": "text", "text": prefix, "cache_control": _EPHEMERAL},
+        {"type": "text", "text": text},
+    ]
+
+
+async def run_tool_calls(tool_executor: Any, tool_calls: list[ToolCall]) -> list[Any]:
+    """Execute one response's tool calls and return their results in call order.
+
+    A run of consecutive read-only calls is submitted at once and collected
+    together; any other call runs alone, after every call before it. If a
+    call in a run raises, the rest of the run is cancelled and the error
+    propagates, as it would have sequentially.
+    """
+    results: list[Any] = []
+    for read_only, group in itertools.groupby(
+        tool_calls, key=lambda tc: tc.name in READ_ONLY_TOOLS
+    ):
+        group = list(group)
+        if not read_only or len(group) == 1:
+            for tc in group:
+                results.append(await tool_executor(tc.name, tc.arguments))
+            continue
+
+        pending = [asyncio.create_task(tool_executor(tc.name, tc.arguments)) for tc in group]
+        done, unfinished = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+        if unfinished:
+            for task in unfinished:
+                task.cancel()
+            raise next(t.exception() for t in done if t.exception() is not None)
+        results.extend(task.result() for task in pending)
+    return results
+
+
 @dataclass
 class TokenUsage:
     """Tracks token usage and estimated cost for an agent."""
 
     input_tokens: int = 0
     output_tokens: int = 0
+    cached_input_tokens: int = 0
     total_cost_usd: float = 0.0
 
     @property
@@ -40,6 +118,7 @@ class TokenUsage:
         """
         self.input_tokens += getattr(usage, "prompt_tokens", 0) or 0
         self.output_tokens += getattr(usage, "completion_tokens", 0) or 0
+        self.cached_input_tokens += cached_prompt_tokens(usage)
         if response is not None:
             try:
                 cost = litellm.completion_cost(completion_response=response)
@@ -112,31 +191,73 @@ class LLMClient:
         self.provider_config = provider_config or ProviderConfig()
         self.cost_tracker = cost_tracker or CostTracker()
         self._semaphore = asyncio.Semaphore(10)
-        self._last_call_time = 0.0
         self._min_interval = 0.1
+        # Per model: monotonic time before which its next call may not start.
+        self._next_slot: dict[str, float] = {}
+
+    async def _pace(self, model: str) -> None:
+        """Wait for ``model``'s next call slot, at least ``_min_interval`` apart.
+
+        The slot is claimed before sleeping, so concurrent callers queue up
+        behind each other instead of all waking at once.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(model, 0.0))
+        self._next_slot[model] = slot + self._min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _complete(self, agent_id: str, model: str, kwargs: dict[str, Any]) -> Any:
+        """``litellm.acompletion`` with rate-limit backoff and the Ollama JSON retry."""
+        attempt = 0
+        while True:
+            await self._pace(model)
+            try:
+                return await litellm.acompletion(**kwargs)
+            except litellm.RateLimitError:
+                if attempt == _RATE_LIMIT_RETRIES:
+                    raise
+                backoff = _RATE_LIMIT_BACKOFF_SECS * 2**attempt
+                logger.warning(
+                    "Rate limited, retrying in %.0fs for agent %s", backoff, agent_id
+                )
+                self._next_slot[model] = max(
+                    self._next_slot.get(model, 0.0), time.monotonic() + backoff
+                )
+                attempt += 1
+            except (litellm.APIConnectionError, json.JSONDecodeError) as e:
+                if "ollama" in model.lower():
+                    logger.warning("Ollama JSON error, retrying with format=json: %s", e)
+                    kwargs["format"] = "json"
+                    return await litellm.acompletion(**kwargs)
+                raise
 
     async def send_message(
         self,
         agent_id: str,
-        system: str,
+        system: str | list[dict[str, Any]],
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None = None,
         temperature: float = 0.0,
         model_override: str | None = None,
+        prompt_caching: bool = False,
     ) -> LLMResponse:
-        """Send a message to an LLM and return a provider-agnostic response."""
+        """Send a message to an LLM and return a provider-agnostic response.
+
+        With ``prompt_caching`` the system prompt and tool list (stable for an
+        agent) are marked as a cacheable prefix on providers that need
+        explicit breakpoints, so repeat calls skip their prefill. ``system``
+        may also be content blocks already built by :func:`with_cache_breakpoints`.
+        """
         self.cost_tracker.check_budget()
 
         model = model_override or self.model
 
         async with self._semaphore:
-            now = time.monotonic()
-            elapsed = now - self._last_call_time
-            if elapsed < self._min_interval:
-                await asyncio.sleep(self._min_interval - elapsed)
-            self._last_call_time = time.monotonic()
-
-            full_messages = [{"role": "system", "content": system}] + messages
+            system_content = system
+            if prompt_caching and isinstance(system, str) and supports_cache_control(model):
+                system_content, tools = with_cache_breakpoints(system, tools)
+            full_messages = [{"role": "system", "content": system_content}] + messages
 
             kwargs: dict[str, Any] = {
                 "model": model,
@@ -155,28 +276,17 @@ class LLMClient:
             if base_url:
                 kwargs["api_base"] = base_url
 
-            try:
-                response = await litellm.acompletion(**kwargs)
-            except litellm.RateLimitError:
-                logger.warning("Rate limited, retrying in 30s for agent %s", agent_id)
-                await asyncio.sleep(30)
-                response = await litellm.acompletion(**kwargs)
-            except (litellm.APIConnectionError, json.JSONDecodeError) as e:
-                if "ollama" in model.lower():
-                    logger.warning("Ollama JSON error, retrying with format=json: %s", e)
-                    kwargs["format"] = "json"
-                    response = await litellm.acompletion(**kwargs)
-                else:
-                    raise
+            response = await self._complete(agent_id, model, kwargs)
 
             usage_tracker = self.cost_tracker.get_agent_usage(agent_id)
             if response.usage:
                 usage_tracker.add(response.usage, response=response)
 
             logger.debug(
-                "Agent %s: %d input, %d output tokens (total cost: $%.4f)",
+                "Agent %s: %d input (%d cached), %d output tokens (total cost: $%.4f)",
                 agent_id,
                 getattr(response.usage, "prompt_tokens", 0) or 0,
+                cached_prompt_tokens(response.usage),
                 getattr(response.usage, "completion_tokens", 0) or 0,
                 self.cost_tracker.total_cost_usd,
             )
@@ -193,9 +303,13 @@ class LLMClient:
         max_turns: int = 20,
         temperature: float = 0.0,
         model_override: str | None = None,
+        prompt_caching: bool = False,
     ) -> list[dict[str, Any]]:
         """Run an agentic tool-use loop until the model stops calling tools."""
         messages = list(messages)
+        # The prefix is the same every turn: mark it once, not per request.
+        if prompt_caching and supports_cache_control(model_override or self.model):
+            system, tools = with_cache_breakpoints(system, tools)
 
         for turn in range(max_turns):
             response = await self.send_message(
@@ -205,6 +319,7 @@ class LLMClient:
                 tools=tools,
                 temperature=temperature,
                 model_override=model_override,
+                prompt_caching=prompt_caching,
             )
 
             assistant_msg: dict[str, Any] = {"role": "assistant", "content": response.text}
@@ -213,7 +328,10 @@ class LLMClient:
                     {
                         "id": tc.id,
                         "type": "function",
-                        "function": {"name": tc.name, "arguments": json.dumps(tc.arguments)},
+                        "function": {
+                            "name": tc.name,
+                            "arguments": tc.raw_arguments or json.dumps(tc.arguments),
+                        },
                     }
                     for tc in response.tool_calls
                 ]
@@ -222,8 +340,8 @@ class LLMClient:
             if not response.tool_calls:
                 break
 
-            for tc in response.tool_calls:
-                result = await tool_executor(tc.name, tc.arguments)
+            results = await run_tool_calls(tool_executor, response.tool_calls)
+            for tc, result in zip(response.tool_calls, results):
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tc.id,
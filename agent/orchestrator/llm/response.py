@@ -6,6 +6,14 @@ import json
 from dataclasses import dataclass, field
 from typing import Any
 
+try:  # optional: C parser for the per-turn tool-call arguments
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch one type.
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 @dataclass
 class ToolCall:
@@ -14,6 +22,9 @@ class ToolCall:
     id: str
     name: str
     arguments: dict[str, Any]
+    # The provider's JSON for ``arguments``, echoed back verbatim in the
+    # next request instead of re-serializing; "" if it did not parse.
+    raw_arguments: str = field(default="", compare=False, repr=False)
 
 
 @dataclass
@@ -37,14 +48,16 @@ class LLMResponse:
         tool_calls = []
         if message.tool_calls:
             for tc in message.tool_calls:
+                raw = tc.function.arguments
                 try:
-                    args = json.loads(tc.function.arguments)
+                    args = _loads(raw)
                 except (json.JSONDecodeError, TypeError):
-                    args = {}
+                    args, raw = {}, ""
                 tool_calls.append(ToolCall(
                     id=tc.id,
                     name=tc.function.name,
                     arguments=args,
+                    raw_arguments=raw,
                 ))
 
         return cls(
@@ -28,8 +28,8 @@ class TestToolExecutorCreation:
     def test_initial_files_written_empty(self, executor):
         assert executor.files_written == []
 
-    def test_internal_list_empty(self, executor):
-        assert executor._file_writes == []
+    def test_internal_store_empty(self, executor):
+        assert executor._file_writes == {}
 
 
 class TestTrackWrite:
@@ -1,5 +1,7 @@
 """Tests for ArchitectAgent."""
 
+import asyncio
+
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -103,3 +105,70 @@ class TestArchitectSystemPrompt:
         }
         agent = ArchitectAgent(**deps)
         assert "x86_64" in agent.system_prompt
+
+
+class TestArchitectTaskTemplates:
+    def test_design_task_is_memoized(self):
+        from orchestrator.agents.architect_agent import _build_design_task
+
+        task = _build_design_task("mm")
+        assert task is _build_design_task("mm")
+        assert task["task_id"] == "arch-mm"
+        assert "Design the interface for the mm kernel subsystem." in task["description"]
+        assert task["acceptance_criteria"][0] == "Header file(s) for mm written to kernel/include/"
+        with pytest.raises(TypeError):
+            task["subsystem"] = "sched"
+
+    def test_review_task_lists_subsystems(self):
+        from orchestrator.agents.architect_agent import _build_review_task
+
+        task = _build_review_task(("mm", "sched"))
+        assert task is _build_review_task(("mm", "sched"))
+        assert task["title"] == "Review integration of mm, sched"
+        assert task["subsystem"] == "cross-cutting"
+
+
+class TestArchitectDesignSubsystems:
+    async def test_each_design_gets_its_own_artifacts_and_branch(self, mock_deps, tmp_path):
+        from unittest.mock import AsyncMock
+
+        from orchestrator.comms.git_workspace import GitWorkspace
+
+        workspace = GitWorkspace(tmp_path / "repo")
+        workspace.init()
+        architect = ArchitectAgent(**{**mock_deps, "workspace": workspace})
+
+        async def run_tools(**kwargs):
+            subsystem = kwargs["messages"][0]["content"].split("Design the interface for the ")[1]
+            subsystem = subsystem.split(" ", 1)[0]
+            header = f"kernel/include/{subsystem}.h"
+            execute = kwargs["tool_executor"]
+            await asyncio.sleep(0)  # a model turn
+            await execute("write_file", {"path": header, "content": f"/* {subsystem} */\n"})
+            await asyncio.sleep(0)
+            await execute("git_commit", {"message": f"{subsystem}: interface"})
+            return [*kwargs["messages"], {"role": "assistant", "content": "done"}]
+
+        architect.client.send_with_tools = AsyncMock(side_effect=run_tools)
+        designs = await architect.design_subsystems(["boot", "mm", "sched"])
+
+        for subsystem, design in designs.items():
+            assert design["result"].artifacts == [f"kernel/include/{subsystem}.h"]
+            files = workspace.repo.git.ls_tree("-r", "--name-only", design["branch"]).split()
+            headers = sorted(f for f in files if f.startswith("kernel/include/"))
+            assert headers == [f"kernel/include/{subsystem}.h"]
+        assert workspace.current_branch() == workspace._get_main_branch()
+
+    async def test_failed_design_does_not_stop_the_rest(self, architect):
+        async def fake_design(subsystem):
+            if subsystem == "net":
+                raise RuntimeError("boom")
+            return {"subsystem": subsystem}
+
+        architect.design_subsystem = fake_design
+        results = await architect.design_subsystems(["mm", "net", "fs"])
+
+        assert list(results) == ["mm", "net", "fs"]
+        assert results["fs"] == {"subsystem": "fs"}
+        assert isinstance(results["net"], RuntimeError)
+        assert architect.workspace.checkout_main.call_count == 3
@@ -1,12 +1,20 @@
 """Tests for base agent."""
 
-import json
+import asyncio
+import os
 
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
-
-from orchestrator.agents.base_agent import Agent, AgentRole, AgentState, TaskResult
+from unittest.mock import MagicMock, patch
+
+from orchestrator.agents.base_agent import (
+    Agent,
+    AgentRole,
+    AgentState,
+    TaskResult,
+    _copy_file,
+    _exec_argv,
+)
 from orchestrator.arch_registry import get_arch_profile
 
 
@@ -173,7 +181,13 @@ class TestAgentCreation:
         assert base_agent.state == AgentState.IDLE
 
     def test_conversation_starts_empty(self, base_agent):
-        assert base_agent._conversation == []
+        assert base_agent.conversation == []
+
+    def test_conversation_stored_compressed(self, base_agent):
+        messages = [{"role": "tool", "content": "make: Nothing to be done.\n" * 500}]
+        base_agent.conversation = messages
+        assert base_agent.conversation == messages
+        assert len(base_agent._conversation_blob) < len(messages[0]["content"]) // 10
 
     def test_client_assigned(self, base_agent):
         assert base_agent.client is not None
@@ -291,6 +305,47 @@ class TestFormatTaskPrompt:
         assert "- Tests pass" in result
         assert "Use 4K pages." in result
 
+    def test_exact_layout(self, base_agent):
+        task = {
+            "title": "T",
+            "subsystem": "mm",
+            "dependencies": ["boot-001", "hal-001"],
+            "acceptance_criteria": ["A", "B"],
+            "description": "",
+        }
+        assert base_agent._format_task_prompt(task) == (
+            "## Task: T\n"
+            "\n**Subsystem**: mm\n"
+            "**Dependencies**: boot-001, hal-001\n"
+            "\n**Acceptance Criteria**:\n- A\n- B\n"
+            "\nExecute this task using the tools available to you. "
+            "Build and test your code. Commit when everything passes."
+        )
+
+
+class TestTaskContent:
+    def test_without_instructions_is_the_prompt(self, base_agent):
+        assert base_agent._task_content({"title": "T"}, "prompt") == "prompt"
+
+    def test_instructions_lead_a_cacheable_block(self, base_agent):
+        base_agent.model_override = "anthropic/claude-sonnet-4"
+        content = base_agent._task_content({"instructions": "## Instructions"}, "prompt")
+        assert content == [
+            {"type": "text", "text": "## Instructions", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "prompt"},
+        ]
+
+    def test_instructions_prepended_without_breakpoints(self, base_agent):
+        base_agent.model_override = "openai/gpt-4o"
+        content = base_agent._task_content({"instructions": "## Instructions"}, "prompt")
+        assert content == "## Instructions\n\nprompt"
+
+    def test_prompt_caching_off(self, base_agent):
+        base_agent.model_override = "anthropic/claude-sonnet-4"
+        base_agent.prompt_caching = False
+        content = base_agent._task_content({"instructions": "## Instructions"}, "prompt")
+        assert content == "## Instructions\n\nprompt"
+
 
 # ---------------------------------------------------------------------------
 # _extract_final_text
@@ -334,131 +389,216 @@ class TestExtractFinalText:
 
 
 # ---------------------------------------------------------------------------
-# _extract_artifacts
+# Messaging
 # ---------------------------------------------------------------------------
 
-class TestExtractArtifacts:
-    def test_no_tool_calls(self, base_agent):
-        messages = [{"role": "assistant", "content": "done"}]
-        assert base_agent._extract_artifacts(messages) == []
+class TestInbox:
+    @pytest.fixture
+    def agents(self, mock_deps, tmp_path):
+        from orchestrator.comms.message_bus import MessageBus
 
-    def test_single_write_file(self, base_agent):
-        messages = [
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "kernel/boot.c", "content": "..."}),
-                        }
-                    }
-                ],
-            }
-        ]
-        artifacts = base_agent._extract_artifacts(messages)
-        assert artifacts == ["kernel/boot.c"]
+        mock_deps["message_bus"] = MessageBus(tmp_path)
+        sender = Agent(role=AgentRole.DEVELOPER, system_prompt="", tools=[], **mock_deps)
+        mock_deps["agent_id"] = "reviewer-01"
+        receiver = Agent(role=AgentRole.REVIEWER, system_prompt="", tools=[], **mock_deps)
+        return sender, receiver
 
-    def test_multiple_write_files(self, base_agent):
-        messages = [
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "a.c", "content": ""}),
-                        }
-                    },
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "b.c", "content": ""}),
-                        }
-                    },
-                ],
-            }
-        ]
-        artifacts = base_agent._extract_artifacts(messages)
-        assert artifacts == ["a.c", "b.c"]
+    async def test_check_messages_drains_inbox(self, agents):
+        from orchestrator.comms.message_bus import MessageType
 
-    def test_ignores_non_write_tools(self, base_agent):
-        messages = [
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "read_file",
-                            "arguments": json.dumps({"path": "foo.c"}),
-                        }
-                    }
-                ],
-            }
-        ]
-        assert base_agent._extract_artifacts(messages) == []
+        sender, receiver = agents
+        assert await receiver.check_messages() == []
+        await sender.send_message("reviewer-01", MessageType.REVIEW_REQUEST, {"n": 1})
+        await sender.send_message("reviewer-01", MessageType.REVIEW_REQUEST, {"n": 2})
 
-    def test_handles_invalid_json(self, base_agent):
-        messages = [
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": "not json",
-                        }
-                    }
-                ],
-            }
-        ]
-        # Should not crash; returns empty because no path extracted
-        assert base_agent._extract_artifacts(messages) == []
+        messages = await receiver.check_messages()
+        assert [m.payload["n"] for m in messages] == [1, 2]
+        assert await receiver.check_messages() == []
 
-    def test_ignores_user_messages(self, base_agent):
-        messages = [
-            {
-                "role": "user",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "x.c", "content": ""}),
-                        }
-                    }
-                ],
-            }
-        ]
-        assert base_agent._extract_artifacts(messages) == []
+    async def test_messages_sent_before_subscribing_are_delivered(self, mock_deps, tmp_path):
+        from orchestrator.comms.message_bus import Message, MessageBus, MessageType
 
-    def test_across_multiple_messages(self, base_agent):
-        messages = [
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "first.c", "content": ""}),
-                        }
-                    },
-                ],
-            },
-            {"role": "user", "content": "ok"},
-            {
-                "role": "assistant",
-                "tool_calls": [
-                    {
-                        "function": {
-                            "name": "write_file",
-                            "arguments": json.dumps({"path": "second.c", "content": ""}),
-                        }
-                    },
-                ],
-            },
-        ]
-        artifacts = base_agent._extract_artifacts(messages)
-        assert artifacts == ["first.c", "second.c"]
+        bus = MessageBus(tmp_path)
+        for n in range(2):
+            bus.send(Message(MessageType.STATUS_UPDATE, "manager", "reviewer-01", {"n": n}))
+        mock_deps.update(message_bus=bus, agent_id="reviewer-01")
+        receiver = Agent(role=AgentRole.REVIEWER, system_prompt="", tools=[], **mock_deps)
+        bus.send(Message(MessageType.STATUS_UPDATE, "manager", "reviewer-01", {"n": 2}))
+
+        messages = await receiver.check_messages()
+        assert sorted(m.payload["n"] for m in messages) == [0, 1, 2]
+        assert messages[-1].payload["n"] == 2
+
+    async def test_wait_for_message_wakes_on_send(self, agents):
+        from orchestrator.comms.message_bus import MessageType
+
+        sender, receiver = agents
+        waiter = asyncio.create_task(receiver.wait_for_message(timeout=5))
+        await asyncio.sleep(0)
+        await sender.send_message("reviewer-01", MessageType.STATUS_UPDATE, {"ok": True})
+        message = await waiter
+        assert message.payload == {"ok": True}
+
+    async def test_wait_for_message_timeout(self, agents):
+        _, receiver = agents
+        assert await receiver.wait_for_message(timeout=0.01) is None
+
+    async def test_full_inbox_drops_push_but_keeps_file(self, agents):
+        from orchestrator.comms.message_bus import MessageType
+
+        sender, receiver = agents
+        receiver._inbox = asyncio.Queue(maxsize=1)
+        for n in range(2):
+            await sender.send_message("reviewer-01", MessageType.STATUS_UPDATE, {"n": n})
+
+        assert len(await receiver.check_messages()) == 1
+        assert len(receiver.message_bus.receive("reviewer-01")) == 2
+
+
+# ---------------------------------------------------------------------------
+# Tool dispatch
+# ---------------------------------------------------------------------------
+
+class TestToolDispatch:
+    def test_every_defined_tool_has_a_handler(self, base_agent):
+        from orchestrator.llm import tools
+
+        defined = {
+            value["function"]["name"]
+            for name, value in vars(tools).items()
+            if name.startswith("TOOL_")
+        }
+        assert defined == set(base_agent._tool_dispatch)
+
+    async def test_unknown_tool(self, base_agent):
+        assert await base_agent._execute_tool("nope", {}) == "Unknown tool: nope"
+
+    async def test_missing_argument_reported(self, base_agent):
+        result = await base_agent._execute_tool("read_spec", {})
+        assert result == "Error executing read_spec: 'subsystem'"
+
+    async def test_subclass_can_add_tool(self, mock_deps):
+        class Extended(Agent):
+            def _tool_handlers(self):
+                async def ping(tool_input):
+                    return "pong"
+
+                return {**super()._tool_handlers(), "ping": ping}
+
+        agent = Extended(role=AgentRole.TESTER, system_prompt="", tools=[], **mock_deps)
+        assert await agent._execute_tool("ping", {}) == "pong"
+
+
+class TestFileTools:
+    async def test_file_io_runs_off_the_event_loop_thread(self, base_agent):
+        import threading
+
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            return "int x;"
+
+        base_agent.workspace.read_file.side_effect = record
+        base_agent.workspace.write_file.side_effect = record
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "int x;"
+        await base_agent._execute_tool("write_file", {"path": "b.c", "content": ""})
+        assert len(threads) == 2 and loop_thread not in threads
+
+
+class TestActionCache:
+    @pytest.fixture(autouse=True)
+    def generation(self, base_agent):
+        """Give the mock workspace GitWorkspace's change counter."""
+        ws = base_agent.workspace
+        ws.generation = 0
+
+        def bump():
+            ws.generation += 1
+
+        ws.mark_changed.side_effect = bump
+
+    async def test_repeated_read_served_from_cache(self, base_agent):
+        base_agent.workspace.read_file.return_value = "int x;"
+        for _ in range(3):
+            assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "int x;"
+        base_agent.workspace.read_file.assert_called_once_with("a.c")
+
+    async def test_key_is_canonical_input(self, base_agent):
+        base_agent.workspace.list_files.return_value = ["a.c"]
+        await base_agent._execute_tool("list_files", {"path": "k", "recursive": True})
+        await base_agent._execute_tool("list_files", {"recursive": True, "path": "k"})
+        await base_agent._execute_tool("list_files", {"path": "k"})
+        assert base_agent.workspace.list_files.call_count == 2
+
+    async def test_write_invalidates(self, base_agent):
+        base_agent.workspace.read_file.side_effect = ["old", "new"]
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "old"
+        await base_agent._execute_tool("write_file", {"path": "a.c", "content": "new"})
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "new"
+
+    async def test_git_diff_cached_until_commit(self, base_agent):
+        base_agent.workspace.diff.side_effect = ["+int x;", "No changes."]
+        base_agent.workspace.commit.return_value = "0" * 40
+        assert await base_agent._execute_tool("git_diff", {}) == "+int x;"
+        assert await base_agent._execute_tool("git_diff", {}) == "+int x;"
+        await base_agent._execute_tool("git_commit", {"message": "mm: slab"})
+        assert await base_agent._execute_tool("git_diff", {}) == "No changes."
+
+    async def test_another_agents_write_invalidates(self, base_agent):
+        base_agent.workspace.read_file.side_effect = ["old", "new"]
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "old"
+        base_agent.workspace.mark_changed()  # e.g. a second developer's write_file
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "new"
+
+    async def test_errors_not_cached(self, base_agent):
+        base_agent.workspace.read_file.side_effect = [FileNotFoundError("a.c"), "ok"]
+        assert (await base_agent._execute_tool("read_file", {"path": "a.c"})).startswith("Error")
+        assert await base_agent._execute_tool("read_file", {"path": "a.c"}) == "ok"
+
+
+# ---------------------------------------------------------------------------
+# Artifact tracking
+# ---------------------------------------------------------------------------
+
+class TestArtifacts:
+    async def test_write_file_records_path(self, base_agent):
+        await base_agent._execute_tool("write_file", {"path": "kernel/boot.c", "content": ".."})
+        assert list(base_agent._artifacts) == ["kernel/boot.c"]
+
+    async def test_writes_recorded_once_in_first_write_order(self, base_agent):
+        for path in ("first.c", "second.c", "first.c"):
+            await base_agent._execute_tool("write_file", {"path": path, "content": ""})
+        assert list(base_agent._artifacts) == ["first.c", "second.c"]
+
+    async def test_unchanged_write_reported_not_recorded(self, base_agent):
+        base_agent.workspace.write_file.return_value = False
+        result = await base_agent._execute_tool("write_file", {"path": "a.c", "content": "x"})
+        assert result == "Unchanged: a.c already has this content"
+        assert not base_agent._artifacts
+
+    async def test_ignores_non_write_tools(self, base_agent):
+        await base_agent._execute_tool("read_file", {"path": "foo.c"})
+        assert not base_agent._artifacts
+
+    async def test_failed_write_not_recorded(self, base_agent):
+        base_agent.workspace.write_file.side_effect = OSError("read-only")
+        result = await base_agent._execute_tool("write_file", {"path": "x.c", "content": ""})
+        assert result.startswith("Error executing write_file")
+        assert not base_agent._artifacts
+
+    async def test_task_result_artifacts_reset_per_task(self, base_agent):
+        from unittest.mock import AsyncMock
+
+        async def run_tools(**kwargs):
+            await kwargs["tool_executor"]("write_file", {"path": "mm/page.c", "content": ""})
+            return [*kwargs["messages"], {"role": "assistant", "content": "done"}]
+
+        base_agent.client.send_with_tools = AsyncMock(side_effect=run_tools)
+        first = await base_agent.execute_task({"task_id": "t1"})
+        second = await base_agent.execute_task({"task_id": "t2"})
+        assert first.artifacts == second.artifacts == ["mm/page.c"]
 
 
 # ---------------------------------------------------------------------------
@@ -466,50 +606,299 @@ class TestExtractArtifacts:
 # ---------------------------------------------------------------------------
 
 class TestReadSpec:
-    def test_subsystem_spec(self, base_agent, tmp_path):
+    async def test_subsystem_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
         sub_dir = tmp_path / "subsystems"
         sub_dir.mkdir()
         spec_file = sub_dir / "mm.md"
         spec_file.write_text("# Memory Manager Spec", encoding="utf-8")
 
-        assert base_agent._read_spec("mm") == "# Memory Manager Spec"
+        assert await base_agent._read_spec("mm") == "# Memory Manager Spec"
 
-    def test_architecture_spec(self, base_agent, tmp_path):
+    async def test_architecture_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
         spec_file = tmp_path / "architecture.md"
         spec_file.write_text("# Architecture", encoding="utf-8")
 
-        assert base_agent._read_spec("architecture") == "# Architecture"
+        assert await base_agent._read_spec("architecture") == "# Architecture"
 
-    def test_hal_spec(self, base_agent, tmp_path):
+    async def test_hal_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
         arch_dir = tmp_path / "arch"
         arch_dir.mkdir()
         spec_file = arch_dir / "hal.md"
         spec_file.write_text("# HAL Spec", encoding="utf-8")
 
-        assert base_agent._read_spec("hal") == "# HAL Spec"
+        assert await base_agent._read_spec("hal") == "# HAL Spec"
 
-    def test_arch_specific_spec(self, base_agent, tmp_path):
+    async def test_arch_specific_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
         arch_dir = tmp_path / "arch"
         arch_dir.mkdir()
         spec_file = arch_dir / "x86_64.md"
         spec_file.write_text("# x86_64 Spec", encoding="utf-8")
 
-        assert base_agent._read_spec("arch/x86_64") == "# x86_64 Spec"
+        assert await base_agent._read_spec("arch/x86_64") == "# x86_64 Spec"
 
-    def test_missing_spec(self, base_agent, tmp_path):
+    async def test_missing_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
-        result = base_agent._read_spec("nonexistent")
+        result = await base_agent._read_spec("nonexistent")
         assert "Specification not found" in result
 
-    def test_arch_riscv64_spec(self, base_agent, tmp_path):
+    async def test_arch_riscv64_spec(self, base_agent, tmp_path):
         base_agent.kernel_spec_path = tmp_path
         arch_dir = tmp_path / "arch"
         arch_dir.mkdir()
         spec_file = arch_dir / "riscv64.md"
         spec_file.write_text("# RISC-V 64", encoding="utf-8")
 
-        assert base_agent._read_spec("arch/riscv64") == "# RISC-V 64"
+        assert await base_agent._read_spec("arch/riscv64") == "# RISC-V 64"
+
+    async def test_cached_until_modified(self, base_agent, tmp_path):
+        base_agent.kernel_spec_path = tmp_path
+        (tmp_path / "subsystems").mkdir()
+        spec_file = tmp_path / "subsystems" / "sched.md"
+        spec_file.write_text("# v1", encoding="utf-8")
+        assert await base_agent._read_spec("sched") == "# v1"
+
+        with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+            assert await base_agent._read_spec("sched") == "# v1"
+
+        spec_file.write_text("# version 2", encoding="utf-8")
+        assert await base_agent._read_spec("sched") == "# version 2"
+
+
+# ---------------------------------------------------------------------------
+# _run_shell
+# ---------------------------------------------------------------------------
+
+class TestRunShell:
+    @pytest.fixture
+    def shell_agent(self, base_agent, tmp_path):
+        base_agent.workspace.path = tmp_path
+        return base_agent
+
+    def test_exec_argv(self):
+        assert _exec_argv("make -C '/a b' test-boot") == ["make", "-C", "/a b", "test-boot"]
+        assert _exec_argv("make 2>&1 | tail") is None
+        assert _exec_argv("CC=clang make") is None
+
+    async def test_direct_exec(self, shell_agent):
+        assert await shell_agent._run_shell("echo hi") == "hi\n[exit code: 0]"
+
+    async def test_shell_syntax_and_stderr(self, shell_agent):
+        result = await shell_agent._run_shell("echo out; echo err >&2; exit 3")
+        assert result == "out\n[stderr]\nerr\n[exit code: 3]"
+
+    async def test_argv_list_never_uses_shell(self, shell_agent):
+        result = await shell_agent._run_shell(["echo", "CC=cc $HOME; x"])
+        assert result == "CC=cc $HOME; x\n[exit code: 0]"
+
+    async def test_builtin_falls_back_to_shell(self, shell_agent):
+        assert await shell_agent._run_shell("cd .") == "\n[exit code: 0]"
+
+    async def test_output_keeps_tail(self, shell_agent):
+        with patch("orchestrator.agents.base_agent._OUTPUT_TAIL_LINES", 3):
+            result = await shell_agent._run_shell("seq 1 10")
+        assert result == "[... 7 earlier lines truncated ...]\n8\n9\n10\n[exit code: 0]"
+
+    async def test_timeout(self, shell_agent):
+        result = await shell_agent._run_shell("sleep 5", timeout=0.1)
+        assert result == "Command timed out after 0.1s: sleep 5"
+
+    async def test_timeout_kills_whole_process_group(self, shell_agent, tmp_path):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await shell_agent._run_shell("sleep 30 & echo $! > child.pid; wait", timeout=0.2)
+        assert loop.time() - start < 5
+        child = int((tmp_path / "child.pid").read_text())
+        for _ in range(50):
+            try:
+                with open(f"/proc/{child}/stat") as f:
+                    if f.read().rsplit(")", 1)[1].split()[0] == "Z":
+                        break
+            except FileNotFoundError:
+                break
+            await asyncio.sleep(0.02)
+        else:
+            pytest.fail("background child outlived the timeout")
+
+    async def test_timeout_lets_group_clean_up_on_sigterm(self, shell_agent, tmp_path):
+        await shell_agent._run_shell(
+            "trap 'echo cleaned > done; exit 0' TERM; sleep 30 & wait", timeout=0.2
+        )
+        assert (tmp_path / "done").read_text() == "cleaned\n"
+
+    async def test_timeout_escalates_to_sigkill(self, shell_agent):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with patch("orchestrator.agents.base_agent._KILL_GRACE_SECS", 0.2):
+            result = await shell_agent._run_shell("trap '' TERM; sleep 30", timeout=0.2)
+        assert result.startswith("Command timed out after 0.2s")
+        assert loop.time() - start < 5
+
+    async def test_tail_kb_logs_full_output(self, shell_agent, tmp_path):
+        result = await shell_agent._run_shell("seq 1 5000", tail_kb=1)
+
+        body, log_line = result.rsplit("\n", 1)
+        log_path = Path(log_line.removeprefix("[full log: ").removesuffix("]"))
+        assert log_path.parent == tmp_path / ".auton" / "logs"
+        assert (log_path.parent / ".gitignore").read_text() == "*\n"
+        assert log_path.read_text().splitlines()[1:] == [str(n) for n in range(1, 5001)]
+
+        tail = body.removesuffix("\n[exit code: 0]").split("\n")
+        assert tail[-1] == "5000"
+        assert tail[0] == f"[... {5000 - len(tail) + 1} earlier lines truncated ...]"
+        assert len("\n".join(tail[1:])) <= 1024
+
+    async def test_old_logs_pruned(self, shell_agent, tmp_path):
+        with patch("orchestrator.agents.base_agent._LOG_KEEP", 2):
+            for _ in range(4):
+                await shell_agent._run_shell("echo hi", tail_kb=1)
+        assert len(list((tmp_path / ".auton" / "logs").glob("*.log"))) == 2
+
+
+class TestRunBuild:
+    @pytest.fixture
+    def build_agent(self, base_agent, tmp_path):
+        from unittest.mock import AsyncMock
+
+        (tmp_path / "Makefile").write_text("all:\n", encoding="utf-8")
+        base_agent.workspace.path = tmp_path
+        base_agent._run_shell = AsyncMock(return_value="ok")
+        return base_agent
+
+    async def test_plain_make_without_ccache(self, build_agent, tmp_path):
+        with patch("orchestrator.agents.base_agent._CCACHE_DIR", None):
+            await build_agent._run_build("all")
+        assert build_agent._run_shell.await_args.args[0] == ["make", "-C", str(tmp_path), "all"]
+        assert build_agent._run_shell.await_args.kwargs["env"] is None
+
+    async def test_ccache_masquerades_without_overriding_cc(self, build_agent, tmp_path):
+        with patch("orchestrator.agents.base_agent._CCACHE_DIR", "/usr/lib/ccache"), \
+                patch.dict("os.environ", {"PATH": "/usr/bin", "CC": "clang"}):
+            await build_agent._run_build("kernel")
+        call = build_agent._run_shell.await_args
+        assert call.args[0] == ["make", "-C", str(tmp_path), "kernel"]
+        assert call.kwargs["env"]["PATH"] == "/usr/lib/ccache" + os.pathsep + "/usr/bin"
+        assert call.kwargs["env"]["CC"] == "clang"
+
+
+class TestDataTools:
+    async def test_dataset_tools_request_all_cores(self, base_agent):
+        from unittest.mock import AsyncMock
+
+        base_agent._run_shell = AsyncMock(return_value="ok")
+        with patch("orchestrator.agents.base_agent._DATA_WORKERS", 6), \
+                patch("orchestrator.agents.base_agent._DATA_TOOL_PREFIX", ""):
+            await base_agent._analyze_dataset("data/")
+            await base_agent._tokenize_data("data/", "vocab.json", 8000)
+        commands = [call.args[0] for call in base_agent._run_shell.await_args_list]
+        assert commands == [
+            "python SLM/tools/dataset_builder.py analyze data/ --workers 6",
+            "python SLM/tools/tokenizer.py --input data/ --output vocab.json"
+            " --vocab-size 8000 --workers 6",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# SLM config tools
+# ---------------------------------------------------------------------------
+
+class TestModelConfigTools:
+    CONFIG = "model:\n  name: tiny\n  parameters: 1000000\narchitecture: {}\ntraining: {}\n"
+
+    async def test_validate_architecture(self, base_agent, tmp_path):
+        config = tmp_path / "model.yaml"
+        config.write_text(self.CONFIG, encoding="utf-8")
+        assert await base_agent._validate_architecture(str(config)) == "Config valid: tiny"
+
+    async def test_validate_architecture_missing_keys(self, base_agent, tmp_path):
+        config = tmp_path / "model.yaml"
+        config.write_text("model: {}\n", encoding="utf-8")
+        result = await base_agent._validate_architecture(str(config))
+        assert "missing ['architecture', 'training']" in result
+
+    async def test_estimate_flops(self, base_agent, tmp_path):
+        config = tmp_path / "model.yaml"
+        config.write_text(self.CONFIG, encoding="utf-8")
+        result = await base_agent._estimate_flops(str(config))
+        assert result.startswith("Estimated 1,000,000 parameters")
+
+    async def test_missing_file_reports_error(self, base_agent, tmp_path):
+        result = await base_agent._estimate_flops(str(tmp_path / "absent.yaml"))
+        assert result.startswith("FLOP estimation error")
+
+
+class TestIntegrateSlm:
+    async def test_copies_model_into_kernel_tree(self, base_agent, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        model = tmp_path / "model.gguf"
+        model.write_bytes(b"GGUF" + bytes(range(256)) * 64)
+
+        result = await base_agent._integrate_slm(str(model), "x86_64")
+
+        dst = tmp_path / "kernels/x86_64/kernel/slm/models/auton-slm.gguf"
+        assert result.startswith("Integrated model.gguf into x86_64")
+        assert dst.read_bytes() == model.read_bytes()
+
+    def test_copy_falls_back_when_copy_file_range_refused(self, tmp_path):
+        src, dst = tmp_path / "a", tmp_path / "b"
+        src.write_bytes(b"x" * 4096)
+        with patch("os.copy_file_range", side_effect=OSError(18, "EXDEV"), create=True):
+            assert _copy_file(src, dst) == 4096
+        assert dst.read_bytes() == src.read_bytes()
+
+
+class TestPackageExports:
+    def test_exports_resolve_lazily(self):
+        import orchestrator.agents as agents
+        from orchestrator.agents.architect_agent import ArchitectAgent
+
+        assert agents.ArchitectAgent is ArchitectAgent
+        assert agents.Agent is Agent
+        assert set(agents.__all__) <= set(dir(agents))
+
+    def test_unknown_export_raises_attribute_error(self):
+        import orchestrator.agents as agents
+
+        with pytest.raises(AttributeError):
+            agents.NoSuchAgent
+
+
+class TestResponseCache:
+    async def test_repeated_task_replays_cached_conversation(self, mock_deps):
+        from unittest.mock import AsyncMock
+
+        from orchestrator.llm.cache import LLMCache
+        from orchestrator.llm.client import CostTracker
+
+        conversation = [
+            {"role": "user", "content": "task"},
+            {"role": "assistant", "content": "Reviewed."},
+        ]
+        mock_deps["client"].model = "test/model"
+        mock_deps["client"].cost_tracker = CostTracker()
+        mock_deps["client"].send_with_tools = AsyncMock(return_value=conversation)
+        agent = Agent(
+            role=AgentRole.REVIEWER,
+            system_prompt="test prompt",
+            tools=[],
+            llm_cache=LLMCache(),
+            **mock_deps,
+        )
+        task = {"task_id": "t1", "title": "Review mm"}
+
+        mock_deps["workspace"].snapshot_id.return_value = "tip-1"
+
+        first = await agent.execute_task(task)
+        second = await agent.execute_task(task)
+
+        assert mock_deps["client"].send_with_tools.await_count == 1
+        assert first.summary == second.summary == "Reviewed."
+        assert agent.llm_cache.hits == 1
+
+        # The branch under review moved: the old verdict must not be replayed.
+        mock_deps["workspace"].snapshot_id.return_value = "tip-2"
+        await agent.execute_task(task)
+        assert mock_deps["client"].send_with_tools.await_count == 2
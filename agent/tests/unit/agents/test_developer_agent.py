@@ -1,12 +1,15 @@
 """Tests for DeveloperAgent."""
 
+import asyncio
+
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from orchestrator.agents.developer_agent import DeveloperAgent
 from orchestrator.agents.base_agent import AgentRole, AgentState
 from orchestrator.arch_registry import get_arch_profile
+from orchestrator.comms.message_bus import MessageType
 from orchestrator.llm.tools import DEVELOPER_TOOLS
 
 
@@ -120,3 +123,44 @@ class TestDeveloperSystemPrompt:
         }
         agent = DeveloperAgent(**deps)
         assert "x86_64" in agent.system_prompt
+
+
+class TestImplementTask:
+    async def test_requests_review_with_written_files(self, developer, tmp_path):
+        developer.workspace.path = tmp_path
+        developer.workspace.create_branch.return_value = "agent/dev-01/mm/page"
+
+        async def run_tools(**kwargs):
+            await kwargs["tool_executor"]("write_file", {"path": "mm/page.c", "content": ""})
+            return [*kwargs["messages"], {"role": "assistant", "content": "done"}]
+
+        developer.client.send_with_tools = AsyncMock(side_effect=run_tools)
+        result = await developer.implement_task({"task_id": "mm-page", "subsystem": "mm"})
+
+        assert result.success
+        [review] = [c.args[0] for c in developer.message_bus.send.call_args_list]
+        assert review.msg_type == MessageType.REVIEW_REQUEST
+        assert review.payload["branch"] == "agent/dev-01/mm/page"
+        assert review.payload["files"] == ["mm/page.c"]
+
+    async def test_prefetches_subsystem_spec(self, developer, tmp_path):
+        from orchestrator.agents import base_agent
+
+        spec = tmp_path / "specs" / "subsystems" / "mm.md"
+        spec.parent.mkdir(parents=True)
+        spec.write_text("# mm", encoding="utf-8")
+        developer.kernel_spec_path = tmp_path / "specs"
+        developer.workspace.path = tmp_path
+        developer.workspace.create_branch.return_value = "agent/dev-01/mm/page"
+
+        async def run_tools(**kwargs):
+            for _ in range(100):  # the model's first turn; nothing calls read_spec
+                if spec in base_agent._SPEC_CACHE:
+                    break
+                await asyncio.sleep(0.01)
+            assert base_agent._SPEC_CACHE[spec][2] == "# mm"
+            return [*kwargs["messages"], {"role": "assistant", "content": "done"}]
+
+        developer.client.send_with_tools = AsyncMock(side_effect=run_tools)
+        result = await developer.implement_task({"task_id": "mm-page", "subsystem": "mm"})
+        assert result.success
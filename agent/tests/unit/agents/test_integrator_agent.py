@@ -2,11 +2,12 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from orchestrator.agents.integrator_agent import IntegratorAgent
+from orchestrator.agents.integrator_agent import IntegratorAgent, _merge_order
 from orchestrator.agents.base_agent import AgentRole, AgentState
 from orchestrator.arch_registry import get_arch_profile
+from orchestrator.comms.diff_protocol import TaskMetadata, TaskStatus
 from orchestrator.llm.tools import INTEGRATOR_TOOLS
 
 
@@ -115,3 +116,33 @@ class TestIntegratorSystemPrompt:
         }
         agent = IntegratorAgent(**deps)
         assert "x86_64" in agent.system_prompt
+
+
+def _approved(task_id, *dependencies):
+    return TaskMetadata(
+        task_id=task_id, title=task_id, subsystem="mm", agent_id="dev-01",
+        branch=f"agent/{task_id}", status=TaskStatus.APPROVED,
+        dependencies=list(dependencies),
+    )
+
+
+class TestMergeApproved:
+    def test_dependencies_merge_first(self):
+        tasks = [_approved("c", "b"), _approved("a"), _approved("b", "a", "merged-earlier")]
+        assert [t.task_id for t in _merge_order(tasks)] == ["a", "b", "c"]
+
+    def test_independent_order_kept_and_cycles_terminate(self):
+        tasks = [_approved("x"), _approved("p", "q"), _approved("q", "p"), _approved("y")]
+        assert [t.task_id for t in _merge_order(tasks)] == ["x", "q", "p", "y"]
+
+    async def test_stops_at_first_failed_merge(self, integrator):
+        tasks = [_approved("b", "a"), _approved("a"), _approved("c")]
+
+        async def merge(task_meta):
+            return {"task_id": task_meta.task_id, "success": task_meta.task_id != "b"}
+
+        with patch.object(TaskMetadata, "load_all", return_value=tasks), \
+                patch.object(integrator, "merge_branch", side_effect=merge):
+            results = await integrator.merge_approved()
+
+        assert [r["task_id"] for r in results] == ["a", "b"]
@@ -2,11 +2,12 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from orchestrator.agents.manager_agent import ManagerAgent
 from orchestrator.agents.base_agent import AgentRole, AgentState
 from orchestrator.arch_registry import get_arch_profile
+from orchestrator.comms.diff_protocol import TaskMetadata, TaskStatus
 from orchestrator.llm.tools import MANAGER_TOOLS
 
 
@@ -100,3 +101,50 @@ class TestManagerSystemPrompt:
         }
         agent = ManagerAgent(**deps)
         assert "x86_64" in agent.system_prompt
+
+
+class TestAssessProgress:
+    REPORT = [{"role": "assistant", "content": '{"progress_pct": 40}'}]
+
+    @pytest.fixture
+    def assessing(self, manager, tmp_path):
+        manager.workspace.path = tmp_path
+        manager.workspace.get_branch_status.return_value = {}
+        manager.client.send_with_tools = AsyncMock(return_value=self.REPORT)
+        TaskMetadata("t1", "Boot", "boot", "dev-01", "agent/t1").save(tmp_path)
+        return manager
+
+    async def test_unchanged_status_reuses_report(self, assessing):
+        assert await assessing.assess_progress() == {"progress_pct": 40}
+        assert await assessing.assess_progress() == {"progress_pct": 40}
+        assert assessing.client.send_with_tools.await_count == 1
+
+    async def test_status_change_asks_again(self, assessing, tmp_path):
+        await assessing.assess_progress()
+        meta = TaskMetadata.load(tmp_path, "t1")
+        meta.status = TaskStatus.BLOCKED
+        meta.save(tmp_path)
+        await assessing.assess_progress()
+        assert assessing.client.send_with_tools.await_count == 2
+
+    async def test_unparsable_report_not_reused(self, assessing):
+        assessing.client.send_with_tools.return_value = [
+            {"role": "assistant", "content": "no json"}
+        ]
+        await assessing.assess_progress()
+        await assessing.assess_progress()
+        assert assessing.client.send_with_tools.await_count == 2
+
+
+class TestParseResponses:
+    def test_parse_tasks_from_surrounding_text(self, manager):
+        text = 'Here is the plan:\n[{"task_id": "boot-001", "priority": 1}]\nDone.'
+        tasks = manager._parse_tasks([{"role": "assistant", "content": text}])
+        assert tasks == [{"task_id": "boot-001", "priority": 1}]
+
+    def test_parse_tasks_invalid_json(self, manager):
+        assert manager._parse_tasks([{"role": "assistant", "content": "[not json]"}]) == []
+
+    def test_parse_json_response_invalid(self, manager):
+        result = manager._parse_json_response([{"role": "assistant", "content": "{oops}"}])
+        assert result == {"error": "Failed to parse response", "raw": "{oops}"}
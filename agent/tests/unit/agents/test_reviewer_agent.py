@@ -2,7 +2,7 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from orchestrator.agents.reviewer_agent import ReviewerAgent
 from orchestrator.agents.base_agent import AgentRole, AgentState
@@ -107,3 +107,24 @@ class TestReviewerSystemPrompt:
         }
         agent = ReviewerAgent(**deps)
         assert "x86_64" in agent.system_prompt
+
+
+class TestReviewBranch:
+    async def test_reviews_share_a_cacheable_instruction_block(self, reviewer, tmp_path):
+        reviewer.workspace.path = tmp_path
+        reviewer.model_override = "anthropic/claude-sonnet-4"
+        first_messages = []
+
+        async def run_tools(**kwargs):
+            first_messages.append(kwargs["messages"][0]["content"])
+            return [*kwargs["messages"], {"role": "assistant", "content": '{"verdict": "approve"}'}]
+
+        reviewer.client.send_with_tools = AsyncMock(side_effect=run_tools)
+        await reviewer.review_branch("mm-001", "agent/dev-01/mm/page")
+        await reviewer.review_branch("sched-001", "agent/dev-02/sched/rr")
+
+        (static_a, task_a), (static_b, task_b) = first_messages
+        assert static_a == static_b
+        assert static_a["cache_control"] == {"type": "ephemeral"}
+        assert "agent/dev-01/mm/page" in task_a["text"]
+        assert "agent/dev-02/sched/rr" in task_b["text"]
@@ -0,0 +1,51 @@
+"""Tests for atomic file replacement."""
+
+import os
+
+import pytest
+
+from orchestrator.comms.atomic import write_bytes_atomic
+
+
+class TestWriteBytesAtomic:
+    def test_creates_file(self, tmp_path):
+        path = tmp_path / "t.json"
+        write_bytes_atomic(path, b'{"a": 1}')
+        assert path.read_bytes() == b'{"a": 1}'
+
+    def test_replaces_existing_file(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_bytes(b"old contents that are longer")
+        write_bytes_atomic(path, b"new")
+        assert path.read_bytes() == b"new"
+
+    def test_reader_holding_old_file_keeps_old_contents(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_bytes(b"old")
+        with open(path, "rb") as reader:
+            write_bytes_atomic(path, b"new")
+            assert reader.read() == b"old"
+        assert path.read_bytes() == b"new"
+
+    def test_mode_matches_plain_write(self, tmp_path):
+        plain, atomic = tmp_path / "plain", tmp_path / "atomic"
+        plain.write_bytes(b"x")
+        write_bytes_atomic(atomic, b"x")
+        assert atomic.stat().st_mode == plain.stat().st_mode
+
+    def test_missing_directory_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            write_bytes_atomic(tmp_path / "missing" / "t.json", b"x")
+
+    def test_failed_replace_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "t.json"
+        path.write_bytes(b"old")
+
+        def fail_replace(src, dst):
+            raise OSError("EXDEV")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            write_bytes_atomic(path, b"new")
+        assert [p.name for p in tmp_path.iterdir()] == ["t.json"]
+        assert path.read_bytes() == b"old"
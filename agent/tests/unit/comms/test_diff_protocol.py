@@ -140,6 +140,16 @@ class TestTaskMetadataJson:
         assert data["task_id"] == "task-42"
         assert data["status"] == "review"  # serialized as string value
 
+    def test_to_json_matches_field_layout(self):
+        from dataclasses import asdict
+
+        tm = self._make_sample()
+        assert json.loads(tm.to_json()) == {**asdict(tm), "status": "review"}
+
+    def test_from_json_accepts_bytes(self):
+        tm = self._make_sample()
+        assert TaskMetadata.from_json(tm.to_json().encode()) == tm
+
     def test_from_json_restores_fields(self):
         tm = self._make_sample()
         restored = TaskMetadata.from_json(tm.to_json())
@@ -297,6 +307,13 @@ class TestTaskMetadataLoadAll:
         result = TaskMetadata.load_all(tmp_path)
         assert result == []
 
+    def test_load_all_ignores_other_entries(self, tmp_path):
+        TaskMetadata("t1", "T", "s", "a", "b").save(tmp_path)
+        tasks_dir = tmp_path / ".auton" / "tasks"
+        (tasks_dir / "notes.txt").write_text("not a task", encoding="utf-8")
+        (tasks_dir / "archive.json").mkdir()
+        assert [t.task_id for t in TaskMetadata.load_all(tmp_path)] == ["t1"]
+
     def test_load_all_single_task(self, tmp_path):
         tm = TaskMetadata(
             task_id="only-one",
@@ -309,3 +326,52 @@ class TestTaskMetadataLoadAll:
         all_tasks = TaskMetadata.load_all(tmp_path)
         assert len(all_tasks) == 1
         assert all_tasks[0].task_id == "only-one"
+
+    def test_load_all_skips_unchanged_files(self, tmp_path, monkeypatch):
+        TaskMetadata("t1", "T", "s", "a", "b").save(tmp_path)
+        TaskMetadata.load_all(tmp_path)
+        monkeypatch.setattr(
+            "pathlib.Path.read_bytes", lambda *a, **k: pytest.fail("re-read unchanged file")
+        )
+        assert TaskMetadata.load_all(tmp_path)[0].task_id == "t1"
+
+    def test_load_all_sees_outside_rewrites(self, tmp_path):
+        tm = TaskMetadata("t1", "T", "s", "a", "b")
+        tm.save(tmp_path)
+        TaskMetadata.load_all(tmp_path)
+        tm.status = TaskStatus.APPROVED
+        path = tmp_path / ".auton" / "tasks" / "t1.json"
+        path.write_text(tm.to_json() + "\n", encoding="utf-8")
+        assert TaskMetadata.load_all(tmp_path)[0].status == TaskStatus.APPROVED
+
+    def test_load_all_returns_independent_copies(self, tmp_path):
+        TaskMetadata("t1", "T", "s", "a", "b", dependencies=["t0"]).save(tmp_path)
+        first = TaskMetadata.load_all(tmp_path)[0]
+        first.status = TaskStatus.MERGED
+        first.dependencies.append("tx")
+        again = TaskMetadata.load_all(tmp_path)[0]
+        assert again.status == TaskStatus.IN_PROGRESS
+        assert again.dependencies == ["t0"]
+
+    def test_load_all_sees_same_size_replacement_with_same_mtime(self, tmp_path):
+        import os
+
+        from orchestrator.comms.atomic import write_bytes_atomic
+
+        TaskMetadata("t1", "T", "s", "a", "b", status=TaskStatus.REVIEW).save(tmp_path)
+        path = tmp_path / ".auton" / "tasks" / "t1.json"
+        TaskMetadata.load_all(tmp_path)
+        st = path.stat()
+        write_bytes_atomic(path, path.read_bytes().replace(b'"review"', b'"merged"'))
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert TaskMetadata.load_all(tmp_path)[0].status == TaskStatus.MERGED
+
+    def test_parsed_file_cache_is_bounded(self, tmp_path, monkeypatch):
+        from orchestrator.comms import diff_protocol
+
+        monkeypatch.setattr(diff_protocol, "_LOADED", diff_protocol.OrderedDict())
+        monkeypatch.setattr(diff_protocol, "_LOADED_SIZE", 2)
+        for n in range(3):
+            TaskMetadata(f"t{n}", "T", "s", "a", "b").save(tmp_path)
+        assert len(TaskMetadata.load_all(tmp_path)) == 3
+        assert len(diff_protocol._LOADED) == 2
@@ -1,14 +1,22 @@
 """Tests for git workspace management."""
 
+import os
+
 import pytest
 
+from orchestrator.comms import git_workspace
+from orchestrator.comms.diff_protocol import TaskMetadata
 from orchestrator.comms.git_workspace import GitWorkspace
+from orchestrator.comms.message_bus import Message, MessageBus, MessageType
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+needs_rg = pytest.mark.skipif(git_workspace._RG is None, reason="ripgrep not installed")
+
+
 @pytest.fixture
 def workspace(tmp_path):
     """Create and initialize a GitWorkspace in a temporary directory."""
@@ -76,6 +84,15 @@ class TestReadWriteFile:
         workspace.write_file("file.txt", "v2")
         assert workspace.read_file("file.txt") == "v2"
 
+    def test_identical_rewrite_leaves_file_alone(self, workspace):
+        assert workspace.write_file("file.c", "int x;\n") is True
+        path = workspace.path / "file.c"
+        os.utime(path, ns=(0, 0))
+        assert workspace.write_file("file.c", "int x;\n") is False
+        assert path.stat().st_mtime_ns == 0
+        assert workspace.write_file("file.c", "int y;\n") is True
+        assert workspace.read_file("file.c") == "int y;\n"
+
     def test_read_nonexistent_raises(self, workspace):
         with pytest.raises(FileNotFoundError):
             workspace.read_file("does_not_exist.txt")
@@ -128,6 +145,66 @@ class TestListFiles:
         assert files == []
 
 
+# ---------------------------------------------------------------------------
+# current_branch
+# ---------------------------------------------------------------------------
+
+class TestCurrentBranch:
+    def test_matches_gitpython(self, workspace):
+        assert workspace.current_branch() == workspace.repo.active_branch.name
+        branch = workspace.create_branch("dev-01", "mm", "slab")
+        assert workspace.current_branch() == branch
+
+    def test_detached_head(self, workspace):
+        workspace.repo.git.checkout("--detach")
+        assert workspace.current_branch() is None
+
+
+# ---------------------------------------------------------------------------
+# generation
+# ---------------------------------------------------------------------------
+
+class TestGeneration:
+    def test_bumped_by_changes_only(self, workspace):
+        start = workspace.generation
+        workspace.write_file("a.c", "int a;\n")
+        assert workspace.generation == start + 1
+        workspace.write_file("a.c", "int a;\n")  # identical: not written
+        assert workspace.generation == start + 1
+        workspace.commit("add a.c")
+        assert workspace.generation == start + 2
+        workspace.create_branch("dev-01", "mm", "slab")
+        workspace.checkout_main()
+        assert workspace.generation == start + 4
+
+
+# ---------------------------------------------------------------------------
+# snapshot_id
+# ---------------------------------------------------------------------------
+
+class TestSnapshotId:
+    def test_stable_while_nothing_changes(self, workspace):
+        assert workspace.snapshot_id() == workspace.snapshot_id()
+
+    def test_changes_with_worktree_commits_and_branches(self, workspace):
+        seen = {workspace.snapshot_id()}
+        workspace.write_file("a.c", "int a;\n")  # untracked
+        seen.add(workspace.snapshot_id())
+        workspace.commit("add a.c")
+        seen.add(workspace.snapshot_id())
+        workspace.write_file("a.c", "int b;\n")  # tracked modification
+        seen.add(workspace.snapshot_id())
+        workspace.repo.git.branch("other")
+        seen.add(workspace.snapshot_id())
+        assert len(seen) == 5
+
+    def test_ignores_orchestrator_state(self, workspace):
+        before = workspace.snapshot_id()
+        MessageBus(workspace.path).send(Message(MessageType.STATUS_UPDATE, "a", "b", {}))
+        TaskMetadata("t1", "T", "s", "a", "b").save(workspace.path)
+        assert workspace.snapshot_id() == before
+
+
 # ---------------------------------------------------------------------------
 # search_code
 # ---------------------------------------------------------------------------
@@ -161,6 +238,24 @@ class TestSearchCode:
         results = workspace.search_code(r"hello")
         assert len(results) == 2
 
+    @pytest.mark.parametrize("rg", [
+        pytest.param(None, id="python"),
+        pytest.param(git_workspace._RG, id="ripgrep", marks=needs_rg),
+    ])
+    def test_max_results_stops_early(self, workspace, rg, monkeypatch):
+        monkeypatch.setattr(git_workspace, "_RG", rg)
+        workspace.write_file("many.txt", "hit\n" * 100)
+        assert len(workspace.search_code("hit", max_results=5)) == 5
+
+    @needs_rg
+    def test_ripgrep_matches_python_scan(self, workspace, monkeypatch):
+        workspace.write_file("src/a.c", "int a;\nint main(void) {\n")
+        workspace.write_file("src/b.h", "  int b;  \n")
+        ripgrep = sorted(workspace.search_code(r"^\s*int", glob="*.[ch]"), key=str)
+        monkeypatch.setattr(git_workspace, "_RG", None)
+        python = sorted(workspace.search_code(r"^\s*int", glob="*.[ch]"), key=str)
+        assert ripgrep == python
+
 
 # ---------------------------------------------------------------------------
 # commit
@@ -189,6 +284,12 @@ class TestCommit:
         assert "auto1.txt" in names
         assert "auto2.txt" in names
 
+    def test_untracked_files_alone_make_no_commit(self, workspace):
+        workspace.write_file("tracked.txt", "t")
+        first = workspace.commit("Add tracked", files=["tracked.txt"])
+        workspace.write_file("stray.txt", "s")
+        assert workspace.commit("Nothing staged", files=["tracked.txt"]) == first
+
     def test_commit_specific_files(self, workspace):
         workspace.write_file("staged.txt", "yes")
         workspace.write_file("unstaged.txt", "no")
@@ -1,7 +1,10 @@
 """Tests for file-based message bus."""
 
 import json
+import shutil
 import time
+from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -157,6 +160,24 @@ class TestMessage:
         restored = Message.from_json(msg.to_json())
         assert restored.read is True
 
+    def test_to_json_covers_every_field(self):
+        from dataclasses import fields
+
+        msg = Message(msg_type=MessageType.STATUS_UPDATE, from_agent="a", to_agent="b")
+        assert list(json.loads(msg.to_json())) == [f.name for f in fields(Message)]
+
+    def test_to_json_stringifies_non_str_keys(self):
+        msg = Message(
+            msg_type=MessageType.STATUS_UPDATE, from_agent="a", to_agent="b",
+            payload={"counts": {1: "x"}, "note": "ünïcode"},
+        )
+        restored = Message.from_json(msg.to_json())
+        assert restored.payload == {"counts": {"1": "x"}, "note": "ünïcode"}
+
+    def test_has_no_instance_dict(self):
+        msg = Message(msg_type=MessageType.STATUS_UPDATE, from_agent="a", to_agent="b")
+        assert not hasattr(msg, "__dict__")
+
 
 # ---------------------------------------------------------------------------
 # MessageBus
@@ -178,7 +199,7 @@ class TestMessageBusSend:
             msg_id="msg000000001",
         )
         bus.send(msg)
-        expected_path = bus.base_path / "dev-1" / "msg000000001.json"
+        expected_path = bus.base_path / "dev-1" / "new" / "msg000000001.json"
         assert expected_path.exists()
 
     def test_send_file_is_valid_json(self, bus):
@@ -189,12 +210,37 @@ class TestMessageBusSend:
             msg_id="msg000000002",
         )
         bus.send(msg)
-        path = bus.base_path / "dev-1" / "msg000000002.json"
+        path = bus.base_path / "dev-1" / "new" / "msg000000002.json"
         data = json.loads(path.read_text(encoding="utf-8"))
         assert data["msg_type"] == "task_assignment"
         assert data["from_agent"] == "manager"
 
 
+class TestMessageBusSendBatch:
+    def test_batch_writes_and_delivers_in_order(self, bus):
+        seen = []
+        bus.subscribe("dev-1", seen.append)
+        batch = [
+            Message(MessageType.REVIEW_REQUEST, "manager", to, msg_id=f"batch{i:07d}")
+            for i, to in enumerate(["dev-1", "dev-2", "dev-1"])
+        ]
+        bus.send_batch(batch)
+        assert [m.msg_id for m in seen] == ["batch0000000", "batch0000002"]
+        assert [m.msg_id for m in bus.receive("dev-2")] == ["batch0000001"]
+
+    def test_inbox_created_once(self, bus, monkeypatch):
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1"))
+        monkeypatch.setattr(Path, "mkdir", MagicMock(side_effect=AssertionError))
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1"))
+        assert len(bus.receive("dev-1")) == 2
+
+    def test_recreates_removed_inbox(self, bus):
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1"))
+        shutil.rmtree(bus.base_path / "dev-1")
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1"))
+        assert len(bus.receive("dev-1")) == 1
+
+
 class TestMessageBusReceive:
     def test_receive_reads_messages(self, bus):
         msg = Message(
@@ -257,9 +303,10 @@ class TestMessageBusMarkRead:
         bus.send(msg)
         bus.mark_read("dev-1", "to_mark_read")
 
-        # Re-read from disk
-        path = bus.base_path / "dev-1" / "to_mark_read.json"
-        reloaded = Message.from_json(path.read_text(encoding="utf-8"))
+        inbox = bus.base_path / "dev-1"
+        assert not (inbox / "new" / "to_mark_read.json").exists()
+        assert (inbox / "read" / "to_mark_read.json").exists()
+        [reloaded] = bus.receive("dev-1", unread_only=False)
         assert reloaded.read is True
 
     def test_mark_read_filters_from_unread_receive(self, bus):
@@ -279,6 +326,31 @@ class TestMessageBusMarkRead:
         # Should not raise
         bus.mark_read("dev-1", "does_not_exist")
 
+    def test_unread_receive_skips_read_files(self, bus, monkeypatch):
+        for i in range(3):
+            bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1", msg_id=f"m{i}"))
+        bus.mark_read("dev-1", "m0")
+        bus.mark_read("dev-1", "m1")
+        parsed = []
+        real_from_json = Message.from_json
+        monkeypatch.setattr(
+            Message, "from_json", lambda raw: parsed.append(raw) or real_from_json(raw)
+        )
+        assert [m.msg_id for m in bus.receive("dev-1")] == ["m2"]
+        assert len(parsed) == 1
+
+    def test_flat_inbox_migrated(self, tmp_path):
+        inbox = tmp_path / ".auton" / "messages" / "dev-1"
+        inbox.mkdir(parents=True)
+        for msg_id, read in (("old-read", True), ("old-new", False)):
+            msg = Message(MessageType.STATUS_UPDATE, "a", "dev-1", msg_id=msg_id, read=read)
+            (inbox / f"{msg_id}.json").write_text(msg.to_json(), encoding="utf-8")
+
+        bus = MessageBus(tmp_path)
+        assert [m.msg_id for m in bus.receive("dev-1")] == ["old-new"]
+        assert sorted(p.name for p in inbox.rglob("*.json")) == ["old-new.json", "old-read.json"]
+        assert (inbox / "read" / "old-read.json").exists()
+
 
 class TestMessageBusBroadcast:
     def test_broadcast_sends_to_all_inboxes(self, bus):
@@ -395,3 +467,51 @@ class TestMessageBusGetConversation:
     def test_get_conversation_empty_when_no_messages(self, bus):
         convo = bus.get_conversation("agent-a", "agent-b")
         assert convo == []
+
+    def test_subscriber_receives_sent_message(self, bus):
+        seen = []
+        bus.subscribe("reviewer-1", seen.append)
+        msg = Message(
+            msg_type=MessageType.REVIEW_REQUEST, from_agent="dev-1", to_agent="reviewer-1"
+        )
+        bus.send(msg)
+        bus.send(Message(msg_type=MessageType.STATUS_UPDATE, from_agent="a", to_agent="other"))
+
+        assert [m.msg_id for m in seen] == [msg.msg_id]
+        assert bus.receive("reviewer-1")[0].msg_id == msg.msg_id  # still persisted
+
+
+class TestMessageBusParseCache:
+    def _count_parses(self, monkeypatch):
+        parsed = []
+        real_from_json = Message.from_json
+        monkeypatch.setattr(
+            Message, "from_json", lambda raw: parsed.append(raw) or real_from_json(raw)
+        )
+        return parsed
+
+    def test_unchanged_files_parsed_once(self, bus, monkeypatch):
+        bus.send(Message(MessageType.REVIEW_REQUEST, "dev-1", "reviewer-1", msg_id="m1"))
+        bus.send(Message(MessageType.REVIEW_RESULT, "reviewer-1", "dev-1", msg_id="m2"))
+        parsed = self._count_parses(monkeypatch)
+        for _ in range(3):
+            assert len(bus.get_conversation("dev-1", "reviewer-1")) == 2
+        assert len(parsed) == 2
+
+    def test_rewritten_file_reparsed(self, bus):
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1", msg_id="m1"))
+        assert bus.receive("dev-1")[0].payload == {}
+        path = bus.base_path / "dev-1" / "new" / "m1.json"
+        changed = Message(MessageType.STATUS_UPDATE, "a", "dev-1", {"v": 2}, msg_id="m1")
+        path.write_text(changed.to_json(), encoding="utf-8")
+        assert bus.receive("dev-1")[0].payload == {"v": 2}
+
+    def test_callers_get_independent_copies(self, bus):
+        bus.send(Message(MessageType.STATUS_UPDATE, "a", "dev-1", {"k": 1}, msg_id="m1"))
+        first = bus.receive("dev-1")[0]
+        first.payload["k"] = 99
+        first.read = True
+        again = bus.receive("dev-1")[0]
+        assert again.payload == {"k": 1}
+        assert again.read is False
+
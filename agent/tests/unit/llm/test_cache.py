@@ -0,0 +1,91 @@
+"""Unit tests for orchestrator.llm.cache module."""
+
+from __future__ import annotations
+
+import json
+import time
+
+from orchestrator.llm.cache import (
+    FileCacheBackend,
+    LLMCache,
+    MemoryCacheBackend,
+    cache_key,
+    is_replayable,
+)
+
+
+def _conversation(*tool_names):
+    calls = [
+        {"id": f"c{i}", "type": "function", "function": {"name": n, "arguments": "{}"}}
+        for i, n in enumerate(tool_names)
+    ]
+    return [
+        {"role": "user", "content": "task"},
+        {"role": "assistant", "content": None, "tool_calls": calls},
+        {"role": "assistant", "content": "done"},
+    ]
+
+
+class TestCacheKey:
+    def test_stable_across_dict_order(self):
+        a = cache_key("m", "sys", [{"role": "user", "content": "x"}], [{"b": 1, "a": 2}], "ws")
+        b = cache_key("m", "sys", [{"content": "x", "role": "user"}], [{"a": 2, "b": 1}], "ws")
+        assert a == b
+
+    def test_changes_with_model(self):
+        messages = [{"role": "user", "content": "x"}]
+        assert cache_key("m1", "s", messages, [], "ws") != cache_key("m2", "s", messages, [], "ws")
+
+    def test_changes_with_workspace(self):
+        messages = [{"role": "user", "content": "x"}]
+        assert cache_key("m", "s", messages, [], "a") != cache_key("m", "s", messages, [], "b")
+
+
+class TestReplayable:
+    def test_read_only_tools_are_replayable(self):
+        assert is_replayable(_conversation("read_file", "search_code"))
+
+    def test_side_effects_are_not(self):
+        assert not is_replayable(_conversation("read_file", "write_file"))
+        assert not is_replayable(_conversation("git_commit"))
+
+
+class TestLLMCache:
+    async def test_exact_hit_after_set(self):
+        cache = LLMCache()
+        messages = _conversation("read_spec")
+        assert await cache.get("k") is None
+        assert await cache.set("k", messages, tokens=1200)
+        hit = await cache.get("k")
+        assert hit.messages == messages and hit.tokens == 1200
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_side_effect_conversation_not_stored(self):
+        cache = LLMCache()
+        assert not await cache.set("k", _conversation("write_file"))
+        assert await cache.get("k") is None
+
+    async def test_ttl_expiry(self, monkeypatch):
+        backend = MemoryCacheBackend()
+        await backend.set("k", "v", ttl_secs=10)
+        now = time.time()
+        monkeypatch.setattr("orchestrator.llm.cache.time.time", lambda: now + 11)
+        assert await backend.get("k") is None
+
+    async def test_file_backend_round_trip(self, tmp_path):
+        cache = LLMCache(backend=FileCacheBackend(tmp_path / "cache"))
+        await cache.set("k", _conversation(), tokens=5)
+        assert json.loads((tmp_path / "cache" / "k.json").read_text())["value"]["tokens"] == 5
+        fresh = LLMCache(backend=FileCacheBackend(tmp_path / "cache"))
+        assert (await fresh.get("k")).tokens == 5
+
+    async def test_file_backend_entries_stay_out_of_commits(self, tmp_path):
+        from orchestrator.comms.git_workspace import GitWorkspace
+
+        ws = GitWorkspace(tmp_path / "repo")
+        ws.init()
+        before = ws.snapshot_id()
+        await FileCacheBackend(ws.path / ".auton" / "llm_cache").set("k", {"v": 1}, None)
+        ws.commit("c")
+        assert ".auton/llm_cache/k.json" not in ws.repo.git.ls_files()
+        assert ws.snapshot_id() == before
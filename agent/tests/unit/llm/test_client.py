@@ -5,6 +5,7 @@ Tests TokenUsage, CostTracker, ProviderConfig, and LLMClient classes.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -17,6 +18,7 @@ from orchestrator.llm.client import (
     LLMClient,
     ProviderConfig,
     TokenUsage,
+    run_tool_calls,
 )
 from orchestrator.llm.response import LLMResponse, ToolCall
 
@@ -391,6 +393,26 @@ class TestLLMClient:
         assert result[3]["role"] == "assistant"
         assert result[3]["content"] == "Done reading."
 
+    @pytest.mark.asyncio
+    async def test_send_with_tools_echoes_raw_arguments(self):
+        """The provider's argument JSON is sent back verbatim, not re-serialized."""
+        client = LLMClient()
+        raw = '{"path":  "main.c"}'
+        tool_response = LLMResponse(
+            text=None,
+            tool_calls=[ToolCall("call-1", "read_file", {"path": "main.c"}, raw_arguments=raw)],
+        )
+        with patch.object(client, "send_message", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [tool_response, LLMResponse(text="Done.")]
+            result = await client.send_with_tools(
+                agent_id="a",
+                system="s",
+                messages=[],
+                tools=[],
+                tool_executor=AsyncMock(return_value="ok"),
+            )
+        assert result[0]["tool_calls"][0]["function"]["arguments"] == raw
+
     @pytest.mark.asyncio
     async def test_send_with_tools_max_turns(self):
         """When tool calls keep coming, the loop respects max_turns."""
@@ -434,3 +456,173 @@ class TestLLMClient:
                 system="sys",
                 messages=[{"role": "user", "content": "hi"}],
             )
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching
+# ---------------------------------------------------------------------------
+
+
+class TestPromptCaching:
+    """Cache-control breakpoints on the stable system/tools prefix."""
+
+    def _response(self, usage):
+        message = SimpleNamespace(content="ok", tool_calls=None)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="stop")],
+            usage=usage,
+            model="m",
+        )
+
+    async def test_anthropic_gets_breakpoints(self):
+        client = LLMClient(model="anthropic/claude-opus-4-6")
+        tools = [{"function": {"name": "a"}}, {"function": {"name": "b"}}]
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=5, cache_read_input_tokens=80)
+        with patch("orchestrator.llm.client.litellm.acompletion", new_callable=AsyncMock,
+                   return_value=self._response(usage)) as acompletion, \
+                patch("orchestrator.llm.client.litellm.completion_cost", return_value=0.0):
+            await client.send_message("a1", "sys", [], tools=tools, prompt_caching=True)
+        kwargs = acompletion.await_args.kwargs
+        system = kwargs["messages"][0]["content"]
+        assert system == [{"type": "text", "text": "sys", "cache_control": {"type": "ephemeral"}}]
+        assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in kwargs["tools"][0]
+        assert "cache_control" not in tools[-1]  # caller's list untouched
+        assert client.cost_tracker.get_agent_usage("a1").cached_input_tokens == 80
+
+    async def test_other_providers_unchanged(self):
+        client = LLMClient(model="openai/gpt-4o")
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=1)
+        with patch("orchestrator.llm.client.litellm.acompletion", new_callable=AsyncMock,
+                   return_value=self._response(usage)) as acompletion, \
+                patch("orchestrator.llm.client.litellm.completion_cost", return_value=0.0):
+            await client.send_message("a1", "sys", [], prompt_caching=True)
+        assert acompletion.await_args.kwargs["messages"][0]["content"] == "sys"
+
+    async def test_tool_loop_builds_prefix_once(self):
+        client = LLMClient(model="anthropic/claude-opus-4-6")
+        tools = [{"function": {"name": "read_file"}}]
+        tool_response = LLMResponse(
+            text=None, tool_calls=[ToolCall("call-1", "read_file", {"path": "a.c"})]
+        )
+        with patch.object(client, "send_message", new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = [tool_response, LLMResponse(text="Done.")]
+            await client.send_with_tools(
+                "a1", "sys", [], tools, AsyncMock(return_value="ok"), prompt_caching=True
+            )
+        first, second = (call.kwargs for call in mock_send.await_args_list)
+        assert first["system"] is second["system"]
+        assert first["tools"] is second["tools"]
+        assert first["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert first["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+
+
+class TestRunToolCalls:
+    """Read-only tool calls in one response overlap; others are barriers."""
+
+    async def test_read_only_run_overlaps_and_keeps_order(self):
+        log = []
+        both_started = asyncio.Event()
+
+        async def executor(name, args):
+            log.append(("start", args["path"]))
+            if name == "read_file":
+                if sum(1 for e in log if e[0] == "start") == 2:
+                    both_started.set()
+                await asyncio.wait_for(both_started.wait(), timeout=1)
+            log.append(("end", args["path"]))
+            return args["path"].upper()
+
+        calls = [
+            ToolCall("1", "read_file", {"path": "a"}),
+            ToolCall("2", "read_file", {"path": "b"}),
+            ToolCall("3", "write_file", {"path": "c"}),
+        ]
+        assert await run_tool_calls(executor, calls) == ["A", "B", "C"]
+        assert log.index(("start", "c")) > log.index(("end", "b"))
+
+    async def test_failure_cancels_rest_of_run(self):
+        cancelled = []
+
+        async def executor(name, args):
+            if args["path"] == "bad":
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(args["path"])
+                raise
+
+        calls = [ToolCall("1", "read_file", {"path": "slow"}),
+                 ToolCall("2", "search_code", {"path": "bad"})]
+        with pytest.raises(RuntimeError, match="boom"):
+            await run_tool_calls(executor, calls)
+        await asyncio.sleep(0)
+        assert cancelled == ["slow"]
+
+
+class TestRateLimiting:
+    """Per-model call pacing and 429 backoff."""
+
+    def _response(self):
+        message = SimpleNamespace(content="ok", tool_calls=None)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="stop")],
+            usage=None,
+            model="m",
+        )
+
+    async def test_concurrent_calls_claim_distinct_slots(self):
+        client = LLMClient()
+        client._min_interval = 0.05
+        loop = asyncio.get_running_loop()
+        started = []
+
+        async def record(**kwargs):
+            started.append(loop.time())
+            return self._response()
+
+        with patch("orchestrator.llm.client.litellm.acompletion", side_effect=record):
+            await asyncio.gather(*(client.send_message("a", "s", []) for _ in range(3)))
+        gaps = [b - a for a, b in zip(started, started[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    async def test_models_paced_independently(self):
+        client = LLMClient()
+        client._min_interval = 60.0
+        with patch("orchestrator.llm.client.litellm.acompletion", new_callable=AsyncMock,
+                   return_value=self._response()):
+            await asyncio.wait_for(
+                asyncio.gather(
+                    client.send_message("a", "s", [], model_override="openai/gpt-4o"),
+                    client.send_message("a", "s", [], model_override="ollama/qwen"),
+                ),
+                timeout=1,
+            )
+
+    async def test_rate_limit_backs_off_exponentially(self):
+        import litellm
+
+        client = LLMClient(model="openai/gpt-4o")
+        error = litellm.RateLimitError("slow down", "openai", "gpt-4o")
+        with patch("orchestrator.llm.client.litellm.acompletion", new_callable=AsyncMock,
+                   side_effect=[error, error, self._response()]) as acompletion, \
+                patch("orchestrator.llm.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await client.send_message("a", "s", [])
+        assert result.text == "ok"
+        assert acompletion.await_count == 3
+        waits = [call.args[0] for call in sleep.await_args_list]
+        assert waits[0] == pytest.approx(30, abs=1)
+        assert waits[1] == pytest.approx(60, abs=1)
+
+    async def test_rate_limit_gives_up_after_retries(self):
+        import litellm
+
+        client = LLMClient(model="openai/gpt-4o")
+        error = litellm.RateLimitError("slow down", "openai", "gpt-4o")
+        with patch("orchestrator.llm.client.litellm.acompletion", new_callable=AsyncMock,
+                   side_effect=error) as acompletion, \
+                patch("orchestrator.llm.client.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(litellm.RateLimitError):
+                await client.send_message("a", "s", [])
+        assert acompletion.await_count == 4
@@ -207,6 +207,22 @@ class TestLLMResponseFromLitellm:
         assert len(resp.tool_calls) == 1
         assert resp.tool_calls[0].arguments == {}
 
+    def test_raw_arguments_kept_for_echo(self):
+        tc = _make_litellm_tool_call("call-1", "read_file", {"path": "boot.asm"})
+        resp = LLMResponse.from_litellm(_make_litellm_response(tool_calls=[tc]))
+        assert resp.tool_calls[0].raw_arguments == tc.function.arguments
+
+    def test_raw_arguments_dropped_when_unparseable(self):
+        tc = SimpleNamespace(id="c", function=SimpleNamespace(name="shell", arguments="{oops"))
+        resp = LLMResponse.from_litellm(_make_litellm_response(tool_calls=[tc]))
+        assert resp.tool_calls[0].raw_arguments == ""
+
+    def test_raw_arguments_ignored_by_equality(self):
+        args = {"path": "a.c"}
+        assert ToolCall("c", "read_file", args, raw_arguments='{"path":"a.c"}') == ToolCall(
+            "c", "read_file", args
+        )
+
     def test_finish_reason_passthrough(self):
         raw = _make_litellm_response(finish_reason="tool_calls")
         resp = LLMResponse.from_litellm(raw)
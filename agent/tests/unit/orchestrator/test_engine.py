@@ -1,7 +1,12 @@
 """Tests for orchestration engine."""
 
+import asyncio
+from unittest.mock import MagicMock, patch
+
 import pytest
+from orchestrator.agents.base_agent import AgentState, TaskResult
 from orchestrator.core.engine import OrchestrationEngine, WorkflowMode
+from orchestrator.core.task_graph import TaskState
 
 
 def test_workflow_mode_enum():
@@ -15,3 +20,65 @@ def test_workflow_mode_from_string():
     """Test WorkflowMode creation from string."""
     mode = WorkflowMode("kernel_build")
     assert mode == WorkflowMode.KERNEL_BUILD
+
+
+@pytest.fixture
+def engine(tmp_path):
+    config = {
+        "llm": {"model": "ollama/test", "api_keys": {}, "cost": {}},
+        "kernel": {"arch": "x86_64"},
+        "workflow": {"mode": "kernel_build"},
+    }
+    with patch("orchestrator.core.engine.GitWorkspace"):
+        return OrchestrationEngine(
+            workspace_path=tmp_path, kernel_spec_path=tmp_path, config=config
+        )
+
+
+def _done(task_id, branch=None):
+    return TaskResult(success=True, task_id=task_id, agent_id="dev-1", summary="", branch=branch)
+
+
+def _reviewer(agent_id, verdicts, started):
+    agent = MagicMock()
+    agent.agent_id = agent_id
+    agent.state = AgentState.IDLE
+
+    async def review_branch(task_id, branch):
+        started.append(agent_id)
+        await asyncio.sleep(0)
+        return {"verdict": verdicts[task_id]}
+
+    agent.review_branch = review_branch
+    return agent
+
+
+class TestTriggerReviews:
+    async def test_reviewers_share_the_wave(self, engine):
+        ids = ["t1", "t2", "t3"]
+        engine.task_graph.add_tasks([{"task_id": t, "title": t} for t in ids])
+        verdicts = {"t1": "approve", "t2": "request_changes", "t3": "approve"}
+        started = []
+        for agent_id in ("rev-1", "rev-2"):
+            engine.scheduler.register_agent(
+                "reviewer", _reviewer(agent_id, verdicts, started)
+            )
+        completed = [(engine.task_graph.get_task(t), _done(t, f"agent/{t}")) for t in ids]
+
+        await engine._trigger_reviews(completed)
+
+        # Both reviewers start before either finishes its first review.
+        assert started[:2] == ["rev-1", "rev-2"]
+        assert sorted(started) == ["rev-1", "rev-1", "rev-2"]
+        states = {t: engine.task_graph.get_task(t).state for t in ids}
+        assert states == {
+            "t1": TaskState.APPROVED, "t2": TaskState.BLOCKED, "t3": TaskState.APPROVED
+        }
+        assert engine.scheduler.busy_count == 0
+
+    async def test_without_branch_or_reviewer_nothing_happens(self, engine):
+        engine.task_graph.add_tasks([{"task_id": "t1", "title": "t1"}])
+        node = engine.task_graph.get_task("t1")
+        await engine._trigger_reviews([(node, _done("t1", "agent/t1"))])
+        await engine._trigger_reviews([(node, _done("t1"))])
+        assert node.state != TaskState.APPROVED
@@ -155,6 +155,20 @@ class TestGetAvailableAgent:
         assert slot.agent.agent_id == "dev-idle"
 
 
+class TestGetAvailableAgents:
+    def test_returns_all_idle_in_order(self):
+        sched = _make_scheduler()
+        for agent_id in ("rev-1", "rev-2", "rev-3"):
+            sched.register_agent("reviewer", _make_mock_agent(agent_id))
+        sched._agents["reviewer"][1].busy = True
+
+        slots = sched.get_available_agents("reviewer")
+        assert [s.agent.agent_id for s in slots] == ["rev-1", "rev-3"]
+
+    def test_empty_for_nonexistent_role(self):
+        assert _make_scheduler().get_available_agents("nonexistent") == []
+
+
 # ---------------------------------------------------------------------------
 # release_agent
 # ---------------------------------------------------------------------------
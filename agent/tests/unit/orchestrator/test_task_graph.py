@@ -102,6 +102,34 @@ def test_get_ready_tasks():
     assert ready[1].task_id == "low"
 
 
+def test_ready_tasks_follow_state_changes():
+    """Ties keep insertion order; tasks leave and re-enter the ready set."""
+    graph = TaskGraph()
+    graph.add_tasks([
+        {"task_id": "b", "title": "B", "dependencies": [], "priority": 2},
+        {"task_id": "a", "title": "A", "dependencies": [], "priority": 2},
+        {"task_id": "dep", "title": "Dep", "dependencies": ["b"], "priority": 1},
+    ])
+    assert [t.task_id for t in graph.get_ready_tasks()] == ["b", "a"]
+
+    graph.assign_agent("a", "dev-1")
+    assert [t.task_id for t in graph.get_ready_tasks()] == ["b"]
+
+    graph.update_state("a", TaskState.READY)
+    graph.update_state("b", TaskState.MERGED)
+    assert [t.task_id for t in graph.get_ready_tasks()] == ["dep", "a"]
+
+
+def test_ready_tasks_follow_priority_changes():
+    graph = TaskGraph()
+    graph.add_tasks([
+        {"task_id": "a", "title": "A", "dependencies": [], "priority": 1},
+        {"task_id": "b", "title": "B", "dependencies": [], "priority": 2},
+    ])
+    graph.get_task("b").priority = 0
+    assert [t.task_id for t in graph.get_ready_tasks()] == ["b", "a"]
+
+
 def test_is_complete():
     """Graph is complete when all tasks are terminal."""
     graph = TaskGraph()
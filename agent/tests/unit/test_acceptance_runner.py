@@ -4,6 +4,7 @@ Exercises the serial-matching/gating logic without booting QEMU.
 """
 
 import importlib.util
+import re
 from pathlib import Path
 
 import pytest
@@ -72,3 +73,241 @@ def test_agent_extended_groups_are_partial_not_fatal():
 def test_core_gate_tests_exist(name):
     all_names = {t.name for ts in at.get_all_tests("x86_64").values() for t in ts}
     assert name in all_names
+
+
+def test_patterns_compiled_once_at_construction():
+    test = at.AcceptanceTest("t", "boot", "d", [r"\[BOOT\] OK", r"\d+ MB"])
+    sources = tuple(p.pattern.removeprefix("(?m)") for p in test.compiled)  # RE2 spelling
+    assert sources == (r"^\[BOOT\] OK", r"\d+ MB")
+    assert at.test_passes(test, "[BOOT] OK\n128 MB")
+
+
+def test_acceptance_test_is_frozen_and_hashable():
+    test = at.AcceptanceTest("t", "mm", "d", (r"\[MM\] OK",), requires=at.Subsystem.BOOT)
+    assert test.requires_subsystems == ("boot",)
+    assert test == at.AcceptanceTest("t", "mm", "d", [r"\[MM\] OK"], requires=at.Subsystem.BOOT)
+    assert not hasattr(test, "__dict__")
+    with pytest.raises(AttributeError):
+        test.name = "other"
+    assert test in {test}
+
+
+@pytest.fixture(params=["re", "ahocorasick", "hyperscan"])
+def scan_backend(request, monkeypatch):
+    """Force matched_patterns() onto one backend (skipped if not installed)."""
+    if request.param != "re":
+        pytest.importorskip(request.param)
+    if request.param != "hyperscan":
+        monkeypatch.setattr(at, "hyperscan", None)
+    if request.param == "re":
+        monkeypatch.setattr(at, "ahocorasick", None)
+    return request.param
+
+
+def test_single_scan_agrees_with_plain_search(scan_backend):
+    matched = at.matched_patterns(GOOD_SERIAL)
+    for ts in at.get_all_tests("x86_64").values():
+        for t in ts:
+            assert at.test_passes(t, GOOD_SERIAL, matched) == at.test_passes(t, GOOD_SERIAL)
+
+
+def test_test_definitions_are_not_duplicated():
+    assert at.ALL_TESTS == at.get_all_tests("x86_64")
+    dtb = [t for t in at._every_test() if t.name == "boot_dtb_valid"]
+    assert len(dtb) == 1
+    assert at.get_boot_tests("aarch64")[-2] is at.get_boot_tests("riscv64")[-2]
+    assert at._every_test() is at._every_test()
+    assert at.arch_tests("aarch64").count(dtb[0]) == 1
+
+
+def test_tagged_markers_must_start_a_line(scan_backend):
+    test = next(t for t in at.BOOT_TESTS if t.name == "boot_interrupts")
+    banner = next(t for t in at.BOOT_TESTS if t.name == "boot_kernel_main")
+    serial = "echo [BOOT] Interrupts initialized\nSeaBIOS AUTON Kernel booting"
+    matched = at.matched_patterns(serial)
+    assert not at.test_passes(test, serial, matched)
+    assert not at.test_passes(test, serial)
+    assert at.test_passes(banner, serial, matched)  # banner may follow firmware output
+
+
+def test_requirements_are_a_bitmask():
+    subsystem = at.Subsystem
+    net_dhcp = next(t for t in at.NET_TESTS if t.name == "net_dhcp")
+    assert net_dhcp.requires_subsystems == ("boot", "mm", "dev", "drivers")
+    assert not at.requirements_met(net_dhcp, subsystem.BOOT | subsystem.MM | subsystem.DEV)
+    everything_needed = (
+        subsystem.BOOT | subsystem.MM | subsystem.DEV | subsystem.DRIVERS | subsystem.FS
+    )
+    assert at.requirements_met(net_dhcp, everything_needed)
+    assert at.requirements_met(at.BOOT_TESTS[0], 0)  # no dependencies
+    assert {subsystem.from_name(k) for k in at.ALL_TESTS} == set(subsystem)
+
+
+def test_runtime_built_names_are_interned():
+    subsystem = "".join(["m", "m"])
+    test = at.AcceptanceTest("".join(["mm_", "x"]), subsystem, "d", [])
+    assert test.subsystem is at.sys.intern("mm")
+    assert test.name is at.sys.intern("mm_x")
+
+
+def test_all_tests_is_read_only_and_cached():
+    with pytest.raises(TypeError):
+        at.ALL_TESTS["boot"] = ()
+    assert all(isinstance(ts, tuple) for ts in at.ALL_TESTS.values())
+    assert at.get_all_tests("x86_64") is at.ALL_TESTS
+    assert at.get_boot_tests("riscv64") is at.get_all_tests("riscv64")["boot"]
+    assert at.get_boot_tests("sparc") == at.BOOT_TESTS_COMMON
+
+
+def test_literal_patterns_skip_the_regex_engine():
+    assert at.literal_text(r"\[TEST\] pmm_alloc_free: PASS") == "[TEST] pmm_alloc_free: PASS"
+    assert at.literal_text(r"\[TEST\] slab_alloc_\d+: PASS") is None
+    assert at.literal_text(r"\[DRV\] Serial .+ initialized") is None
+    assert at._LITERALS[r"\[TEST\] timer_tick: PASS"] == "\n[TEST] timer_tick: PASS"
+    assert at._LITERALS["AUTON Kernel booting"] == "AUTON Kernel booting"
+
+
+def test_literal_pass_markers_match(scan_backend):
+    serial = GOOD_SERIAL + "\n[TEST] timer_tick: PASS\n[TEST] slab_alloc_64: PASS"
+    matched = at.matched_patterns(serial)
+    assert r"\[TEST\] timer_tick: PASS" in matched
+    assert r"\[TEST\] slab_alloc_\d+: PASS" in matched
+    assert r"\[TEST\] sched_create: PASS" not in matched
+
+
+def test_stream_serial_stops_at_done_marker():
+    import subprocess
+    import sys
+    import time
+
+    def fake_qemu(lines, linger):
+        code = (
+            "import sys, time\n"
+            f"sys.stdout.write({lines!r}); sys.stdout.flush()\n"
+            f"time.sleep({linger})"
+        )
+        return subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE)
+
+    procs = {
+        "done": fake_qemu("[BOOT] Interrupts initialized\n[BOOT] OK\n", 30),
+        "exits": fake_qemu("AUTON Kernel booting\n", 0),
+    }
+    start = time.monotonic()
+    serial = at.stream_serial(procs, timeout_secs=20)
+    assert time.monotonic() - start < 10  # did not wait out the lingering process
+    assert "[BOOT] OK" in serial["done"]
+    assert serial["exits"] == "AUTON Kernel booting\n"
+    assert all(p.poll() is not None for p in procs.values())
+
+
+def test_flat_pattern_index_covers_every_pattern_once():
+    expected = sum(len(t.expected_serial_patterns) for t in at._every_test())
+    assert len(at.FLAT_PATTERNS) == expected
+    for test, idx, compiled in at.FLAT_PATTERNS:
+        assert compiled is test.compiled[idx]
+
+
+def test_pass_markers_share_one_string_per_name():
+    assert at.pass_marker("timer_tick") == r"\[TEST\] timer_tick: PASS"
+    assert at.pass_marker("timer_tick") is at.pass_marker("timer_tick")
+    timer = next(t for t in at.DRIVER_TESTS if t.name == "driver_timer_tick")
+    assert timer.expected_serial_patterns[0] is at.pass_marker("timer_tick")
+
+
+def test_shared_sources_share_compiled_patterns():
+    banner = next(t for t in at.BOOT_TESTS if t.name == "boot_kernel_main")
+    full = next(t for t in at.INTEGRATION_TESTS if t.name == "full_boot_to_slm")
+    assert banner.compiled[0] is full.compiled[0]
+
+
+def test_combined_matcher_reports_every_pattern_on_a_line():
+    matcher = at.build_combined_matcher(at.INTEGRATION_TESTS)
+    assert matcher is at.build_combined_matcher(at.INTEGRATION_TESTS)
+    found = at.make_scanner(at.INTEGRATION_TESTS)("[SLM] Hardware scan complete: 4 devices\nnoise")
+    assert found == {
+        r"\[SLM\] Hardware scan complete: \d+ devices",
+        r"\[SLM\] Hardware scan complete",
+    }
+    regex_only = at.build_combined_matcher(at.INTEGRATION_TESTS, regex_only=True)
+    assert "AUTON Kernel booting" not in regex_only.sources
+
+
+def test_anchor_literals_are_required_substrings():
+    assert at.longest_literal(r"\[MM\] PMM initialized: \d+ pages free") == "[MM] PMM initialized: "
+    assert at.longest_literal(r"\[SLM\] .+ engine initialized") == " engine initialized"
+    assert at.longest_literal("ab*c") == "a"
+    assert at.longest_literal("(a|b)") == ""
+    for test in at._every_test():
+        assert len(test.anchors) == len(test.compiled)
+        for source, anchor in zip(test.expected_serial_patterns, test.anchors):
+            assert anchor and anchor in source.replace("\\", "")
+
+
+def test_equal_requirements_share_one_name_tuple():
+    tests = [t for ts in at.ALL_TESTS.values() for t in ts if t.requires == at._REQ_BOOT_MM]
+    assert len(tests) > 1
+    assert all(t.requires_subsystems is tests[0].requires_subsystems for t in tests)
+    assert tests[0].requires_subsystems == ("boot", "mm")
+
+
+def test_scan_is_limited_to_the_arch_test_set(scan_backend):
+    tests = at.arch_tests("aarch64")
+    assert tests is at.arch_tests("aarch64")
+    serial = "[BOOT] Running at EL1\n[BOOT] Long mode enabled\n"
+    matched = at.matched_patterns(serial, tests)
+    assert r"\[BOOT\] Running at EL1" in matched
+    assert at.evaluate(serial, "aarch64")["boot"]["passed"] == ["boot_el1_entry"]
+
+
+def test_hyperscan_db_is_built_once_per_test_set():
+    pytest.importorskip("hyperscan")
+    tests = at.arch_tests("riscv64")
+    db, sources = at.build_hyperscan_db(tests)
+    assert at.build_hyperscan_db(tests)[0] is db
+    assert set(sources) == {p for t in tests for p in t.expected_serial_patterns}
+
+
+def test_marker_lines_keep_every_verdict():
+    raw = ("SeaBIOS (version 1.16)\r\nBooting from DVD/CD...\n" + GOOD_SERIAL).encode()
+    raw += b"\n\xff\xfe garbage\n"
+    reduced = at.marker_lines(raw)
+    assert "SeaBIOS" not in reduced and "garbage" not in reduced
+    assert at.evaluate(reduced) == at.evaluate(raw.decode("utf-8", errors="replace"))
+
+
+def test_regex_engine_falls_back_to_re(monkeypatch):
+    compiled = at.compile_regex(r"(a)\1", multiline=True)  # backreference: not RE2
+    assert isinstance(compiled, re.Pattern)
+    assert compiled.search("xaa")
+    monkeypatch.setattr(at, "re2", None)
+    assert isinstance(at.compile_regex(r"\d+"), re.Pattern)
+
+
+def test_patterns_use_re2_when_installed():
+    re2 = pytest.importorskip("re2")
+    assert isinstance(at.compile_pattern(r"\[NET\] Stack initialized"), re2._Regexp)
+
+
+def test_generated_scanner_agrees_with_plain_search():
+    tests = at.arch_tests("x86_64")
+    scan = at.make_scanner(tests)
+    assert scan is at.make_scanner(tests)
+    serial = GOOD_SERIAL + "\n[TEST] slab_alloc_64: PASS\nnoise [MM] PMM initialized"
+    expected = {
+        source
+        for t in tests
+        for source, compiled in zip(t.expected_serial_patterns, t.compiled)
+        if compiled.search(serial)
+    }
+    assert scan(serial) == expected
+    assert r"\[SLM\] Hardware scan complete" in expected
+    assert at.make_scanner(())("anything") == frozenset()
+
+
+def test_serial_file_scan_matches_in_memory_scan(scan_backend, tmp_path):
+    log = tmp_path / "serial.log"
+    log.write_bytes(b"SeaBIOS\xff\n" * 1000 + GOOD_SERIAL.encode())
+    tests = at.arch_tests("x86_64")
+    matched = at.scan_serial_file(log, tests, chunk_size=7)  # markers straddle chunks
+    assert matched == at.matched_patterns(GOOD_SERIAL, tests)
+    assert at.main(["--serial", str(log)]) == 0